@@ -3,7 +3,9 @@ from PyInstaller.utils.hooks import collect_data_files
 from PyInstaller.utils.hooks import collect_submodules
 
 datas = []
-hiddenimports = ['tkinter', 'matplotlib.pyplot', 'numpy', 'si_prefix']
+hiddenimports = ['tkinter', 'matplotlib.pyplot', 'matplotlib.backends.backend_tkagg', 'numpy', 'si_prefix',
+                 'dialogs.square_wave_dialog', 'dialogs.triangle_wave_dialog',
+                 'dialogs.saw_wave_dialog', 'dialogs.waveform_repair_dialog']
 datas += collect_data_files('tkinter')
 datas += collect_data_files('numpy')
 hiddenimports += collect_submodules('numpy')
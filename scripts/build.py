@@ -146,8 +146,13 @@ def build_executable():
             "--name=PWL_Editor",
             "--hidden-import=tkinter",
             "--hidden-import=matplotlib.pyplot",
+            "--hidden-import=matplotlib.backends.backend_tkagg",
             "--hidden-import=numpy",
             "--hidden-import=si_prefix",
+            "--hidden-import=dialogs.square_wave_dialog",
+            "--hidden-import=dialogs.triangle_wave_dialog",
+            "--hidden-import=dialogs.saw_wave_dialog",
+            "--hidden-import=dialogs.waveform_repair_dialog",
             "--collect-data=tkinter",
             "--collect-submodules=numpy",
             "--collect-data=numpy",
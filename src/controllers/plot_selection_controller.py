@@ -9,6 +9,8 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
 
 @dataclass
 class SelectionState:
@@ -33,6 +35,13 @@ class PlotSelectionController:
         )
         # Ensure editor mirrors our authoritative state
         self._mirror_all_to_editor()
+        # Point coordinates cached between full plot draws (picking hot path)
+        self._data_xy: Optional[np.ndarray] = None
+        self._pixel_xy: Optional[np.ndarray] = None
+        # Latest drag position not yet rendered; motion events are coalesced
+        # so at most one rectangle update is drawn per Tk idle cycle
+        self._pending_motion: Optional[Tuple[float, float]] = None
+        self._motion_after_id: Optional[str] = None
 
     # --- State accessors that mirror editor attributes for compatibility ---
     def _get_is_dragging(self) -> bool:
@@ -103,8 +112,7 @@ class PlotSelectionController:
             if tab_text != 'Table':
                 return
 
-            if (self.editor.edit_entry is not None or self.editor.edit_combo is not None or 
-                self.editor.edit_item is not None):
+            if self.editor.edit_entry is not None or self.editor.edit_item is not None:
                 return
 
             if event.button != 1:
@@ -126,8 +134,7 @@ class PlotSelectionController:
             if tab_text != 'Table':
                 return
 
-            if (self.editor.edit_entry is not None or self.editor.edit_combo is not None or 
-                self.editor.edit_item is not None):
+            if self.editor.edit_entry is not None or self.editor.edit_item is not None:
                 return
 
             if not self._get_drag_start_pos():
@@ -143,11 +150,32 @@ class PlotSelectionController:
             if drag_distance >= self.DRAG_THRESHOLD_PX:
                 self._set_is_dragging(True)
                 cx, cy = self.editor._clamp_pixel_to_axes(event.x, event.y)
-                # Update the in-progress selection rectangle
-                self.update_selection_rectangle(self._get_drag_start_pos(), (cx, cy))
+                # Update the in-progress selection rectangle once the event queue drains
+                self._pending_motion = (cx, cy)
+                if self._motion_after_id is None:
+                    self._motion_after_id = self.canvas.get_tk_widget().after_idle(
+                        self._flush_pending_motion)
         except Exception:
             pass
 
+    def _flush_pending_motion(self):
+        self._motion_after_id = None
+        end = self._pending_motion
+        self._pending_motion = None
+        start = self._get_drag_start_pos()
+        if end is None or not start or not self._get_is_dragging():
+            return
+        self.update_selection_rectangle(start, end)
+
+    def _cancel_pending_motion(self):
+        self._pending_motion = None
+        if self._motion_after_id is not None:
+            try:
+                self.canvas.get_tk_widget().after_cancel(self._motion_after_id)
+            except Exception:
+                pass
+            self._motion_after_id = None
+
     def on_plot_release(self, event):
         try:
             selected_tab = self.notebook.select()
@@ -155,8 +183,7 @@ class PlotSelectionController:
             if tab_text != 'Table':
                 return
 
-            if (self.editor.edit_entry is not None or self.editor.edit_combo is not None or 
-                self.editor.edit_item is not None):
+            if self.editor.edit_entry is not None or self.editor.edit_item is not None:
                 return
 
             if event.button != 1:
@@ -165,29 +192,27 @@ class PlotSelectionController:
             if not self._get_drag_start_pos():
                 return
 
+            self._cancel_pending_motion()
+
             if self._get_is_dragging():
                 start = self._get_drag_start_pos()
                 if not start:
                     return
                 sx, sy = self.editor._clamp_pixel_to_axes(start[0], start[1])
                 ex, ey = self.editor._clamp_pixel_to_axes(event.x, event.y)
-                start_data = self.editor.pixel_to_data(sx, sy)
-                end_data = self.editor.pixel_to_data(ex, ey)
+                start_data, end_data = self.editor.pixel_box_to_data((sx, sy), (ex, ey))
 
-                if (start_data[0] is not None and end_data[0] is not None and
-                    start_data[1] is not None and end_data[1] is not None):
+                if start_data is not None:
                     selected_indices = self.editor.find_points_in_box(start_data, end_data)
 
                     if selected_indices:
-                        self.table.selection_remove(self.table.selection())
-                        children = self.table.get_children()
-                        for index in selected_indices:
-                            if 0 <= index < len(children):
-                                self.table.selection_add(children[index])
-                        self.editor._update_plot_internal(selected_indices)
+                        children = self.editor._iid_by_index
+                        items = [children[index] for index in selected_indices if 0 <= index < len(children)]
+                        self.table.selection_set(items)
+                        self.editor.update_selection_highlight(selected_indices)
                     else:
                         self.table.selection_remove(self.table.selection())
-                        self.editor._update_plot_internal(None)
+                        self.editor.update_selection_highlight(None)
             else:
                 cx, cy = self.editor._clamp_pixel_to_axes(event.x, event.y)
                 if cx is None or cy is None:
@@ -195,14 +220,15 @@ class PlotSelectionController:
                 nearest_index = self.editor.find_nearest_point(cx, cy)
 
                 if nearest_index is not None:
-                    self.table.selection_remove(self.table.selection())
-                    children = self.table.get_children()
+                    children = self.editor._iid_by_index
                     if 0 <= nearest_index < len(children):
-                        self.table.selection_add(children[nearest_index])
-                    self.editor._update_plot_internal([nearest_index])
+                        self.table.selection_set(children[nearest_index])
+                    else:
+                        self.table.selection_remove(self.table.selection())
+                    self.editor.update_selection_highlight([nearest_index])
                 else:
                     self.table.selection_remove(self.table.selection())
-                    self.editor._update_plot_internal(None)
+                    self.editor.update_selection_highlight(None)
 
             # Final cleanup of any selection rectangle
             self._clear_selection_rect()
@@ -236,6 +262,7 @@ class PlotSelectionController:
                 if connection_id is not None:
                     self.canvas.mpl_disconnect(connection_id)
             self._set_connections({})
+            self._cancel_pending_motion()
 
             # Remove any lingering selection rectangle on disconnect
             self._clear_selection_rect()
@@ -246,27 +273,36 @@ class PlotSelectionController:
             pass
 
     # --- Helper logic moved from editor ---
+    def invalidate_point_cache(self) -> None:
+        """Drop cached point coordinates; called whenever the plot is redrawn."""
+        self._data_xy = None
+        self._pixel_xy = None
+
+    def _get_data_xy(self) -> np.ndarray:
+        if self._data_xy is None:
+            pwl_data = self.editor.pwl_data
+            self._data_xy = np.column_stack((pwl_data.time_array(), pwl_data.value_array()))
+        return self._data_xy
+
+    def _get_pixel_xy(self) -> np.ndarray:
+        if self._pixel_xy is None:
+            self._pixel_xy = self.ax.transData.transform(self._get_data_xy())
+        return self._pixel_xy
+
     def find_nearest_point(self, pixel_x: float, pixel_y: float):
         try:
             if self.editor.pwl_data.get_point_count() == 0:
                 return None
 
-            times = self.editor.pwl_data.timestamps
-            values = self.editor.pwl_data.values
+            pixel_xy = self._get_pixel_xy()
+            dx = pixel_xy[:, 0] - pixel_x
+            dy = pixel_xy[:, 1] - pixel_y
+            distances = np.hypot(dx, dy)
 
-            nearest_index = None
-            min_distance = float('inf')
-
-            for i, (time, value) in enumerate(zip(times, values)):
-                px, py = self.editor.data_to_pixel(time, value)
-                if px is None or py is None:
-                    continue
-                distance = ((pixel_x - px)**2 + (pixel_y - py)**2)**0.5
-                if distance < min_distance and distance <= self.NEAREST_PX_TOL:
-                    min_distance = distance
-                    nearest_index = i
-
-            return nearest_index
+            nearest_index = int(np.argmin(distances))
+            if distances[nearest_index] <= self.NEAREST_PX_TOL:
+                return nearest_index
+            return None
         except Exception:
             return None
 
@@ -280,15 +316,12 @@ class PlotSelectionController:
             min_value = min(start_data[1], end_data[1])
             max_value = max(start_data[1], end_data[1])
 
-            times = self.editor.pwl_data.timestamps
-            values = self.editor.pwl_data.values
-
-            selected_indices = []
-            for i, (time, value) in enumerate(zip(times, values)):
-                if (min_time <= time <= max_time and min_value <= value <= max_value):
-                    selected_indices.append(i)
-
-            return selected_indices
+            data_xy = self._get_data_xy()
+            times = data_xy[:, 0]
+            values = data_xy[:, 1]
+            inside = ((times >= min_time) & (times <= max_time) &
+                      (values >= min_value) & (values <= max_value))
+            return np.flatnonzero(inside).tolist()
         except Exception:
             return []
 
@@ -303,11 +336,8 @@ class PlotSelectionController:
                 finally:
                     self._set_selection_rect(None)
 
-            start_data = self.editor.pixel_to_data(start_pixel[0], start_pixel[1])
-            end_data = self.editor.pixel_to_data(end_pixel[0], end_pixel[1])
-
-            if (start_data[0] is None or end_data[0] is None or
-                start_data[1] is None or end_data[1] is None):
+            start_data, end_data = self.editor.pixel_box_to_data(start_pixel, end_pixel)
+            if start_data is None:
                 return
 
             min_x = min(start_data[0], end_data[0])
@@ -321,11 +351,15 @@ class PlotSelectionController:
 
             new_rect = Rectangle(
                 (min_x, min_y), rect_width, rect_height,
-                linewidth=2, edgecolor='red', facecolor='red', alpha=0.2
+                linewidth=2, edgecolor='red', facecolor='red', alpha=0.2,
+                animated=True
             )
             self._set_selection_rect(new_rect)
             self.ax.add_patch(self._get_selection_rect())
-            self.canvas.draw()
+            # Preview the points inside the box; only the overlays are blitted
+            self.editor.update_selection_highlight(
+                self.find_points_in_box((min_x, min_y), (max_x, max_y))
+            )
         except Exception:
             pass
 
@@ -341,9 +375,9 @@ class PlotSelectionController:
                     pass
                 finally:
                     self._set_selection_rect(None)
-                # Drawing is safe even if nothing changed; keep UI in sync
+                # Repaint overlays so the rectangle disappears; keep UI in sync
                 try:
-                    self.canvas.draw()
+                    self.editor.blit_plot_overlays()
                 except Exception:
                     pass
         except Exception:
@@ -32,12 +32,9 @@ class TableController:
 
             selected_indices: List[int] = []
             if selected_items:
-                children = self.table.get_children()
-                for item in selected_items:
-                    if item in children:
-                        selected_indices.append(children.index(item))
+                selected_indices = self.editor._indices_for_items(selected_items)
 
-            self.editor._update_plot_internal(selected_indices if selected_indices else None)
+            self.editor.update_selection_highlight(selected_indices if selected_indices else None)
         except Exception:
             # Fail silently - highlighting is a nice-to-have feature
             pass
@@ -29,6 +29,10 @@ class TextController:
         self._pwl_data_factory: Callable[[], Any] = pwl_data_factory or PwlData
         # Lazily normalized once widgets are available
         self._export_format_initialized = False
+        # Lines last written to the text editor, valid while the editor's
+        # text generation still equals _shown_generation
+        self._shown_lines: list[str] | None = None
+        self._shown_generation = -1
 
     @property
     def pwl_data(self) -> PwlData:
@@ -39,8 +43,7 @@ class TextController:
             export_var = self._normalize_export_format_var()
             if export_var is None:
                 text_content = self.pwl_data.to_text_precise(use_relative_time=True, precision=9, preserve_original=True)
-                self.editor.text_editor.delete(1.0, tk.END)
-                self.editor.text_editor.insert(1.0, text_content)
+                self._show_text(text_content)
             else:
                 # Defer to format-aware path when dropdown is wired
                 self.table_to_text_with_format()
@@ -54,20 +57,19 @@ class TextController:
             if text_content:
                 new_pwl_data = self._pwl_data_factory()
                 if new_pwl_data.load_from_text(text_content):
+                    self.editor._mark_text_synced()
                     self.editor._operation_description = "Text to table conversion"
                     self.editor.pwl_data = new_pwl_data
-                    self.editor.update_table()
-                    self.editor.update_plot()  # This will create the undo point
-                    self.editor.mark_unsaved()
+                    # Table, plot (creates the undo point) and unsaved flag in one pass
+                    self.editor._commit_changes(text=False)
                 else:
                     self.editor.status_var.set("Invalid PWL text format")
             else:
                 # Handle empty text - convert to empty data
+                self.editor._mark_text_synced()
                 self.editor._operation_description = "Clear all data"
                 self.editor.pwl_data = self._pwl_data_factory()
-                self.editor.update_table()
-                self.editor.update_plot()  # This will create the undo point
-                self.editor.mark_unsaved()
+                self.editor._commit_changes(text=False)
         except Exception as e:
             self.editor.status_var.set(f"Error parsing text: {e}")
 
@@ -89,11 +91,52 @@ class TextController:
                 export_format=selected_format, precision=9, preserve_original=True
             )
 
-            self.editor.text_editor.delete(1.0, tk.END)
-            self.editor.text_editor.insert(1.0, text_content)
+            self._show_text(text_content)
         except Exception as e:
             self.editor.status_var.set(f"Error updating text format: {e}")
 
+    def _show_text(self, text_content: str):
+        """Put *text_content* into the text editor, rewriting only changed lines.
+
+        While the editor still holds exactly what was last written here, the
+        common leading and trailing lines are kept and only the lines between
+        them are replaced, so a single-point edit costs a one-line Tk update
+        instead of re-inserting the whole document.
+        """
+        editor = self.editor
+        widget = editor.text_editor
+        lines = text_content.split('\n')
+        old_lines = self._shown_lines
+        if (old_lines is None or editor._text_dirty
+                or self._shown_generation != editor._text_generation):
+            widget.delete(1.0, tk.END)
+            widget.insert(1.0, text_content)
+        elif lines != old_lines:
+            common = min(len(old_lines), len(lines))
+            head = 0
+            while head < common and old_lines[head] == lines[head]:
+                head += 1
+            tail = 0
+            while tail < common - head and old_lines[-1 - tail] == lines[-1 - tail]:
+                tail += 1
+            new_middle = lines[head:len(lines) - tail]
+            if tail:
+                # Tk line numbers are 1-based; each replaced line takes its newline along
+                widget.delete(f"{head + 1}.0", f"{len(old_lines) - tail + 1}.0")
+                if new_middle:
+                    widget.insert(f"{head + 1}.0", '\n'.join(new_middle) + '\n')
+            elif head:
+                # Replace from the end of the last kept line, so no newline is left over
+                widget.delete(f"{head}.end", tk.END)
+                if new_middle:
+                    widget.insert(f"{head}.end", '\n' + '\n'.join(new_middle))
+            else:
+                widget.delete(1.0, tk.END)
+                widget.insert(1.0, text_content)
+        editor._mark_text_synced()
+        self._shown_lines = lines
+        self._shown_generation = editor._text_generation
+
     def get_formatted_content_for_save(self, *, apply_export_format: bool = True) -> str:
         """Return content ready for persistence, optionally applying the export preset."""
         try:
@@ -1,11 +1,24 @@
-"""Dialog package exports."""
+"""Dialog package exports.
 
-from .square_wave_dialog import SquareWaveGeneratorDialog
-from .triangle_wave_dialog import TriangleWaveGeneratorDialog
-from .waveform_repair_dialog import WaveformRepairDialog
+The dialogs are imported on first access so that loading the package (or
+one dialog) does not pull in the others.
+"""
 
-__all__ = [
-	"SquareWaveGeneratorDialog",
-	"TriangleWaveGeneratorDialog",
-	"WaveformRepairDialog",
-]
+from importlib import import_module
+
+_EXPORTS = {
+	"SquareWaveGeneratorDialog": ".square_wave_dialog",
+	"TriangleWaveGeneratorDialog": ".triangle_wave_dialog",
+	"WaveformRepairDialog": ".waveform_repair_dialog",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+	module_name = _EXPORTS.get(name)
+	if module_name is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(import_module(module_name, __name__), name)
+	globals()[name] = value
+	return value
@@ -45,7 +45,7 @@ class SquareWaveGeneratorDialog:
         self.window.grab_set()
         self.window.protocol("WM_DELETE_WINDOW", self._on_cancel)
 
-        last_time = self.original_data.timestamps[-1] if self.original_data.get_point_count() > 0 else 0.0
+        last_time = self.original_data.get_absolute_time(self.original_data.get_point_count() - 1)
         default_start = self._format_service.format_time(last_time)
 
         self.low_level_var = tk.StringVar(value="0")
@@ -351,8 +351,7 @@ class SquareWaveGeneratorDialog:
                 delta = max(adjusted_abs - previous_abs, 0.0)
                 if delta != 0.0:
                     delta = float(f"{delta:.12g}")
-                time_str = self._format_service.format_time(delta, reference_point)
-                value_str = self._format_service.format_value(value_numeric, reference_point)
+                time_str, value_str = self._format_service.format_point(delta, value_numeric, reference_point)
                 new_point = PwlPoint(time_str, value_str, is_relative=True)
             else:
                 time_str = self._format_service.format_time(adjusted_abs)
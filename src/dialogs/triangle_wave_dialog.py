@@ -46,10 +46,8 @@ class TriangleWaveGeneratorDialog:
         self.window.grab_set()
         self.window.protocol("WM_DELETE_WINDOW", self._on_cancel)
 
-        last_time = (
-            self.original_data.timestamps[-1]
-            if self.original_data.get_point_count() > 0
-            else 0.0
+        last_time = self.original_data.get_absolute_time(
+            self.original_data.get_point_count() - 1
         )
         default_start = self._format_service.format_time(last_time)
 
@@ -368,11 +366,8 @@ class TriangleWaveGeneratorDialog:
                 delta = max(adjusted_abs - previous_abs, 0.0)
                 if delta != 0.0:
                     delta = float(f"{delta:.12g}")
-                time_str = self._format_service.format_time(
-                    delta, reference_point
-                )
-                value_str = self._format_service.format_value(
-                    value_numeric, reference_point
+                time_str, value_str = self._format_service.format_point(
+                    delta, value_numeric, reference_point
                 )
                 new_point = PwlPoint(time_str, value_str, is_relative=True)
             else:
@@ -196,7 +196,9 @@ class WaveformRepairDialog:
 
     def _generate_preview(self, settings: Dict[str, Any]) -> Optional[PwlData]:
         base = self._clone_data(self._original_snapshot)
-        analyzer = WaveformAnalyzer(base, time_epsilon=self._time_epsilon)
+        # Detect through the repairer's analyzer so the repair reuses its scan
+        repairer = WaveformRepairer(base, time_epsilon=self._time_epsilon)
+        analyzer = repairer.analyzer
         dup_strategy = str(settings["duplicate_strategy"]).lower()
         rev_strategy = str(settings["reversal_strategy"]).lower()
         duplicates = analyzer.find_duplicate_timestamps() if dup_strategy != "none" else []
@@ -207,7 +209,6 @@ class WaveformRepairDialog:
 
         data = base
         if duplicates:
-            repairer = WaveformRepairer(data, time_epsilon=self._time_epsilon)
             data = repairer.repair_duplicates(
                 max_slew_rate=settings["max_slew_rate"],
                 time_tolerance=settings["time_tolerance"],
@@ -215,7 +216,8 @@ class WaveformRepairDialog:
             )
 
         if reversals:
-            repairer = WaveformRepairer(data, time_epsilon=self._time_epsilon)
+            if data is not base:
+                repairer = WaveformRepairer(data, time_epsilon=self._time_epsilon)
             data = repairer.repair_time_reversals(strategy=settings["reversal_strategy"])
 
         if self._data_equals(data, self._original_snapshot):
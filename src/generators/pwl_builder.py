@@ -0,0 +1,83 @@
+"""
+Shared PwlData assembly for the waveform generators.
+Author: markus(at)schrodt.at
+AI Tools: GPT-5 (OpenAI) - Code development and architecture
+License: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from pwl_parser import PwlData
+from services.formatting import FormatService
+
+
+def build_pwl_data(
+    samples: Sequence[tuple[float, float]],
+    *,
+    prefer_relative: bool,
+    format_service: FormatService,
+    round_deltas: bool = False,
+) -> PwlData:
+    """Convert (absolute_time, value) samples into formatted ``PwlData``.
+
+    Time deltas are computed with NumPy in one pass. Generated waveforms
+    repeat a few levels and step sizes, so every distinct time and every
+    (value, preceding value string) pair is formatted only once.
+
+    Args:
+        samples: Absolute sample times with their values.
+        prefer_relative: Emit every point after the first as a ``+delta``.
+        format_service: Formatter used for the time and value strings.
+        round_deltas: Round relative deltas to 12 significant digits first.
+    """
+
+    times = np.fromiter((sample[0] for sample in samples), dtype=float, count=len(samples))
+    deltas = np.maximum(np.diff(times), 0.0).tolist()
+
+    time_strs: Dict[float, str] = {}
+    value_strs: Dict[Tuple[float, str | None] | None, str] = {}
+    rows: List[tuple[str, str, bool]] = []
+    previous_value_str: str | None = None
+
+    for index, (absolute_time, value) in enumerate(samples):
+        if index == 0 or not prefer_relative:
+            time_value = absolute_time
+            is_relative = False
+        else:
+            time_value = deltas[index - 1]
+            if round_deltas and time_value != 0.0:
+                time_value = float(f"{time_value:.12g}")
+            is_relative = True
+
+        time_str = time_strs.get(time_value)
+        if time_str is None:
+            time_str = time_strs[time_value] = format_service.format_time(time_value)
+
+        # 0.0 and -0.0 are the same key but may format differently ('-0')
+        value_key = (value, previous_value_str) if value != 0 else None
+        value_str = value_strs.get(value_key)
+        if value_str is None:
+            value_ref = None if previous_value_str is None else _ValueReference(previous_value_str)
+            value_str = format_service.format_value(value, value_ref)
+            if value_key is not None:
+                value_strs[value_key] = value_str
+
+        rows.append((time_str, value_str, is_relative))
+        previous_value_str = value_str
+
+    data = PwlData.from_rows(rows)
+    data.default_format = "relative" if prefer_relative else "absolute"
+    return data
+
+
+class _ValueReference:
+    """Minimal stand-in for the preceding point when mirroring its value style."""
+
+    __slots__ = ("value_str",)
+
+    def __init__(self, value_str: str) -> None:
+        self.value_str = value_str
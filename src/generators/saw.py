@@ -11,7 +11,8 @@ import math
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Sequence
 
-from pwl_parser import PwlData, PwlPoint
+from generators.pwl_builder import build_pwl_data
+from pwl_parser import PwlData
 from services.formatting import FormatService
 
 
@@ -170,34 +171,12 @@ def _build_pwl_data(
     samples: Sequence[tuple[float, float]],
     format_service: FormatService,
 ) -> PwlData:
-    data = PwlData()
-    data.default_format = "relative" if config.prefer_relative else "absolute"
-
-    points: List[PwlPoint] = []
-    previous_time = 0.0
-
-    for index, (absolute_time, value) in enumerate(samples):
-        if index == 0 or not config.prefer_relative:
-            time_str = format_service.format_time(absolute_time)
-            is_relative = False
-        else:
-            delta = max(absolute_time - previous_time, 0.0)
-            if config.prefer_relative and delta != 0.0:
-                delta = float(f"{delta:.12g}")
-            time_str = format_service.format_time(delta)
-            is_relative = True
-
-        value_ref = points[-1] if points else None
-        value_str = format_service.format_value(value, value_ref)
-        point = PwlPoint(time_str, value_str, is_relative=is_relative)
-        points.append(point)
-        previous_time = absolute_time
-
-    data.points = points
-    data._values_discrete = []
-    data._timestamps_discrete = []
-    data._discrete_dirty = True
-    return data
+    return build_pwl_data(
+        samples,
+        prefer_relative=config.prefer_relative,
+        format_service=format_service,
+        round_deltas=True,
+    )
 
 
 def _derive_warnings(config: SawWaveConfig, meta: Dict[str, float | bool]) -> List[str]:
@@ -10,7 +10,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional, Sequence
 
-from pwl_parser import PwlData, PwlPoint
+from generators.pwl_builder import build_pwl_data
+from pwl_parser import PwlData
 from services.formatting import FormatService
 
 
@@ -203,32 +204,11 @@ def _build_pwl_data(
     samples: Sequence[tuple[float, float]],
     format_service: FormatService,
 ) -> PwlData:
-    data = PwlData()
-    data.default_format = "relative" if config.prefer_relative else "absolute"
-
-    points: List[PwlPoint] = []
-    previous_time = 0.0
-
-    for index, (absolute_time, value) in enumerate(samples):
-        if index == 0 or not config.prefer_relative:
-            time_str = format_service.format_time(absolute_time)
-            is_relative = False
-        else:
-            delta = max(absolute_time - previous_time, 0.0)
-            time_str = format_service.format_time(delta)
-            is_relative = True
-
-        value_ref = points[-1] if points else None
-        value_str = format_service.format_value(value, value_ref)
-        point = PwlPoint(time_str, value_str, is_relative=is_relative)
-        points.append(point)
-        previous_time = absolute_time
-
-    data.points = points
-    data._values_discrete = []
-    data._timestamps_discrete = []
-    data._discrete_dirty = True
-    return data
+    return build_pwl_data(
+        samples,
+        prefer_relative=config.prefer_relative,
+        format_service=format_service,
+    )
 
 
 def _derive_warnings(config: SquareWaveConfig) -> List[str]:
@@ -9,14 +9,18 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
 import sys
-from types import SimpleNamespace
-from typing import Sequence
+import hashlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import numpy as np
 from pwl_parser import PwlData, PwlPoint
 from pwl_gui_geometry import PWLEditorGeometry
 from services.insertion_service import SmartInsertion
 from services.undo_history import UndoRedoManager
 from version import get_version, get_version_info
-from utils.plot_coordinates import data_to_pixel as util_data_to_pixel, pixel_to_data as util_pixel_to_data, clamp_pixel_to_axes as util_clamp
+from utils.plot_coordinates import data_to_pixel as util_data_to_pixel, pixel_to_data as util_pixel_to_data, pixels_to_data as util_pixels_to_data, clamp_pixel_to_axes as util_clamp
+from utils.plot_kernels import expand_steps, render_dtype
 from services.file_service import FileService
 from services.formatting import FormatService
 from services.document_service import DocumentService
@@ -24,6 +28,55 @@ from controllers.plot_selection_controller import PlotSelectionController
 from controllers.table_controller import TableController
 from controllers.text_controller import TextController
 
+
+def _lazy_import(name):
+    """Bind module *name* now but execute it on first attribute access.
+    
+    Returns None if the module cannot be found; import errors raised by the
+    module body surface when it is first used.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError:
+        return None
+    if spec is None or spec.loader is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Generator/repair dialogs are only needed once their menu entry is used
+_square_wave_dialog = _lazy_import('dialogs.square_wave_dialog')
+_triangle_wave_dialog = _lazy_import('dialogs.triangle_wave_dialog')
+_saw_wave_dialog = _lazy_import('dialogs.saw_wave_dialog')
+_waveform_repair_dialog = _lazy_import('dialogs.waveform_repair_dialog')
+
+
+def _dialog_class(module, class_name):
+    """Return *class_name* from a lazily imported dialog module."""
+    if module is None:
+        raise ImportError(f"No module providing {class_name}")
+    try:
+        return getattr(module, class_name)
+    except AttributeError as exc:
+        raise ImportError(str(exc)) from exc
+
+
+def _parse_pwl_text(text_content):
+    """Parse PWL text into a new PwlData; returns None if the text is invalid"""
+    pwl_data = PwlData()
+    if pwl_data.load_from_text(text_content):
+        return pwl_data
+    return None
+
+
 class PWLEditor:
     def __init__(self, root):
         self.root = root
@@ -32,16 +85,32 @@ class PWLEditor:
         self.current_file = None
         self.unsaved_changes = False
         self.last_directory = None  # Remember last used directory
+        self._title_base = f"PWL Editor v{get_version()}"
+        self._window_title = None   # Last title handed to Tk
         
         # Undo/Redo functionality
         self.undo_manager = UndoRedoManager(max_history=50)
         self._operation_description = ""  # Track current operation for undo descriptions
         self._undo_in_progress = False    # Prevent recursive undo point creation
+        self._batch_depth = 0             # >0 while inside batch_edit()
+        self._batch_pending = {}          # View refreshes deferred until the batch ends
+        self._text_dirty = False          # Text editor edited since it last held valid PWL text
+        self._text_generation = 0         # Bumped on every text change; stale parse results are dropped
+        self._validation_executor = None  # Single worker thread for text validation (created lazily)
+        self._validation_future = None
+        self._last_validated_digest = None
+        self.validation_after_id = None   # Pending debounced validate_text_content
         
         self.edit_entry = None
-        self.edit_combo = None
         self.edit_item = None
         self.edit_column = None
+        self.edit_selected_items = None     # Rows an inline edit applies to
+        
+        # Treeview row bookkeeping, maintained by update_table so selection
+        # lookups don't have to query get_children() on every call
+        self._iid_by_index = []
+        self._index_by_iid = {}
+        self._table_rows = []  # Row values currently shown, parallel to _iid_by_index
         
         # Multi-selection preservation for editing
         # Store the selection before current one (list of Treeview item IDs) or None
@@ -54,6 +123,14 @@ class PWLEditor:
         self.drag_start_pos = None  # Starting position for drag selection (pixel coords)
         self.selection_rect = None  # Current selection rectangle artist
         self.plot_event_connections = {}  # Store matplotlib event connection IDs
+        self._plot_lines = None       # (step line, point markers) reused across redraws
+        self._sel_artist = None       # Animated scatter highlighting the selected points
+        self._plot_background = None  # Axes background captured after each full draw (for blitting)
+        self._plotted_fingerprint = None  # pwl_data.fingerprint() of the data on screen
+        self._canvas_empty = False    # Last full draw showed no points
+        self.PLOT_UPDATE_DELAY_MS = 50   # Redraws requested within this window are coalesced
+        self._plot_after_id = None       # Pending deferred redraw (root.after id)
+        self._plot_pending_selection = None
         
         # Initialize smart insertion handler
         self.smart_insertion = SmartInsertion()
@@ -81,17 +158,12 @@ class PWLEditor:
             pass
         
         self.update_title()
-        self.update_plot()
         if 'parse_status_var' in self.widgets:
             self.widgets['parse_status_var'].set("No data")
         
-        # Ensure plot events are connected if starting in Table mode
-        try:
-            current_tab = self.notebook.tab(self.notebook.select(), 'text')
-            if current_tab == 'Table':
-                self.connect_plot_events()
-        except Exception:
-            pass
+        # Build the plot once the window is up; importing matplotlib is the
+        # bulk of the startup cost
+        self.root.after_idle(self._initialize_plot)
         
         # Save initial empty state as baseline
         self.undo_manager.save_state(self.pwl_data, "Initial state")
@@ -146,16 +218,34 @@ class PWLEditor:
     
     @property
     def ax(self):
+        self.gui.ensure_plot()
         return self.gui.ax
     
     @property
     def canvas(self):
+        self.gui.ensure_plot()
         return self.gui.canvas
     
     @property
     def notebook(self):
         return self.gui.notebook
 
+    def _initialize_plot(self):
+        """Draw the initial plot and hook up plot events (scheduled from __init__)"""
+        self._update_plot_internal()
+        
+        # Ensure plot events are connected if starting in Table mode
+        try:
+            current_tab = self.notebook.tab(self.notebook.select(), 'text')
+            if current_tab == 'Table':
+                self.connect_plot_events()
+        except Exception:
+            pass
+
+    def on_plot_created(self):
+        """Called by the geometry once the matplotlib canvas exists"""
+        self.gui.canvas.mpl_connect('draw_event', self._on_canvas_draw)
+
     def on_tab_changed(self, event):
         selected_tab = self.notebook.select()
         tab_text = self.notebook.tab(selected_tab, 'text')
@@ -173,39 +263,142 @@ class PWLEditor:
             self._update_plot_internal(None)
             self.table_to_text()
 
+    @contextmanager
+    def batch_edit(self, description=None):
+        """Group several data changes into one undo point and one view refresh.
+        
+        Inside the block, update_table/update_plot/table_to_text(_with_format)/
+        mark_unsaved and _commit_changes only record what is needed; the
+        outermost batch performs each once on exit. Batches nest.
+        """
+        if description is not None:
+            self._operation_description = description
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_batch()
+
+    def _flush_batch(self):
+        pending = self._batch_pending
+        self._batch_pending = {}
+        if 'table' in pending:
+            self.update_table()
+        if 'reselect' in pending:
+            self._reselect_table_indices(pending['reselect'])
+        if 'plot' in pending:
+            self.update_plot(pending['plot'])
+        if 'text' in pending:
+            if pending['text']:
+                self.table_to_text_with_format()
+            else:
+                self.table_to_text()
+        if 'unsaved' in pending:
+            self.mark_unsaved()
+
+    def _commit_changes(self, *, plot_selection=None, reselect=None, text=True, formatted=False):
+        """Refresh the views after a data change and mark the document unsaved.
+        
+        Runs update_table, the optional reselection of *reselect* indices,
+        update_plot (creating the undo point), the table-to-text sync
+        (formatted or plain; skipped with text=False) and mark_unsaved.
+        Inside batch_edit everything is deferred to the end of the batch.
+        """
+        if self._batch_depth:
+            pending = self._batch_pending
+            pending['table'] = None
+            if reselect:
+                pending['reselect'] = reselect
+            pending['plot'] = plot_selection
+            if text:
+                pending['text'] = formatted or pending.get('text', False)
+            pending['unsaved'] = None
+            return
+        self.update_table()
+        if reselect:
+            self._reselect_table_indices(reselect)
+        self.update_plot(plot_selection)
+        if text:
+            if formatted:
+                self.table_to_text_with_format()
+            else:
+                self.table_to_text()
+        self.mark_unsaved()
+
     def table_to_text(self):
+        if self._batch_depth:
+            self._batch_pending.setdefault('text', False)
+            return
         return self.text_controller.table_to_text()
 
     def text_to_table(self):
         return self.text_controller.text_to_table()
 
     def update_table(self):
-        for item in self.table.get_children():
-            self.table.delete(item)
+        if self._batch_depth:
+            self._batch_pending['table'] = None
+            return
+        # Rows carry the original text strings (string-based approach)
+        rows = self.pwl_data.display_rows()
+        old_rows = self._table_rows
+        if rows is not old_rows:
+            self._sync_table_rows(old_rows, rows)
+        self.status_var.set(f"Loaded {self.pwl_data.get_point_count()} points")
+
+    def _sync_table_rows(self, old_rows, rows):
+        """Make the Treeview show *rows*, touching only rows that differ.
         
-        for i in range(self.pwl_data.get_point_count()):
-            point_detail = self.pwl_data.get_point_detailed(i)
-            if point_detail:
-                abs_time = point_detail['absolute_time']
-                value = point_detail['value']
-                is_relative = point_detail['is_relative']
-                time_type = "REL" if is_relative else "ABS"
-                
-                # Get the actual point to access original strings
-                point = self.pwl_data.points[i]
-                
-                # Use original text strings directly (new string-based approach)
-                time_display = point.time_str
-                value_display = point.value_str
-                
-                self.table.insert('', tk.END, values=(
-                    i+1, 
-                    time_display, 
-                    value_display,
-                    time_type
-                ))
+        Existing items are reused: changed rows get new values, and only the
+        surplus at the end is inserted or deleted, so an edit costs Tcl calls
+        for the changed rows instead of a full repopulation.
+        """
+        table = self.table
+        iid_by_index = self._iid_by_index
         
-        self.status_var.set(f"Loaded {self.pwl_data.get_point_count()} points")
+        # Items now show other points; drop the selection as a rebuild would
+        if table.selection():
+            table.selection_set(())
+        self.previous_selection = None
+        
+        # Raw Tcl commands: ttk's item()/insert() wrappers re-format the option
+        # dict on every call, which dominates when thousands of rows change.
+        # Tuples are passed to Tcl as native lists.
+        call = table.tk.call
+        widget = table._w
+        common = min(len(old_rows), len(rows))
+        for index in range(common):
+            row = rows[index]
+            if row != old_rows[index]:
+                call(widget, 'item', iid_by_index[index], '-values', row)
+        
+        if len(rows) != len(iid_by_index):
+            if len(rows) > common:
+                # Rows only grow or shrink at the end, so row i always has
+                # item ID str(i); Tk need not generate IDs
+                iid_by_index = iid_by_index[:common] + [
+                    call(widget, 'insert', '', 'end', '-id', str(index), '-values', rows[index])
+                    for index in range(common, len(rows))
+                ]
+            else:
+                table.delete(*iid_by_index[common:])
+                iid_by_index = iid_by_index[:common]
+            self._iid_by_index = iid_by_index
+            self._index_by_iid = {iid: i for i, iid in enumerate(iid_by_index)}
+        self._table_rows = rows
+
+    def _clear_table_rows(self):
+        """Delete all table rows in one Tcl call.
+        
+        update_table is the only place rows are inserted, so the cached iid
+        list is the full row list and get_children() is not needed.
+        """
+        if self._iid_by_index:
+            self.table.delete(*self._iid_by_index)
+        self._iid_by_index = []
+        self._index_by_iid = {}
+        self._table_rows = []
 
     def on_table_select(self, event=None):
         """Delegate to TableController"""
@@ -226,20 +419,16 @@ class PWLEditor:
             return []
         if not selected_items:
             return []
-        children = self.table.get_children()
-        indices: list[int] = []
-        for item in selected_items:
-            if item in children:
-                indices.append(children.index(item))
-        indices.sort()
-        return indices
+        return self._indices_for_items(selected_items)
+
+    def _indices_for_items(self, items) -> list[int]:
+        """Map Treeview item IDs to sorted point indices using the row cache."""
+        index_by_iid = self._index_by_iid
+        return sorted(index_by_iid[item] for item in items if item in index_by_iid)
 
     def select_all_points(self, event=None):
         """Select all rows in the table view."""
-        try:
-            children = self.table.get_children()
-        except Exception:
-            return "break"
+        children = self._iid_by_index
         if not children:
             return "break"
         self.table.selection_set(children)
@@ -250,7 +439,7 @@ class PWLEditor:
         if not indices:
             return
         try:
-            children = self.table.get_children()
+            children = self._iid_by_index
             items = [children[i] for i in indices if 0 <= i < len(children)]
             if items:
                 self.table.selection_set(items)
@@ -258,67 +447,143 @@ class PWLEditor:
         except Exception:
             pass
 
-    def _apply_time_representation(
-        self,
-        pwl_data: PwlData,
-        index: int,
-        *,
-        make_relative: bool,
-        allow_first_point_relative: bool = False,
-        reference_time_str: str | None = None,
-        absolute_times: Sequence[float] | None = None,
-    ) -> bool:
-        """Convert a single point to relative/absolute while mirroring existing formatting."""
-        if index < 0 or index >= pwl_data.get_point_count():
-            return False
-
-        point = pwl_data.points[index]
-        reference_str = reference_time_str if reference_time_str is not None else point.time_str
-        reference_point = SimpleNamespace(time_str=reference_str)
-
+    def _apply_time_representation_batch(self, indices, *, make_relative: bool,
+                                         sequential: bool = False) -> list[int]:
+        """Convert points of self.pwl_data to relative/absolute while mirroring existing formatting.
+        
+        Absolute times and deltas come from one vectorized pass, and the new
+        time strings from one vectorized formatting pass. The first point is
+        never made relative. Returns the converted indices.
+        
+        With sequential=True the points are converted in index order, each
+        against the absolute times left by the conversions before it (as
+        the type column edits always did), so a converted neighbour's
+        rounded time anchors the next point instead of its original time.
+        """
+        points = self.pwl_data.points
+        count = len(points)
+        first = 1 if make_relative else 0
+        targets = [index for index in indices if first <= index < count]
+        if not targets:
+            return []
+        if sequential:
+            targets.sort()
+        
+        target_array = np.asarray(targets, dtype=np.intp)
+        # Column views gathered once, before any point changes
+        times = self.pwl_data.time_array()
+        time_strs = self.pwl_data.time_strings()
         if make_relative:
-            if index == 0 and not allow_first_point_relative:
-                return False
-            if absolute_times is not None:
-                current_abs = absolute_times[index]
-                previous_abs = absolute_times[index - 1] if index > 0 else 0.0
-            else:
-                current_abs = pwl_data.get_absolute_time(index)
-                previous_abs = pwl_data.get_absolute_time(index - 1) if index > 0 else 0.0
-            delta = current_abs - previous_abs
-            formatted_time = self.format_service.format_time(delta, reference_point)
-            point.update_time_str(formatted_time)
-            point.is_relative = True
+            new_times = times[target_array] - times[target_array - 1]
         else:
-            if absolute_times is not None:
-                current_abs = absolute_times[index]
-            else:
-                current_abs = pwl_data.get_absolute_time(index)
-            formatted_time = self.format_service.format_time(current_abs, reference_point)
-            point.update_time_str(formatted_time)
-            point.is_relative = False
-
-        return True
+            new_times = times[target_array]
+        
+        new_time_strs = self.format_service.format_time_array(new_times, [time_strs[index] for index in targets])
+        if sequential:
+            self._apply_time_strs_sequentially(targets, new_times.tolist(), new_time_strs, make_relative)
+            return targets
+        for index, time_str in zip(targets, new_time_strs):
+            point = points[index]
+            point.update_time_str(time_str)
+            point.is_relative = make_relative
+        return targets
     
-    def update_plot(self, selected_indices=None):
-        """Update plot and create undo point"""
-        # Don't create undo points during undo/redo operations
-        if getattr(self, '_undo_in_progress', False):
-            self._update_plot_internal(selected_indices)
+    def _apply_time_strs_sequentially(self, targets, new_times, new_time_strs, make_relative: bool):
+        """Apply converted time strings in index order, re-anchoring each target on the live times.
+        
+        new_times/new_time_strs were computed from the times before any
+        conversion; a target whose live time differs from that is formatted
+        again on its own. Absolute times are accumulated point by point the
+        way PwlData computes them, so the result matches converting one
+        point at a time.
+        """
+        points = self.pwl_data.points
+        stored = self.pwl_data.time_value_array().tolist()
+        relative = self.pwl_data.relative_mask().tolist()
+        planned = dict(zip(targets, zip(new_times, new_time_strs)))
+        first = targets[0]
+        # Nothing before the first target changes
+        previous = float(self.pwl_data.time_array()[first - 1]) if first > 0 else 0.0
+        for index in range(first, targets[-1] + 1):
+            stored_time = stored[index] or 0.0  # A -0.0 time reads as 0.0
+            current = previous + stored_time if relative[index] else stored_time
+            target = planned.get(index)
+            if target is not None:
+                planned_time, time_str = target
+                live_time = current - previous if make_relative else current
+                point = points[index]
+                if live_time != planned_time:
+                    time_str = self.format_service.format_time(live_time, point)
+                point.update_time_str(time_str)
+                point.is_relative = make_relative
+                stored_time = point.get_time_value() or 0.0
+                current = previous + stored_time if make_relative else stored_time
+            previous = current
+    
+    def _indices_to_convert(self, indices, make_relative: bool) -> list[int]:
+        """Return those of *indices* whose point is not yet in the requested representation"""
+        if not indices:
+            return []
+        index_array = np.asarray(indices, dtype=np.intp)
+        return index_array[self.pwl_data.relative_mask()[index_array] != make_relative].tolist()
+    
+    def update_plot(self, selected_indices=None, force=False):
+        """Create an undo point and schedule a plot redraw.
+        
+        The redraw runs PLOT_UPDATE_DELAY_MS later so that a burst of edits
+        is drawn once; force=True redraws immediately.
+        """
+        if self._batch_depth:
+            self._batch_pending['plot'] = selected_indices
             return
         
-        # Save undo point BEFORE updating (captures previous state)
-        if hasattr(self, 'undo_manager'):
-            description = getattr(self, '_operation_description', 'Edit')
-            self.undo_manager.save_state(self.pwl_data, description)
+        # Don't create undo points during undo/redo operations
+        if not self._undo_in_progress:
+            # Save undo point BEFORE updating; save_state skips it when the
+            # data is unchanged since the last saved state
+            self.undo_manager.save_state(self.pwl_data, self._operation_description)
             self._operation_description = ""  # Reset description
         
-        self._update_plot_internal(selected_indices)
+        if force:
+            self._update_plot_internal(selected_indices)
+        else:
+            self._schedule_plot_update(selected_indices)
+
+    def _schedule_plot_update(self, selected_indices=None):
+        """Redraw the plot after PLOT_UPDATE_DELAY_MS, replacing any pending redraw"""
+        if self._plot_after_id is not None:
+            self.root.after_cancel(self._plot_after_id)
+        self._plot_pending_selection = selected_indices
+        # The on-screen points no longer match the data; pick from the data
+        self.plot_controller.invalidate_point_cache()
+        self._plot_after_id = self.root.after(self.PLOT_UPDATE_DELAY_MS, self._do_update_plot)
+
+    def _do_update_plot(self):
+        self._plot_after_id = None
+        self._update_plot_internal(self._plot_pending_selection)
 
     def _update_plot_internal(self, selected_indices=None):
-        """Internal plot update without undo point creation"""
-        # Clear plot (this also removes any existing patches)
-        self.ax.clear()
+        """Redraw the plot now, without undo point creation"""
+        if self._plot_after_id is not None:
+            # This draw supersedes the scheduled one
+            self.root.after_cancel(self._plot_after_id)
+            self._plot_after_id = None
+        point_count = self.pwl_data.get_point_count()
+        if self._canvas_empty and point_count == 0:
+            # Empty axes are already on screen; skip the clear/redraw round trip
+            return
+        fingerprint = self.pwl_data.fingerprint()
+        if (fingerprint == self._plotted_fingerprint and self._sel_artist is not None
+                and self._plot_background is not None):
+            # Same data as on screen (e.g. tab switch, selection-only refresh):
+            # blit the highlight instead of re-rasterizing the figure
+            try:
+                self.plot_controller.clear_selection_rect()
+            except Exception:
+                self.selection_rect = None
+            self._sel_artist.set_offsets(self._selection_offsets(selected_indices))
+            self.blit_plot_overlays()
+            return
         # Any previously stored selection rectangle reference is now invalid.
         # Ask controller to clear it to keep internal/editor state in sync.
         try:
@@ -326,67 +591,126 @@ class PWLEditor:
         except Exception:
             # Fallback to clearing the attribute if controller isn't available
             self.selection_rect = None
+        # The cached background no longer matches the data
+        self._plot_background = None
         
-        if self.pwl_data.get_point_count() > 0:
-            times = self.pwl_data.timestamps
-            values = self.pwl_data.values
-            
-            if len(times) > 0:
-                plot_times = []
-                plot_values = []
-                
-                i = 0
-                while i < len(times):
-                    current_time = times[i]
-                    current_value = values[i]
-                    
-                    plot_times.append(current_time)
-                    plot_values.append(current_value)
-                    
-                    j = i + 1
-                    while j < len(times) and abs(times[j] - current_time) < 1e-12:
-                        plot_times.append(current_time)
-                        plot_values.append(values[j])
-                        j += 1
-                    
-                    i = j
-                
-                self.ax.plot(plot_times, plot_values, 'bo-', markersize=4, linewidth=1.5)
-                self.ax.plot(times, values, 'ro', markersize=6, alpha=0.7)
-                
-                # Highlight selected points if specified
-                if selected_indices is not None and len(selected_indices) > 0:
-                    selected_times = []
-                    selected_values = []
-                    for index in selected_indices:
-                        if 0 <= index < len(times):
-                            selected_times.append(times[index])
-                            selected_values.append(values[index])
-                    
-                    if selected_times:
-                        self.ax.plot(
-                            selected_times,
-                            selected_values,
-                            'yo',
-                            markersize=10,
-                            markeredgecolor='red',
-                            markeredgewidth=2,
-                            alpha=0.8,
-                        )
-            
-            if len(times) > 0:
-                time_margin = (max(times) - min(times)) * 0.05 if len(times) > 1 else 0.1
-                value_margin = (max(values) - min(values)) * 0.05 if len(values) > 1 else 0.1
+        if point_count == 0 or self._plot_lines is None:
+            self._rebuild_plot_axes()
+        
+        if point_count > 0:
+            step_times, point_times, values, xlim, ylim = self._plot_arrays()
+            if self._plot_lines is None:
+                step_line, = self.ax.plot(step_times, values, 'bo-', markersize=4, linewidth=1.5)
+                point_line, = self.ax.plot(point_times, values, 'ro', markersize=6, alpha=0.7)
+                self._plot_lines = (step_line, point_line)
                 
-                self.ax.set_xlim(min(times) - time_margin, max(times) + time_margin)
-                self.ax.set_ylim(min(values) - value_margin, max(values) + value_margin)
+                # Selected points are drawn by an animated artist that is
+                # blitted over the cached background (see _on_canvas_draw)
+                self._sel_artist = self.ax.scatter(
+                    [], [],
+                    s=100,
+                    facecolor='yellow',
+                    edgecolor='red',
+                    linewidth=2,
+                    alpha=0.8,
+                    zorder=5,
+                    animated=True,
+                )
+            else:
+                # Same artists, new data: no axes teardown or artist rebuild
+                step_line, point_line = self._plot_lines
+                step_line.set_data(step_times, values)
+                point_line.set_data(point_times, values)
+            self._sel_artist.set_offsets(self._selection_offsets(selected_indices))
+            self.ax.set_xlim(*xlim)
+            self.ax.set_ylim(*ylim)
+        
+        self.ax.set_title(f'PWL Waveform ({point_count} points)')
         
+        self.canvas.draw()
+        self._canvas_empty = point_count == 0
+        self._plotted_fingerprint = fingerprint if point_count else None
+
+    def _rebuild_plot_axes(self):
+        """Clear the axes (this also removes any existing patches) and redo labels and grid"""
+        self.ax.clear()
+        # Line and selection artists die with the axes contents
+        self._plot_lines = None
+        self._sel_artist = None
         self.ax.set_xlabel('Time (s)')
         self.ax.set_ylabel('Value')
         self.ax.grid(True, alpha=0.3)
-        self.ax.set_title(f'PWL Waveform ({self.pwl_data.get_point_count()} points)')
+
+    def _plot_arrays(self):
+        """Return (step_times, point_times, values, xlim, ylim) for drawing the current data"""
+        # Shared, cached arrays: one conversion per edit for all plot users
+        times = self.pwl_data.time_array()
+        step_times, values = expand_steps(times, self.pwl_data.value_array())
         
-        self.canvas.draw()
+        # Rendering-only copies; float32 halves the data matplotlib
+        # has to move around when it keeps enough precision
+        time_dtype = render_dtype(times)
+        value_dtype = render_dtype(values)
+        
+        t_min, t_max = float(times.min()), float(times.max())
+        v_min, v_max = float(values.min()), float(values.max())
+        time_margin = (t_max - t_min) * 0.05 if len(times) > 1 else 0.1
+        value_margin = (v_max - v_min) * 0.05 if len(values) > 1 else 0.1
+        
+        return (
+            step_times.astype(time_dtype, copy=False),
+            times.astype(time_dtype, copy=False),
+            values.astype(value_dtype, copy=False),
+            (t_min - time_margin, t_max + time_margin),
+            (v_min - value_margin, v_max + value_margin),
+        )
+
+    def _selection_offsets(self, selected_indices):
+        """Return an (N, 2) array of (time, value) pairs for the selected points"""
+        if not selected_indices:
+            return np.empty((0, 2))
+        times = self.pwl_data.time_array()
+        count = len(times)
+        indices = [i for i in selected_indices if 0 <= i < count]
+        if not indices:
+            return np.empty((0, 2))
+        return np.column_stack((times[indices], self.pwl_data.value_array()[indices]))
+
+    def _on_canvas_draw(self, event=None):
+        """Capture the freshly drawn background and paint the animated overlays on top."""
+        self.plot_controller.invalidate_point_cache()
+        try:
+            self._plot_background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self._draw_plot_overlays()
+        except Exception:
+            self._plot_background = None
+
+    def _draw_plot_overlays(self):
+        if self._sel_artist is not None:
+            self.ax.draw_artist(self._sel_artist)
+        if self.selection_rect is not None:
+            self.ax.draw_artist(self.selection_rect)
+
+    def blit_plot_overlays(self):
+        """Repaint selection highlight and selection rectangle without a full redraw."""
+        if self._plot_background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._plot_background)
+        self._draw_plot_overlays()
+        self.canvas.blit(self.ax.bbox)
+
+    def update_selection_highlight(self, selected_indices=None):
+        """Update only the highlighted points; falls back to a full redraw if needed."""
+        if self._plot_after_id is not None:
+            # A redraw is already pending; let it draw the new selection
+            self._plot_pending_selection = selected_indices
+            return
+        if self._sel_artist is None or self._plot_background is None:
+            self._update_plot_internal(selected_indices)
+            return
+        self._sel_artist.set_offsets(self._selection_offsets(selected_indices))
+        self.blit_plot_overlays()
 
     def data_to_pixel(self, data_x, data_y):
         """Convert data coordinates to pixel coordinates"""
@@ -406,6 +730,19 @@ class PWLEditor:
         except Exception:
             return None, None
 
+    def pixel_box_to_data(self, start_pixel, end_pixel):
+        """Convert the two corners of a pixel box to data coordinates in one transform"""
+        try:
+            if not self.ax or self.pwl_data.get_point_count() == 0:
+                return None, None
+            corners = util_pixels_to_data(self.ax, [start_pixel, end_pixel])
+            if corners is None:
+                return None, None
+            start_data, end_data = corners.tolist()
+            return tuple(start_data), tuple(end_data)
+        except Exception:
+            return None, None
+
     def _clamp_pixel_to_axes(self, px, py):
         """Clamp pixel coordinates to the axes bounding box to support border drags."""
         try:
@@ -448,19 +785,21 @@ class PWLEditor:
     def undo(self):
         """Undo last operation with comprehensive error handling and invalid text handling"""
         try:
-            # First check if current text editor content is invalid
-            current_text = self.text_editor.get(1.0, tk.END).strip()
-            temp_data = PwlData()
-            
-            # If current text is invalid, just restore current valid state (don't consume undo point)
-            if current_text and not temp_data.load_from_text(current_text):
-                self.table_to_text()  # Sync text editor with current valid data
-                self.status_var.set("Invalid text discarded - restored to last valid state")
-                return
+            # First check if current text editor content is invalid; text that
+            # hasn't been edited since it was last synced/validated is known good
+            if self._text_dirty:
+                current_text = self.text_editor.get(1.0, tk.END).strip()
+                temp_data = PwlData()
+                
+                # If current text is invalid, just restore current valid state (don't consume undo point)
+                if current_text and not temp_data.load_from_text(current_text):
+                    self.table_to_text()  # Sync text editor with current valid data
+                    self.status_var.set("Invalid text discarded - restored to last valid state")
+                    return
             
             # Current text is valid (or empty) - proceed with normal undo
             # Check if undo is possible
-            if not hasattr(self, 'undo_manager') or not self.undo_manager.can_undo():
+            if not self.undo_manager.can_undo():
                 self.status_var.set("Nothing to undo")
                 return
             
@@ -473,7 +812,7 @@ class PWLEditor:
             
             if previous_data is not None:
                 # Store current selection to potentially restore
-                current_selection = list(self.table.selection()) if hasattr(self, 'table') else []
+                current_selection = list(self.table.selection()) if self.table is not None else []
                 
                 # Update data
                 self.pwl_data = previous_data
@@ -486,9 +825,10 @@ class PWLEditor:
                 # Try to restore selection if items still exist
                 if current_selection and self.pwl_data.get_point_count() > 0:
                     try:
-                        for item_id in current_selection:
-                            if self.table.exists(item_id):
-                                self.table.selection_add(item_id)
+                        index_by_iid = self._index_by_iid
+                        surviving = [item_id for item_id in current_selection if item_id in index_by_iid]
+                        if surviving:
+                            self.table.selection_set(surviving)
                     except:
                         pass  # Selection restoration is optional
                 
@@ -506,7 +846,7 @@ class PWLEditor:
         """Redo next operation with comprehensive error handling"""
         try:
             # Check if redo is possible
-            if not hasattr(self, 'undo_manager') or not self.undo_manager.can_redo():
+            if not self.undo_manager.can_redo():
                 self.status_var.set("Nothing to redo")
                 return
             
@@ -519,7 +859,7 @@ class PWLEditor:
             
             if next_data is not None:
                 # Store current selection to potentially restore
-                current_selection = list(self.table.selection()) if hasattr(self, 'table') else []
+                current_selection = list(self.table.selection()) if self.table is not None else []
                 
                 # Update data
                 self.pwl_data = next_data
@@ -532,9 +872,10 @@ class PWLEditor:
                 # Try to restore selection if items still exist
                 if current_selection and self.pwl_data.get_point_count() > 0:
                     try:
-                        for item_id in current_selection:
-                            if self.table.exists(item_id):
-                                self.table.selection_add(item_id)
+                        index_by_iid = self._index_by_iid
+                        surviving = [item_id for item_id in current_selection if item_id in index_by_iid]
+                        if surviving:
+                            self.table.selection_set(surviving)
                     except:
                         pass  # Selection restoration is optional
                 
@@ -566,20 +907,17 @@ class PWLEditor:
             
             # Create new point with smart timing
             new_point = PwlPoint(new_time_str, new_value_str, is_relative=current_point.is_relative)
-            self.pwl_data.points.insert(index, new_point)
+            self.pwl_data.insert_point(index, new_point)
             
-            self.update_table()
-            self.update_plot()
-            self.table_to_text()
-            self.mark_unsaved()
+            self._commit_changes()
             
             # Update status with helpful info
             reference_info = f"between {prev_point.time_str} and {current_point.time_str}" if prev_point else f"before {current_point.time_str}"
             self.status_var.set(f"Added point at {new_time_str} ({reference_info})")
             
             # Keep selection on the newly inserted point
-            if index < len(self.table.get_children()):
-                self.table.selection_set(self.table.get_children()[index])
+            if index < len(self._iid_by_index):
+                self.table.selection_set(self._iid_by_index[index])
         else:
             # No selection - add at beginning with smart timing
             if self.pwl_data.get_point_count() > 0:
@@ -592,11 +930,8 @@ class PWLEditor:
                 time_str, value_str = self.smart_insertion.get_empty_list_defaults()
                 new_point = PwlPoint(time_str, value_str, is_relative=False)
             
-            self.pwl_data.points.insert(0, new_point)
-            self.update_table()
-            self.update_plot()
-            self.table_to_text()
-            self.mark_unsaved()
+            self.pwl_data.insert_point(0, new_point)
+            self._commit_changes()
 
     def add_point_below(self):
         """Add point below selected row with smart defaults"""
@@ -617,12 +952,9 @@ class PWLEditor:
             
             # Create new point with smart timing
             new_point = PwlPoint(new_time_str, new_value_str, is_relative=current_point.is_relative)
-            self.pwl_data.points.insert(index + 1, new_point)
+            self.pwl_data.insert_point(index + 1, new_point)
             
-            self.update_table()
-            self.update_plot()
-            self.table_to_text()
-            self.mark_unsaved()
+            self._commit_changes()
             
             # Update status with helpful info
             self.status_var.set(f"Added point at {new_time_str} (preserving {current_point.time_str} notation)")
@@ -638,11 +970,8 @@ class PWLEditor:
                 time_str, value_str = self.smart_insertion.get_empty_list_defaults()
                 new_point = PwlPoint(time_str, value_str, is_relative=False)
             
-            self.pwl_data.points.append(new_point)
-            self.update_table()
-            self.update_plot()
-            self.table_to_text()
-            self.mark_unsaved()
+            self.pwl_data.insert_point(self.pwl_data.get_point_count(), new_point)
+            self._commit_changes()
 
     def start_inline_edit(self, event):
         # Check if we should restore previous multi-selection for editing
@@ -654,13 +983,8 @@ class PWLEditor:
             len(current_selection) == 1 and current_selection[0] in self.previous_selection):
             
             # Restore previous multi-selection
-            self.table.selection_remove(self.table.selection())
-            prev_sel = list(self.previous_selection) if self.previous_selection else []
-            for item in prev_sel:
-                try:
-                    self.table.selection_add(item)
-                except:
-                    pass
+            prev_sel = [item for item in self.previous_selection if item in self._index_by_iid]
+            self.table.selection_set(prev_sel)
             selected_items = prev_sel
             # Clear previous_selection after using it to prevent confusion in next cycle
             self.previous_selection = None
@@ -724,171 +1048,75 @@ class PWLEditor:
             self.edit_entry.bind('<Return>', self.finish_inline_edit)
             self.edit_entry.bind('<Escape>', self.cancel_inline_edit)
             self.edit_entry.bind('<FocusOut>', self.finish_inline_edit)
-            
-            self.edit_combo = None
-
-    def on_combo_click(self, event):
-        """Handle combobox click - simple approach to detect selection"""
-        try:
-            if self.edit_combo:
-                # Use a short delay to check if ComboboxSelected fired
-                # If not, assume user clicked on already selected item
-                self.combo_click_value = self.edit_combo.get()
-                self.combo_selection_happened = False
-                
-                # Schedule a check after potential ComboboxSelected event
-                self.root.after(100, self.check_combo_click_result)
-                
-        except Exception:
-            pass
-    
-    def check_combo_click_result(self):
-        """Check if combo click resulted in selection or not"""
-        try:
-            if (self.edit_combo and hasattr(self, 'combo_click_value') and 
-                not getattr(self, 'combo_selection_happened', True)):
-                # No ComboboxSelected event fired, but user clicked
-                # This means they clicked on already selected item
-                if self.edit_combo.get() == self.combo_click_value:
-                    # Finish editing with the same value
-                    self.finish_inline_edit()
-        except Exception:
-            pass
-        finally:
-            # Clean up temporary attributes
-            if hasattr(self, 'combo_click_value'):
-                delattr(self, 'combo_click_value')
-            if hasattr(self, 'combo_selection_happened'):
-                delattr(self, 'combo_selection_happened')
-
-    def on_combo_escape(self, event):
-        """Handle escape key for combobox - always cancel"""
-        # Force cancel editing immediately
-        if self.edit_combo:
-            self.edit_combo.destroy()
-            self.edit_combo = None
-        self.cancel_inline_edit()
-        return 'break'  # Prevent further event processing
-
-    def on_combo_focus_out(self, event):
-        """Handle combobox focus out - only finish edit if not clicking dropdown"""
-        try:
-            # Check if the focus is going to the combobox's dropdown listbox
-            # If so, don't finish editing yet
-            focused_widget = self.root.focus_get()
-            
-            # If focus is going to a listbox (dropdown), don't finish editing
-            if focused_widget and 'listbox' in str(focused_widget).lower():
-                return
-            
-            # If focus is going to the combobox itself, don't finish editing
-            if focused_widget == self.edit_combo:
-                return
-            
-            # Otherwise, finish editing
-            self.finish_inline_edit()
-            
-        except Exception:
-            # If anything goes wrong, just finish editing
-            self.finish_inline_edit()
 
     def _restore_selection(self, selected_items):
         """Helper method to restore table selection"""
         try:
-            # Clear current selection
-            self.table.selection_remove(self.table.selection())
-            # Restore the original selection
-            for item in selected_items:
-                self.table.selection_add(item)
+            # Replace the current selection in a single Tcl call
+            self.table.selection_set([item for item in selected_items if item in self._index_by_iid])
         except Exception:
             # Fail silently if selection restoration fails
             pass
 
     def finish_inline_edit(self, event=None):
         """Finish inline editing and update data"""
-        if not (self.edit_entry or self.edit_combo) or not self.edit_item:
+        if not self.edit_entry or not self.edit_item:
             return
         
-        # Mark that ComboboxSelected event fired
-        if hasattr(self, 'combo_click_value'):
-            self.combo_selection_happened = True
-        
         try:
-            # Get the new value from appropriate widget
-            if self.edit_entry:
-                new_value = self.edit_entry.get().strip()
-                if not new_value:
-                    self.cancel_inline_edit()
-                    return
-            elif self.edit_combo:
-                new_value = self.edit_combo.get()
-            else:
+            new_value = self.edit_entry.get().strip()
+            if not new_value:
+                self.cancel_inline_edit()
                 return
             
-            # Get all selected items (or just the edited one if edit_selected_items doesn't exist)
-            selected_items = getattr(self, 'edit_selected_items', [self.edit_item])
+            # Get all selected items (or just the edited one if none were stored)
+            selected_items = self.edit_selected_items or [self.edit_item]
+            
+            # Set operation description based on what was edited
+            if self.edit_column:
+                single, multiple = self.gui.edit_descriptions[self.edit_column]
+                count = len(selected_items)
+                if count == 1:
+                    description = single
+                else:
+                    description = multiple.format(count=count)
+            else:
+                description = "Edit value"
             
-            # Process each selected item
-            for item in selected_items:
-                # Get item index
-                values = self.table.item(item, 'values')
-                index = int(values[0]) - 1  # Convert to 0-based index
+            # One undo point and one view refresh for all edited rows
+            with self.batch_edit(description):
+                # Item indices from the row cache (no Tcl round-trip)
+                index_by_iid = self._index_by_iid
+                indices = [index for index in map(index_by_iid.get, selected_items) if index is not None]
                 
                 # Update the appropriate field
                 if self.edit_column == '#2':  # Time column
-                    # Update time as string directly
-                    self.pwl_data.points[index].update_time_str(new_value)
+                    # Same string for every row: parsed once
+                    self.pwl_data.bulk_update_time_str(indices, new_value)
                 elif self.edit_column == '#3':  # Value column
-                    # Update value as string directly
-                    self.pwl_data.points[index].update_value_str(new_value)
+                    self.pwl_data.bulk_update_value_str(indices, new_value)
                 elif self.edit_column == '#4':  # Type column
                     # Smart format conversion that preserves waveform
                     is_relative = (new_value == 'REL')
-                    current_point = self.pwl_data.points[index]
-                    
-                    if current_point.is_relative != is_relative:
-                        original_time_str = current_point.time_str
-                        converted = self._apply_time_representation(
-                            self.pwl_data,
-                            index,
-                            make_relative=is_relative,
-                            reference_time_str=original_time_str,
+                    pending = self._indices_to_convert(indices, is_relative)
+                    converted = self._apply_time_representation_batch(
+                        pending, make_relative=is_relative, sequential=True)
+                    if len(converted) < len(pending) and len(selected_items) == 1:
+                        messagebox.showwarning(
+                            "Invalid Conversion",
+                            "First point cannot be relative time. Keeping as absolute.",
                         )
-                        if not converted:
-                            if len(selected_items) == 1:
-                                messagebox.showwarning(
-                                    "Invalid Conversion",
-                                    "First point cannot be relative time. Keeping as absolute.",
-                                )
-                            continue
             
-            # Clean up edit widgets
-            if self.edit_entry:
-                self.edit_entry.destroy()
-                self.edit_entry = None
-            if self.edit_combo:
-                self.edit_combo.destroy()
-                self.edit_combo = None
-            self.edit_item = None
-            self.edit_selected_items = None
-            # Clear any preserved selection state to prevent confusion
-            self.previous_selection = None
+                # Clean up edit widgets
+                if self.edit_entry:
+                    self.edit_entry.destroy()
+                    self.edit_entry = None
+                self.edit_item = None
+                self.edit_selected_items = None
+                # Clear any preserved selection state to prevent confusion
+                self.previous_selection = None
             
-            # Set operation description based on what was edited
-            if self.edit_column:
-                column_name = self.table.heading(self.edit_column)['text']
-                count = len(selected_items)
-                if count == 1:
-                    self._operation_description = f"Edit {column_name.lower()}"
-                else:
-                    self._operation_description = f"Edit {column_name.lower()} ({count} points)"
-            else:
-                self._operation_description = "Edit value"
-            
-            self.update_table()
-            self.update_plot()
-            self.table_to_text()
-            self.mark_unsaved()
+                self._commit_changes()
             
         except Exception as e:
             messagebox.showerror("Edit Error", f"Invalid value: {e}")
@@ -902,63 +1130,43 @@ class PWLEditor:
             self.edit_item = selected_items[0] if selected_items else None
             self.edit_selected_items = selected_items
 
-            # Perform the same conversion logic as finish_inline_edit would
-            for item in selected_items:
-                values = self.table.item(item, 'values')
-                index = int(values[0]) - 1
+            count = len(selected_items)
+            description = "Edit type" if count == 1 else f"Edit type ({count} points)"
+            with self.batch_edit(description):
+                # Perform the same conversion logic as finish_inline_edit would
                 is_relative = (new_value == 'REL')
-                current_point = self.pwl_data.points[index]
-
-                if current_point.is_relative != is_relative:
-                    original_time_str = current_point.time_str
-                    converted = self._apply_time_representation(
-                        self.pwl_data,
-                        index,
-                        make_relative=is_relative,
-                        reference_time_str=original_time_str,
+                index_by_iid = self._index_by_iid
+                pending = self._indices_to_convert(
+                    [index for index in map(index_by_iid.get, selected_items) if index is not None],
+                    is_relative,
+                )
+                converted = self._apply_time_representation_batch(
+                    pending, make_relative=is_relative, sequential=True)
+                if len(converted) < len(pending) and len(selected_items) == 1:
+                    messagebox.showwarning(
+                        "Invalid Conversion",
+                        "First point cannot be relative time. Keeping as absolute.",
                     )
-                    if not converted:
-                        if len(selected_items) == 1:
-                            messagebox.showwarning(
-                                "Invalid Conversion",
-                                "First point cannot be relative time. Keeping as absolute.",
-                            )
-                        continue
-
-            # Cleanup any active editors
-            if self.edit_entry:
-                self.edit_entry.destroy()
-                self.edit_entry = None
-            if self.edit_combo:
-                self.edit_combo.destroy()
-                self.edit_combo = None
-            self.edit_item = None
-            self.edit_selected_items = None
-            self.previous_selection = None
 
-            # Refresh UI
-            self.update_table()
-            self.update_plot()
-            self.table_to_text()
-            self.mark_unsaved()
+                # Cleanup any active editors
+                if self.edit_entry:
+                    self.edit_entry.destroy()
+                    self.edit_entry = None
+                self.edit_item = None
+                self.edit_selected_items = None
+                self.previous_selection = None
+
+                # Refresh UI (performed once when the batch ends)
+                self._commit_changes()
 
         except Exception as e:
             messagebox.showerror("Type Edit Error", f"Failed to apply type: {e}")
 
     def cancel_inline_edit(self, event=None):
         """Cancel inline editing"""
-        # Clean up any combo click tracking
-        if hasattr(self, 'combo_click_value'):
-            delattr(self, 'combo_click_value')
-        if hasattr(self, 'combo_selection_happened'):
-            delattr(self, 'combo_selection_happened')
-                
         if self.edit_entry:
             self.edit_entry.destroy()
             self.edit_entry = None
-        if self.edit_combo:
-            self.edit_combo.destroy()
-            self.edit_combo = None
         self.edit_item = None
         self.edit_selected_items = None
         # Clear any preserved selection state to prevent confusion
@@ -975,20 +1183,10 @@ class PWLEditor:
         count = len(selected_items)
         self._operation_description = f"Remove {count} point{'s' if count > 1 else ''}"
         
-        indices_to_remove = []
-        for item in selected_items:
-            values = self.table.item(item, 'values')
-            if values:
-                indices_to_remove.append(int(values[0]) - 1)  # Convert to 0-based index
-        
-        # Remove in reverse order
-        for index in sorted(indices_to_remove, reverse=True):
-            self.pwl_data.remove_point(index)
+        self.pwl_data.remove_points(self._indices_for_items(selected_items))
         
         # Update views
-        self.update_table()
-        self.update_plot()
-        self.mark_unsaved()
+        self._commit_changes(text=False)
 
     def move_point_up(self):
         """Move selected points up in the table"""
@@ -997,15 +1195,10 @@ class PWLEditor:
             messagebox.showwarning("No Selection", "Please select point(s) to move")
             return
         
-        # Get indices of selected items
-        indices = []
-        for item in selected:
-            values = self.table.item(item, 'values')
-            if values:
-                indices.append(int(values[0]) - 1)  # Convert to 0-based index
-        
-        # Sort indices to process from top to bottom
-        indices.sort()
+        # Get indices of selected items (sorted, from the row cache)
+        indices = self._indices_for_items(selected)
+        if not indices:
+            return
         
         # Check if we can move all selected points up
         if indices[0] <= 0:
@@ -1013,17 +1206,10 @@ class PWLEditor:
             return
         
         # Move all selected points up by one position
-        for i in indices:
-            self.pwl_data.swap_points(i, i - 1)
-        
-        self.update_table()
-        self.update_plot()
-        self.mark_unsaved()
+        self.pwl_data.move_points(indices, -1)
         
-        # Re-select the moved items
-        for i in indices:
-            if i - 1 >= 0:
-                self.table.selection_add(self.table.get_children()[i - 1])
+        # Refresh and re-select the moved items
+        self._commit_changes(reselect=[i - 1 for i in indices if i - 1 >= 0], text=False)
 
     def move_point_down(self):
         """Move selected points down in the table"""
@@ -1032,102 +1218,69 @@ class PWLEditor:
             messagebox.showwarning("No Selection", "Please select point(s) to move")
             return
         
-        # Get indices of selected items
-        indices = []
-        for item in selected:
-            values = self.table.item(item, 'values')
-            if values:
-                indices.append(int(values[0]) - 1)  # Convert to 0-based index
-        
-        # Sort indices to process from bottom to top
-        indices.sort(reverse=True)
+        # Get indices of selected items (sorted, from the row cache)
+        indices = self._indices_for_items(selected)
+        if not indices:
+            return
         
         # Check if we can move all selected points down
-        if indices[0] >= self.pwl_data.get_point_count() - 1:
+        if indices[-1] >= self.pwl_data.get_point_count() - 1:
             messagebox.showinfo("Cannot Move", "Cannot move selection down - already at bottom")
             return
         
         # Move all selected points down by one position
-        for i in indices:
-            self.pwl_data.swap_points(i, i + 1)
+        self.pwl_data.move_points(indices, 1)
         
-        self.update_table()
-        self.update_plot()
-        self.mark_unsaved()
-        
-        # Re-select the moved items
-        for i in sorted(indices):
-            if i + 1 < len(self.table.get_children()):
-                self.table.selection_add(self.table.get_children()[i + 1])
+        # Refresh and re-select the moved items
+        self._commit_changes(reselect=[i + 1 for i in indices], text=False)
 
     def on_export_format_changed(self, event=None):
         return self.text_controller.on_export_format_changed(event)
     
     def table_to_text_with_format(self):
+        if self._batch_depth:
+            self._batch_pending['text'] = True
+            return
         return self.text_controller.table_to_text_with_format()
     
     def _get_formatted_content_for_save(self, apply_export_format: bool = True):
         return self.text_controller.get_formatted_content_for_save(apply_export_format=apply_export_format)
 
-    def generate_square_wave(self):
-        """Open the square wave generator dialog and merge the result if applied."""
+    def _run_data_dialog(self, module, class_name, title, load_error, description, success_status=None):
+        """Show a modal dialog that returns new PwlData and adopt its result.
+        
+        Nothing changes when the dialog cannot be loaded or returns None.
+        """
         try:
-            from dialogs.square_wave_dialog import SquareWaveGeneratorDialog
+            dialog_cls = _dialog_class(module, class_name)
         except ImportError as exc:
-            messagebox.showerror("Generate Square Wave", f"Failed to load generator dialog: {exc}")
+            messagebox.showerror(title, f"{load_error}: {exc}")
             return
 
-        dialog = SquareWaveGeneratorDialog(self)
-        generated_data = dialog.show()
-        if generated_data is None:
+        result = dialog_cls(self).show()
+        if result is None:
             return
 
-        self._operation_description = "Generate square wave"
-        self.pwl_data = generated_data
-        self.update_table()
-        self.table_to_text_with_format()
-        self.update_plot()
-        self.mark_unsaved()
+        self._operation_description = description
+        self.pwl_data = result
+        self._commit_changes(formatted=True)
+        if success_status:
+            self.status_var.set(success_status)
+
+    def generate_square_wave(self):
+        """Open the square wave generator dialog and merge the result if applied."""
+        self._run_data_dialog(_square_wave_dialog, 'SquareWaveGeneratorDialog', "Generate Square Wave",
+                              "Failed to load generator dialog", "Generate square wave")
 
     def generate_triangle_wave(self):
         """Open the triangle wave generator dialog and merge the result if applied."""
-        try:
-            from dialogs.triangle_wave_dialog import TriangleWaveGeneratorDialog
-        except ImportError as exc:
-            messagebox.showerror("Generate Triangle Wave", f"Failed to load generator dialog: {exc}")
-            return
-
-        dialog = TriangleWaveGeneratorDialog(self)
-        generated_data = dialog.show()
-        if generated_data is None:
-            return
-
-        self._operation_description = "Generate triangle wave"
-        self.pwl_data = generated_data
-        self.update_table()
-        self.table_to_text_with_format()
-        self.update_plot()
-        self.mark_unsaved()
+        self._run_data_dialog(_triangle_wave_dialog, 'TriangleWaveGeneratorDialog', "Generate Triangle Wave",
+                              "Failed to load generator dialog", "Generate triangle wave")
 
     def generate_saw_wave(self):
         """Open the saw wave generator dialog and merge the result if applied."""
-        try:
-            from dialogs.saw_wave_dialog import SawWaveGeneratorDialog
-        except ImportError as exc:
-            messagebox.showerror("Generate Saw Wave", f"Failed to load generator dialog: {exc}")
-            return
-
-        dialog = SawWaveGeneratorDialog(self)
-        generated_data = dialog.show()
-        if generated_data is None:
-            return
-
-        self._operation_description = "Generate saw wave"
-        self.pwl_data = generated_data
-        self.update_table()
-        self.table_to_text_with_format()
-        self.update_plot()
-        self.mark_unsaved()
+        self._run_data_dialog(_saw_wave_dialog, 'SawWaveGeneratorDialog', "Generate Saw Wave",
+                              "Failed to load generator dialog", "Generate saw wave")
 
     def repair_waveform(self):
         """Open the waveform repair dialog and apply fixes if requested."""
@@ -1135,34 +1288,21 @@ class PWLEditor:
             messagebox.showinfo("Repair Waveform", "No waveform data to repair.")
             return
 
-        try:
-            from dialogs.waveform_repair_dialog import WaveformRepairDialog
-        except ImportError as exc:
-            messagebox.showerror("Repair Waveform", f"Failed to load repair dialog: {exc}")
-            return
-
-        dialog = WaveformRepairDialog(self)
-        repaired_data = dialog.show()
-        if not repaired_data:
-            # Dialog already restored original data/state when cancelling or when no repair was needed
-            return
-
-        self._operation_description = "Repair waveform"
-        self.pwl_data = repaired_data
-        self.update_table()
-        self.table_to_text_with_format()
-        self.update_plot()
-        self.mark_unsaved()
-        self.status_var.set("Waveform repaired successfully")
+        # The dialog restores the original data/state itself when cancelled or
+        # when no repair was needed, and then returns None
+        self._run_data_dialog(_waveform_repair_dialog, 'WaveformRepairDialog', "Repair Waveform",
+                              "Failed to load repair dialog", "Repair waveform",
+                              success_status="Waveform repaired successfully")
 
     def sort_data(self):
         """Sort data points by time"""
         if self.pwl_data.get_point_count() > 0:
+            if self.pwl_data.is_time_sorted():
+                self.status_var.set("Data already sorted by time")
+                return
             # Data is automatically sorted when added, but this forces a resort
             self.pwl_data._sort_by_time()
-            self.update_table()
-            self.update_plot()
-            self.mark_unsaved()
+            self._commit_changes(text=False)
             self.status_var.set("Data sorted by time")
 
     def clear_all(self):
@@ -1170,7 +1310,8 @@ class PWLEditor:
         if self.pwl_data.get_point_count() > 0:
             if messagebox.askyesno("Clear All", "Are you sure you want to clear all data?"):
                 self.pwl_data.clear()
-                self.update_table()
+                # Nothing to repopulate: just drop the rows
+                self._clear_table_rows()
                 self.update_plot()
                 self.table_to_text()
                 self.mark_unsaved()
@@ -1184,219 +1325,106 @@ class PWLEditor:
         """Use shared engineering-style scientific formatting."""
         return self.format_service.format_engineering(value)
 
-    def convert_time_to_si(self):
-        """Convert time values to SI prefix notation (selection-aware)."""
+    def _convert_notation(self, notation, convert_time, convert_value, messages):
+        """Rewrite time and/or value strings of the selection (or all points).
+        
+        All numbers of a column are formatted in one vectorized call, and the
+        table, text and plot are refreshed once afterwards. *messages* holds
+        the (nothing converted, selection, all points, error) status texts.
+        """
+        none_msg, selection_msg, all_msg, error_msg = messages
         try:
             selection = self._get_selected_point_indices()
-            point_count = self.pwl_data.get_point_count()
-            if point_count == 0:
+            points = self.pwl_data.points
+            if not points:
                 self.status_var.set("No data to convert")
                 return
 
-            targets = selection if selection else list(range(point_count))
-            converted = 0
-            for index in targets:
-                point = self.pwl_data.points[index]
-                if hasattr(point, 'time_str') and point.time_str:
-                    time_val = point.get_time_value()
-                    si_str = self._format_si_prefix(time_val)
-                    point.update_time_str(si_str)
-                    converted += 1
+            if notation == 'si':
+                format_many = self.format_service.format_si_array
+            else:
+                format_many = self.format_service.format_engineering_array
+            targets = [points[i] for i in selection] if selection else list(points)
+
+            converted = len(targets) if convert_time and convert_value else 0
+            if convert_time:
+                timed = [point for point in targets if point.time_str]
+                times = np.fromiter((point.get_time_value() for point in timed), dtype=float, count=len(timed))
+                for point, text in zip(timed, format_many(times)):
+                    point.update_time_str(text)
+                converted = converted or len(timed)
+            if convert_value:
+                valued = [point for point in targets if point.value_str]
+                values = np.fromiter((point.get_value_value() for point in valued), dtype=float, count=len(valued))
+                for point, text in zip(valued, format_many(values)):
+                    point.update_value_str(text)
+                converted = converted or len(valued)
 
             if converted == 0:
-                self.status_var.set("No time values converted")
+                self.status_var.set(none_msg)
                 return
 
-            self.update_table()
-            self._reselect_table_indices(selection)
-            self.table_to_text_with_format()
-            self.update_plot(selection if selection else None)
-            self.mark_unsaved()
+            self._commit_changes(plot_selection=selection or None, reselect=selection, formatted=True)
             if selection:
-                self.status_var.set(f"Converted time to SI prefix for {converted} selected point{'s' if converted != 1 else ''}")
+                self.status_var.set(selection_msg.format(n=converted, s='s' if converted != 1 else ''))
             else:
-                self.status_var.set("Time values converted to SI prefix notation")
+                self.status_var.set(all_msg)
         except Exception as e:
-            self.status_var.set(f"Error converting time to SI: {e}")
+            self.status_var.set(f"{error_msg}: {e}")
+
+    def convert_time_to_si(self):
+        """Convert time values to SI prefix notation (selection-aware)."""
+        self._convert_notation('si', True, False, (
+            "No time values converted",
+            "Converted time to SI prefix for {n} selected point{s}",
+            "Time values converted to SI prefix notation",
+            "Error converting time to SI",
+        ))
 
     def convert_time_to_scientific(self):
         """Convert time values to scientific notation (selection-aware)."""
-        try:
-            selection = self._get_selected_point_indices()
-            point_count = self.pwl_data.get_point_count()
-            if point_count == 0:
-                self.status_var.set("No data to convert")
-                return
-
-            targets = selection if selection else list(range(point_count))
-            converted = 0
-            for index in targets:
-                point = self.pwl_data.points[index]
-                if hasattr(point, 'time_str') and point.time_str:
-                    time_val = point.get_time_value()
-                    sci_str = self._format_scientific(time_val)
-                    point.update_time_str(sci_str)
-                    converted += 1
-
-            if converted == 0:
-                self.status_var.set("No time values converted")
-                return
-
-            self.update_table()
-            self._reselect_table_indices(selection)
-            self.table_to_text_with_format()
-            self.update_plot(selection if selection else None)
-            self.mark_unsaved()
-            if selection:
-                self.status_var.set(f"Converted time to scientific notation for {converted} selected point{'s' if converted != 1 else ''}")
-            else:
-                self.status_var.set("Time values converted to scientific notation")
-        except Exception as e:
-            self.status_var.set(f"Error converting time to scientific: {e}")
+        self._convert_notation('scientific', True, False, (
+            "No time values converted",
+            "Converted time to scientific notation for {n} selected point{s}",
+            "Time values converted to scientific notation",
+            "Error converting time to scientific",
+        ))
 
     def convert_value_to_si(self):
         """Convert value data to SI prefix notation (selection-aware)."""
-        try:
-            selection = self._get_selected_point_indices()
-            point_count = self.pwl_data.get_point_count()
-            if point_count == 0:
-                self.status_var.set("No data to convert")
-                return
-
-            targets = selection if selection else list(range(point_count))
-            converted = 0
-            for index in targets:
-                point = self.pwl_data.points[index]
-                if hasattr(point, 'value_str') and point.value_str:
-                    value_val = point.get_value_value()
-                    si_str = self._format_si_prefix(value_val)
-                    point.update_value_str(si_str)
-                    converted += 1
-
-            if converted == 0:
-                self.status_var.set("No values converted")
-                return
-
-            self.update_table()
-            self._reselect_table_indices(selection)
-            self.table_to_text_with_format()
-            self.update_plot(selection if selection else None)
-            self.mark_unsaved()
-            if selection:
-                self.status_var.set(f"Converted values to SI prefix for {converted} selected point{'s' if converted != 1 else ''}")
-            else:
-                self.status_var.set("Values converted to SI prefix notation")
-        except Exception as e:
-            self.status_var.set(f"Error converting values to SI: {e}")
+        self._convert_notation('si', False, True, (
+            "No values converted",
+            "Converted values to SI prefix for {n} selected point{s}",
+            "Values converted to SI prefix notation",
+            "Error converting values to SI",
+        ))
 
     def convert_value_to_scientific(self):
         """Convert value data to scientific notation (selection-aware)."""
-        try:
-            selection = self._get_selected_point_indices()
-            point_count = self.pwl_data.get_point_count()
-            if point_count == 0:
-                self.status_var.set("No data to convert")
-                return
-
-            targets = selection if selection else list(range(point_count))
-            converted = 0
-            for index in targets:
-                point = self.pwl_data.points[index]
-                if hasattr(point, 'value_str') and point.value_str:
-                    value_val = point.get_value_value()
-                    sci_str = self._format_scientific(value_val)
-                    point.update_value_str(sci_str)
-                    converted += 1
-
-            if converted == 0:
-                self.status_var.set("No values converted")
-                return
-
-            self.update_table()
-            self._reselect_table_indices(selection)
-            self.table_to_text_with_format()
-            self.update_plot(selection if selection else None)
-            self.mark_unsaved()
-            if selection:
-                self.status_var.set(f"Converted values to scientific notation for {converted} selected point{'s' if converted != 1 else ''}")
-            else:
-                self.status_var.set("Values converted to scientific notation")
-        except Exception as e:
-            self.status_var.set(f"Error converting values to scientific: {e}")
+        self._convert_notation('scientific', False, True, (
+            "No values converted",
+            "Converted values to scientific notation for {n} selected point{s}",
+            "Values converted to scientific notation",
+            "Error converting values to scientific",
+        ))
 
     def convert_all_to_si(self):
         """Convert time and values to SI prefix notation (selection-aware)."""
-        try:
-            selection = self._get_selected_point_indices()
-            point_count = self.pwl_data.get_point_count()
-            if point_count == 0:
-                self.status_var.set("No data to convert")
-                return
-
-            targets = selection if selection else list(range(point_count))
-            converted = 0
-            for index in targets:
-                point = self.pwl_data.points[index]
-                if hasattr(point, 'time_str') and point.time_str:
-                    time_val = point.get_time_value()
-                    point.update_time_str(self._format_si_prefix(time_val))
-                if hasattr(point, 'value_str') and point.value_str:
-                    value_val = point.get_value_value()
-                    point.update_value_str(self._format_si_prefix(value_val))
-                converted += 1
-
-            if converted == 0:
-                self.status_var.set("No points converted")
-                return
-
-            self.update_table()
-            self._reselect_table_indices(selection)
-            self.table_to_text_with_format()
-            self.update_plot(selection if selection else None)
-            self.mark_unsaved()
-            if selection:
-                self.status_var.set(f"Converted SI prefix for {converted} selected point{'s' if converted != 1 else ''}")
-            else:
-                self.status_var.set("All data converted to SI prefix notation")
-        except Exception as e:
-            self.status_var.set(f"Error converting to SI: {e}")
+        self._convert_notation('si', True, True, (
+            "No points converted",
+            "Converted SI prefix for {n} selected point{s}",
+            "All data converted to SI prefix notation",
+            "Error converting to SI",
+        ))
 
     def convert_all_to_scientific(self):
         """Convert time and values to scientific notation (selection-aware)."""
-        try:
-            selection = self._get_selected_point_indices()
-            point_count = self.pwl_data.get_point_count()
-            if point_count == 0:
-                self.status_var.set("No data to convert")
-                return
-
-            targets = selection if selection else list(range(point_count))
-            converted = 0
-            for index in targets:
-                point = self.pwl_data.points[index]
-                if hasattr(point, 'time_str') and point.time_str:
-                    time_val = point.get_time_value()
-                    point.update_time_str(self._format_scientific(time_val))
-                if hasattr(point, 'value_str') and point.value_str:
-                    value_val = point.get_value_value()
-                    point.update_value_str(self._format_scientific(value_val))
-                converted += 1
-            
-            if converted == 0:
-                self.status_var.set("No points converted")
-                return
-
-            self.update_table()
-            self._reselect_table_indices(selection)
-            self.table_to_text_with_format()
-            self.update_plot(selection if selection else None)
-            self.mark_unsaved()
-            if selection:
-                self.status_var.set(f"Converted scientific notation for {converted} selected point{'s' if converted != 1 else ''}")
-            else:
-                self.status_var.set("All data converted to scientific notation")
-        except Exception as e:
-            self.status_var.set(f"Error converting all to scientific: {e}")
+        self._convert_notation('scientific', True, True, (
+            "No points converted",
+            "Converted scientific notation for {n} selected point{s}",
+            "All data converted to scientific notation",
+            "Error converting all to scientific",
+        ))
 
     def new_file(self):
         """Create new file - delegate to DocumentService"""
@@ -1418,28 +1446,92 @@ class PWLEditor:
         """Export current data without changing the active document."""
         return self.document_service.export_file()
 
+    def on_text_modified(self, event=None):
+        """Track user edits of the text editor (bound to <<Modified>>)"""
+        try:
+            if self.text_editor.edit_modified():
+                self._text_dirty = True
+        except tk.TclError:
+            pass
+
+    def _mark_text_synced(self):
+        """Record that the text editor currently holds valid PWL text"""
+        self._text_dirty = False
+        self._text_generation += 1
+        self._last_validated_digest = None
+        try:
+            self.text_editor.edit_modified(False)
+        except tk.TclError:
+            pass
+
     def on_text_changed(self, event):
         """Handle text editor changes with real-time validation"""
+        # Key releases that did not change the text (navigation, modifiers,
+        # shortcuts that rewrote the text programmatically) must not mark the
+        # document unsaved or re-parse it. Every edit sets the modified flag;
+        # programmatic updates clear it via _mark_text_synced.
+        try:
+            if not self.text_editor.edit_modified():
+                return
+            self.text_editor.edit_modified(False)
+        except tk.TclError:
+            pass
+        self._text_dirty = True
         self.mark_unsaved()
         
+        self._text_generation += 1
+        
         # Cancel any pending validation
-        if hasattr(self, 'validation_after_id'):
+        if self.validation_after_id is not None:
             self.root.after_cancel(self.validation_after_id)
         
         # Schedule validation after 500ms of no typing
         self.validation_after_id = self.root.after(500, self.validate_text_content)
 
     def validate_text_content(self):
-        """Validate text content and update status"""
+        """Validate text content in a worker thread and update status when done"""
+        self.validation_after_id = None
         try:
             text_content = self.text_editor.get(1.0, tk.END).strip()
             if not text_content:
                 self.parse_status_var.set("Empty text")
+                self._mark_text_synced()
                 return
             
-            # Try to parse the text content
-            temp_pwl_data = PwlData()
-            if temp_pwl_data.load_from_text(text_content):
+            # Nothing to do if this exact text was already validated
+            digest = hashlib.blake2b(text_content.encode('utf-8'), digest_size=16).digest()
+            if digest == self._last_validated_digest:
+                return
+            
+            if self._validation_future is not None:
+                self._validation_future.cancel()
+            if self._validation_executor is None:
+                self._validation_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='pwl-validate')
+            
+            # Parse off the Tk thread; the result is polled back on the main loop
+            future = self._validation_executor.submit(_parse_pwl_text, text_content)
+            self._validation_future = future
+            self.root.after(20, self._poll_validation, future, self._text_generation, digest)
+        except Exception as e:
+            self.parse_status_var.set(f"⚠ Error: {str(e)[:20]}...")
+
+    def _poll_validation(self, future, generation, digest):
+        """Apply a finished background parse if the text hasn't changed since"""
+        if not future.done():
+            self.root.after(20, self._poll_validation, future, generation, digest)
+            return
+        if future is not self._validation_future:
+            return
+        self._validation_future = None
+        if future.cancelled() or generation != self._text_generation:
+            return
+        
+        try:
+            temp_pwl_data = future.result()
+            if temp_pwl_data is not None:
+                self._mark_text_synced()
+                self._last_validated_digest = digest
                 point_count = temp_pwl_data.get_point_count()
                 self.parse_status_var.set(f"✓ Valid - {point_count} points")
                 
@@ -1462,33 +1554,24 @@ class PWLEditor:
                 self.status_var.set("Not enough points to convert to relative time")
                 return
 
-            absolute_times = self.pwl_data.timestamps
-            converted = 0
+            # Re-clicking the button: nothing to change, leave the views alone
+            relative = self.pwl_data.relative_mask()
+            if self.pwl_data.default_format == 'relative' and not relative[0] and relative[1:].all():
+                self.status_var.set("All points are already in relative time format")
+                return
 
             # Ensure first point remains absolute without altering existing formatting
             first_point = self.pwl_data.points[0]
             first_point.is_relative = False
 
-            for index in range(1, point_count):
-                original_time = self.pwl_data.points[index].time_str
-                if self._apply_time_representation(
-                    self.pwl_data,
-                    index,
-                    make_relative=True,
-                    reference_time_str=original_time,
-                    absolute_times=absolute_times,
-                ):
-                    converted += 1
+            converted = len(self._apply_time_representation_batch(range(1, point_count), make_relative=True))
 
             if converted == 0:
                 self.status_var.set("No points converted to relative time")
                 return
 
             self.pwl_data.default_format = 'relative'
-            self.update_table()
-            self.table_to_text_with_format()
-            self.update_plot()
-            self.mark_unsaved()
+            self._commit_changes(formatted=True)
             self.status_var.set("Converted all points to relative time format")
         except Exception as e:
             messagebox.showerror("Conversion Error", f"Failed to convert to relative time: {e}")
@@ -1502,28 +1585,18 @@ class PWLEditor:
                 self.status_var.set("No data to convert")
                 return
 
-            absolute_times = self.pwl_data.timestamps
-            converted = 0
-            for index in range(point_count):
-                original_time = self.pwl_data.points[index].time_str
-                if self._apply_time_representation(
-                    self.pwl_data,
-                    index,
-                    make_relative=False,
-                    reference_time_str=original_time,
-                    absolute_times=absolute_times,
-                ):
-                    converted += 1
+            if self.pwl_data.default_format == 'absolute' and not self.pwl_data.relative_mask().any():
+                self.status_var.set("All points are already in absolute time format")
+                return
+
+            converted = len(self._apply_time_representation_batch(range(point_count), make_relative=False))
 
             if converted == 0:
                 self.status_var.set("No points converted to absolute time")
                 return
 
             self.pwl_data.default_format = 'absolute'
-            self.update_table()
-            self.table_to_text_with_format()
-            self.update_plot()
-            self.mark_unsaved()
+            self._commit_changes(formatted=True)
             self.status_var.set("Converted all points to absolute time format")
         except Exception as e:
             messagebox.showerror("Conversion Error", f"Failed to convert to absolute time: {e}")
@@ -1537,21 +1610,10 @@ class PWLEditor:
 
         try:
             self._operation_description = "Convert selection to relative time"
-            absolute_times = self.pwl_data.timestamps
-            converted = 0
-            skipped_first = False
-            for index in selection:
-                original_time = self.pwl_data.points[index].time_str
-                if self._apply_time_representation(
-                    self.pwl_data,
-                    index,
-                    make_relative=True,
-                    reference_time_str=original_time,
-                    absolute_times=absolute_times,
-                ):
-                    converted += 1
-                elif index == 0:
-                    skipped_first = True
+            # Points that are already relative keep their text untouched
+            pending = self._indices_to_convert(selection, True)
+            converted = len(self._apply_time_representation_batch(pending, make_relative=True))
+            skipped_first = 0 in pending
 
             if converted == 0:
                 message = "No points converted to relative time"
@@ -1560,11 +1622,7 @@ class PWLEditor:
                 self.status_var.set(message)
                 return
 
-            self.update_table()
-            self._reselect_table_indices(selection)
-            self.table_to_text_with_format()
-            self.update_plot(selection)
-            self.mark_unsaved()
+            self._commit_changes(plot_selection=selection, reselect=selection, formatted=True)
 
             message = f"Converted {converted} selected point{'s' if converted != 1 else ''} to relative time"
             if skipped_first:
@@ -1582,46 +1640,48 @@ class PWLEditor:
 
         try:
             self._operation_description = "Convert selection to absolute time"
-            absolute_times = self.pwl_data.timestamps
-            converted = 0
-            for index in selection:
-                original_time = self.pwl_data.points[index].time_str
-                if self._apply_time_representation(
-                    self.pwl_data,
-                    index,
-                    make_relative=False,
-                    reference_time_str=original_time,
-                    absolute_times=absolute_times,
-                ):
-                    converted += 1
+            pending = self._indices_to_convert(selection, False)
+            converted = len(self._apply_time_representation_batch(pending, make_relative=False))
 
             if converted == 0:
                 self.status_var.set("No points converted to absolute time")
                 return
 
-            self.update_table()
-            self._reselect_table_indices(selection)
-            self.table_to_text_with_format()
-            self.update_plot(selection)
-            self.mark_unsaved()
+            self._commit_changes(plot_selection=selection, reselect=selection, formatted=True)
             self.status_var.set(f"Converted {converted} selected point{'s' if converted != 1 else ''} to absolute time")
         except Exception as e:
             self.status_var.set(f"Error converting selection to absolute time: {e}")
 
     def mark_unsaved(self):
         """Mark file as having unsaved changes"""
+        if self._batch_depth:
+            self._batch_pending['unsaved'] = None
+            return
         if not self.unsaved_changes:
             self.unsaved_changes = True
             self.update_title()
 
     def update_title(self):
         """Update window title"""
-        title = f"PWL Editor v{get_version()}"
+        title = self._title_base
         if self.current_file:
             title += f" - {os.path.basename(self.current_file)}"
         if self.unsaved_changes:
             title += " *"
-        self.root.title(title)
+        # Skip the Tk call when nothing in the title changed
+        if title != self._window_title:
+            self._window_title = title
+            self.root.title(title)
+
+    def _text_has_content(self):
+        """True if the text editor holds any non-whitespace character.
+        
+        Searched inside Tk, so the buffer is not copied into a Python string.
+        """
+        try:
+            return bool(self.text_editor.search(r'\S', '1.0', tk.END, regexp=True))
+        except Exception:
+            return False
 
     def check_unsaved_changes(self):
         """Check for unsaved changes and prompt user"""
@@ -1631,13 +1691,7 @@ class PWLEditor:
             except Exception:
                 has_data = False
 
-            text_dirty = False
-            try:
-                text_dirty = bool(self.text_editor.get(1.0, tk.END).strip())
-            except Exception:
-                pass
-
-            if self.current_file is None and not has_data and not text_dirty:
+            if self.current_file is None and not has_data and not self._text_has_content():
                 # Treat pristine startup state as clean even if a flag was toggled
                 self.unsaved_changes = False
                 return True
@@ -1658,6 +1712,12 @@ class PWLEditor:
     def on_closing(self):
         """Handle window closing"""
         if self.check_unsaved_changes():
+            if self._validation_executor is not None:
+                self._validation_executor.shutdown(wait=False, cancel_futures=True)
+            self.document_service.shutdown()
+            if self._plot_after_id is not None:
+                self.root.after_cancel(self._plot_after_id)
+                self._plot_after_id = None
             self.root.destroy()
 
 def main():
@@ -7,8 +7,12 @@ License: GPL-3.0-or-later
 
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+def _ignore(*args, **kwargs):
+    """Stand-in for handler methods the callback handler does not provide"""
+    return None
+
 
 class PWLEditorGeometry:
     def __init__(self, root, callback_handler=None):
@@ -99,23 +103,26 @@ class PWLEditorGeometry:
         tools_menu.add_command(label="Repair Waveform...", command=self._callback('repair_waveform'))
         
         # Keyboard shortcuts
-        self.root.bind('<Control-n>', lambda e: self._callback('new_file')())
-        self.root.bind('<Control-o>', lambda e: self._callback('open_file')())
-        self.root.bind('<Control-s>', lambda e: self._callback('save_file')())
-        self.root.bind('<Control-S>', lambda e: self._callback('save_file_as')())
+        self.root.bind('<Control-n>', lambda e, handler=self._callback('new_file'): handler())
+        self.root.bind('<Control-o>', lambda e, handler=self._callback('open_file'): handler())
+        self.root.bind('<Control-s>', lambda e, handler=self._callback('save_file'): handler())
+        self.root.bind('<Control-S>', lambda e, handler=self._callback('save_file_as'): handler())
         
         # Undo/Redo shortcuts
-        self.root.bind('<Control-z>', lambda e: self._callback('undo')())
-        self.root.bind('<Control-y>', lambda e: self._callback('redo')())
-        self.root.bind('<Control-Z>', lambda e: self._callback('redo')())  # Ctrl+Shift+Z
+        self.root.bind('<Control-z>', lambda e, handler=self._callback('undo'): handler())
+        self.root.bind('<Control-y>', lambda e, handler=self._callback('redo'): handler())
+        self.root.bind('<Control-Z>', lambda e, handler=self._callback('redo'): handler())  # Ctrl+Shift+Z
 
         self.widgets['export_format_var'] = self.export_format_var
     
     def _callback(self, method_name):
-        def wrapper(*args, **kwargs):
-            if self.callback_handler and hasattr(self.callback_handler, method_name):
-                return getattr(self.callback_handler, method_name)(*args, **kwargs)
-        return wrapper
+        """Resolve a handler method once, when the widget is built.
+        
+        Returns the bound method itself (no wrapper frame per click or key
+        press), or a no-op if the handler does not provide it.
+        """
+        method = getattr(self.callback_handler, method_name, None) if self.callback_handler else None
+        return method if method is not None else _ignore
     
     def create_main_layout(self):
         self.status_var = tk.StringVar(value="Ready")
@@ -184,6 +191,13 @@ class PWLEditorGeometry:
         self.table.heading('Value', text='Value')
         self.table.heading('Type', text='Type')
         
+        # Undo descriptions for inline edits, keyed by display column ('#1', ...);
+        # built once so edits don't query the heading text from Tk
+        self.edit_descriptions = {}
+        for position, column in enumerate(columns, start=1):
+            name = self.table.heading(column)['text'].lower()
+            self.edit_descriptions[f'#{position}'] = (f"Edit {name}", f"Edit {name} ({{count}} points)")
+        
         self.table.column('Index', width=50, anchor=tk.CENTER)
         self.table.column('Time', width=120, anchor=tk.E)
         self.table.column('Value', width=120, anchor=tk.E)
@@ -243,19 +257,36 @@ class PWLEditorGeometry:
 
         # Bind text change event
         self.text_editor.bind('<KeyRelease>', self._callback('on_text_changed'))
+        self.text_editor.bind('<<Modified>>', self._callback('on_text_modified'))
 
     def create_plot_view(self):
-        """Create matplotlib plot for waveform preview"""
+        """Create the frame for the waveform preview.
+
+        The matplotlib figure itself is created on first use by ensure_plot(),
+        so importing matplotlib does not delay the window from appearing.
+        """
         # Plot frame
-        plot_frame = ttk.LabelFrame(self.right_frame, text="Waveform Preview")
-        plot_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.plot_frame = ttk.LabelFrame(self.right_frame, text="Waveform Preview")
+        self.plot_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.figure = None
+        self.ax = None
+        self.canvas = None
+
+    def ensure_plot(self):
+        """Create the matplotlib figure and canvas if they don't exist yet"""
+        if self.canvas is not None:
+            return
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
         
         # Create matplotlib figure
-        self.figure, self.ax = plt.subplots(figsize=(6, 4))
+        self.figure = Figure(figsize=(6, 4))
+        self.ax = self.figure.add_subplot()
         self.figure.patch.set_facecolor('white')
         
         # Embed plot in tkinter
-        self.canvas = FigureCanvasTkAgg(self.figure, plot_frame)
+        self.canvas = FigureCanvasTkAgg(self.figure, self.plot_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # Configure plot
@@ -268,6 +299,8 @@ class PWLEditorGeometry:
         self.widgets['figure'] = self.figure
         self.widgets['ax'] = self.ax
         self.widgets['canvas'] = self.canvas
+        
+        self._callback('on_plot_created')()
     
     def get_widget(self, name):
         """Get widget reference by name"""
@@ -6,19 +6,39 @@ License: GPL-3.0-or-later
 """
 
 import logging
+import math
 import numpy as np
-import mimetypes
+from functools import lru_cache
+from operator import attrgetter, itemgetter
 from si_prefix import si_parse
 import os
+from contextlib import contextmanager
+from sys import intern
 
+# Distinct strings remembered by ltspice_si_parse and the point parsers
+PARSE_CACHE_SIZE = 16384
+
+# Last characters of strings that may be plain floats
+_DIGITS = frozenset('0123456789')
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def ltspice_si_parse(value_str):
     """
     Parse SI values with LTSpice compatibility
     Handles LTSpice's 'u' notation for microseconds
+    Results are memoized; PWL text repeats a small set of strings
     """
     # Remove leading '+' for relative time values
     clean_str = value_str.lstrip('+')
     
+    # Plain numbers ("3.3", "0", "1e-6") are what float() reads directly;
+    # only strings ending in a unit letter need the prefix handling below
+    if clean_str[-1:] in _DIGITS:
+        try:
+            return float(clean_str)
+        except ValueError:
+            pass
+    
     # Convert LTSpice 'u' notation to proper microsecond notation
     # LTSpice uses 'u' for microseconds, but si_prefix expects 'µ' or doesn't recognize 'u'
     if clean_str.endswith('u'):
@@ -36,31 +56,98 @@ def ltspice_si_parse(value_str):
     return si_parse(clean_str)
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_time_str(time_str):
+    """Parse a point's time string (relative '+' prefix allowed); 0.0 if invalid
+    
+    Strings are immutable, so results are memoized: conversions and edits
+    keep producing the same few strings (e.g. one step size for every delta).
+    """
+    try:
+        # Remove '+' prefix for relative times
+        return ltspice_si_parse(time_str.lstrip('+'))
+    except Exception:
+        return 0.0
+
+
+def _time_text(time_value):
+    """Return the stored '.9g' text for a computed time and the value that text parses to.
+    
+    Finite values print as plain float literals, which parse to float(text),
+    so no SI parse is needed for them.
+    """
+    text = f"{time_value:.9g}"
+    if math.isfinite(time_value):
+        return text, float(text)
+    return text, _parse_time_str(text)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_value_str(value_str):
+    """Parse a point's value string; 0.0 if invalid"""
+    try:
+        return ltspice_si_parse(value_str)
+    except Exception:
+        return 0.0
+
+
 class PwlPoint:
     """Represents a single PWL point with both string and computed values"""
+    # Slots keep large waveforms compact and attribute access fast
+    __slots__ = ('time_str', 'value_str', '_is_relative', '_time_value', '_value_value', '_state')
+    
+    # Bumped on every in-place point edit; lets PwlData detect stale caches
+    _mutation_count = 0
+    
     def __init__(self, time_str, value_str, is_relative=False):
-        self.time_str = time_str.strip()     # Time as string (e.g., "5n", "1.2e-6", "10u")
-        self.value_str = value_str.strip()   # Value as string (e.g., "3.3", "0", "1e-3")
-        self.is_relative = is_relative       # True if this is a +delta point
+        self.time_str = intern(time_str.strip())     # Time as string (e.g., "5n", "1.2e-6", "10u")
+        self.value_str = intern(value_str.strip())   # Value as string (e.g., "3.3", "0", "1e-3")
+        self._is_relative = is_relative      # True if this is a +delta point
         
         # Computed values (cached for performance)
         self._time_value = None
         self._value_value = None
+        self._state = None                   # Cached (time_str, value_str, is_relative) tuple
         self._compute_values()
     
+    @property
+    def is_relative(self):
+        """True if this point is stored as a +delta from its predecessor"""
+        return self._is_relative
+    
+    @is_relative.setter
+    def is_relative(self, flag):
+        self._is_relative = flag
+        self._state = None
+        PwlPoint._mutation_count += 1
+    
+    def to_tuple(self):
+        """Return the immutable (time_str, value_str, is_relative) state of this point.
+        
+        The tuple is cached until the point is modified, so consecutive snapshots
+        of unchanged points share the same object.
+        """
+        state = self._state
+        if state is None:
+            state = self._state = (self.time_str, self.value_str, self._is_relative)
+        return state
+    
+    @classmethod
+    def _from_parsed(cls, time_str, value_str, is_relative, time_value, value_value):
+        """Create a point from stripped strings whose numeric values are already known"""
+        point = cls.__new__(cls)
+        point.time_str = time_str
+        point.value_str = value_str
+        point._is_relative = is_relative
+        point._time_value = time_value
+        point._value_value = value_value
+        point._state = None
+        return point
+    
     def _compute_values(self):
         """Compute numeric values from strings"""
-        try:
-            # Remove '+' prefix for relative times
-            clean_time = self.time_str.lstrip('+')
-            self._time_value = ltspice_si_parse(clean_time)
-        except:
-            self._time_value = 0.0
-            
-        try:
-            self._value_value = ltspice_si_parse(self.value_str)
-        except:
-            self._value_value = 0.0
+        self._time_value = _parse_time_str(self.time_str)
+        self._value_value = _parse_value_str(self.value_str)
     
     def get_time_value(self):
         """Get computed time value"""
@@ -83,13 +170,31 @@ class PwlPoint:
     
     def update_time_str(self, new_time_str):
         """Update time string and recompute values"""
-        self.time_str = new_time_str.strip()
-        self._compute_values()
+        self.time_str = intern(new_time_str.strip())
+        self._state = None
+        PwlPoint._mutation_count += 1
+        self._time_value = _parse_time_str(self.time_str)
     
     def update_value_str(self, new_value_str):
         """Update value string and recompute values"""
-        self.value_str = new_value_str.strip()
-        self._compute_values()
+        self.value_str = intern(new_value_str.strip())
+        self._state = None
+        PwlPoint._mutation_count += 1
+        self._value_value = _parse_value_str(self.value_str)
+    
+    def _set_time(self, time_str, time_value):
+        """Store an already stripped time string with its parsed value"""
+        self.time_str = intern(time_str)
+        self._time_value = time_value
+        self._state = None
+        PwlPoint._mutation_count += 1
+    
+    def _set_value(self, value_str, value_value):
+        """Store an already stripped value string with its parsed value"""
+        self.value_str = intern(value_str)
+        self._value_value = value_value
+        self._state = None
+        PwlPoint._mutation_count += 1
     
     def get_absolute_time(self, previous_absolute_time=0.0):
         """Get the absolute time for this point"""
@@ -114,30 +219,285 @@ class PwlPoint:
             return formatted
 
 
+def _scientific_formatter(precision):
+    spec = f".{precision-1}e"
+    return lambda number: format(number, spec)
+
+
+def _fixed_formatter(precision):
+    spec = f".{precision}f"
+    return lambda number: format(number, spec).rstrip('0').rstrip('.')
+
+
+def _engineering_formatter(precision):
+    spec = f".{precision}g"
+    
+    def fmt(number):
+        # Engineering notation (powers of 3)
+        if number == 0:
+            return "0"
+        exponent = math.floor(math.log10(abs(number)))
+        eng_exp = exponent - (exponent % 3)
+        mantissa = number / (10 ** eng_exp)
+        if eng_exp == 0:
+            return format(mantissa, spec)
+        return f"{format(mantissa, spec)}e{eng_exp:+d}"
+    return fmt
+
+
+def _auto_formatter(precision):
+    # Thresholds for switching to scientific notation, computed once
+    upper = 10**(precision)
+    lower = 10**(-precision+1)
+    sci_spec = f".{precision-1}e"
+    fixed_spec = f".{precision}g"
+    
+    def fmt(number):
+        magnitude = abs(number)
+        if magnitude > upper or (number != 0 and magnitude < lower):
+            return format(number, sci_spec)
+        return format(number, fixed_spec)
+    return fmt
+
+
+# Formatter factories keyed by export format_style; anything else is 'auto'
+_NUMBER_FORMATTERS = {
+    'scientific': _scientific_formatter,
+    'fixed': _fixed_formatter,
+    'engineering': _engineering_formatter,
+}
+
+
+def _number_formatter(precision, format_style):
+    """Return a one-argument formatter with style and precision resolved up front"""
+    return _NUMBER_FORMATTERS.get(format_style, _auto_formatter)(precision)
+
+
+# Relative runs up to this length are accumulated together, step by step
+_SHORT_RUN = 32
+
+# Fetches (time_str, value_str, is_relative) in one C-level call
+_point_fields = attrgetter('time_str', 'value_str', 'is_relative')
+
+
 class PwlData:
     def __init__(self):
-        self.points = []                  # List of PwlPoint objects
+        self._points = []                 # List of PwlPoint objects
+        self._revision = 0                # Bumped by every structural change
+        self._fingerprint_key = None
+        self._fingerprint = None
+        self._snapshot_key = None
+        self._snapshot = None
+        self._display_rows_key = None
+        self._display_rows = []
+        self._time_array_key = None
+        self._time_array = None
+        self._value_array_key = None
+        self._value_array = None
+        self._time_value_array_key = None
+        self._time_value_array = None
+        self._relative_mask_key = None
+        self._relative_mask = None
+        self._time_strings_key = None
+        self._time_strings = None
         self._values_discrete = []
         self._timestamps_discrete = []
         self._discrete_dirty = True
+        self._bulk_depth = 0              # > 0 while a _bulk_edit block is open
         self.timestep = 0.001             # Default timestep for discretization
         self.default_format = 'relative'  # 'relative', 'absolute', 'mixed'
     
+    @property
+    def points(self):
+        """List of PwlPoint objects"""
+        return self._points
+    
+    @points.setter
+    def points(self, new_points):
+        self._points = new_points
+        self._revision += 1
+    
     # Backward compatibility properties
     @property
     def values(self):
         """Get values list for backward compatibility"""
-        return [point.get_value_value() for point in self.points]
+        return self.value_array().tolist()
     
     @property
     def timestamps(self):
         """Get absolute timestamps list for backward compatibility"""
-        absolute_times = []
-        current_time = 0.0
-        for point in self.points:
-            current_time = point.get_absolute_time(current_time)
-            absolute_times.append(current_time)
-        return absolute_times
+        return self.time_array().tolist()
+    
+    def snapshot(self):
+        """Return an immutable snapshot of all points as a tuple of state tuples
+        
+        The tuple is cached until the next modification, so the fingerprint
+        and the undo history's save of the same state share one snapshot.
+        """
+        key = self._state_key()
+        if key != self._snapshot_key:
+            self._snapshot = tuple(point.to_tuple() for point in self.points)
+            self._snapshot_key = key
+        return self._snapshot
+    
+    def _state_key(self):
+        """Cheap key that changes whenever the points or any point is modified"""
+        return (self._revision, len(self._points), PwlPoint._mutation_count)
+    
+    def display_rows(self):
+        """Return cached (number, time_str, value_str, 'REL'/'ABS') rows for table display"""
+        key = self._state_key()
+        if key != self._display_rows_key:
+            self._display_rows = [
+                (i, time_str, value_str, "REL" if is_relative else "ABS")
+                for i, (time_str, value_str, is_relative)
+                in enumerate(map(_point_fields, self._points), 1)
+            ]
+            self._display_rows_key = key
+        return self._display_rows
+    
+    def time_array(self):
+        """Return the absolute timestamps as a read-only float ndarray.
+        
+        Cached until the data or any point is modified.
+        """
+        key = self._state_key()
+        if key != self._time_array_key:
+            times = self._absolute_times()
+            times.flags.writeable = False
+            self._time_array = times
+            self._time_array_key = key
+        return self._time_array
+    
+    def _absolute_times(self):
+        """Compute absolute times from the stored time values and relative flags.
+        
+        Absolute points keep their own time; each run of relative points is
+        accumulated from the time before the run (0.0 at the start) with
+        np.add.accumulate, which adds strictly left to right, so the result
+        is bit-identical to summing point by point.
+        """
+        times = self.time_value_array().copy()
+        # PwlPoint.get_absolute_time reads a -0.0 time as 0.0
+        times[times == 0] = 0.0
+        relative = self.relative_mask()
+        if not relative.any():
+            return times
+        # Boundaries of the runs of consecutive relative points
+        edges = np.diff(relative.astype(np.int8), prepend=0, append=0)
+        run_starts = np.flatnonzero(edges == 1)
+        run_lengths = np.flatnonzero(edges == -1) - run_starts
+        
+        # Long runs: one in-place accumulate each, seeded by the time before
+        # the run (a run at the very start begins from 0.0, which adds
+        # exactly, so it is accumulated on its own)
+        long_runs = run_lengths > _SHORT_RUN
+        for start, length in zip(run_starts[long_runs].tolist(), run_lengths[long_runs].tolist()):
+            run = times[max(start - 1, 0):start + length]
+            np.add.accumulate(run, out=run)
+        
+        # Short runs (e.g. alternating ABS/REL points): advance all of them
+        # one position per step instead of looping over the runs
+        short_starts = run_starts[~long_runs]
+        short_lengths = run_lengths[~long_runs]
+        for offset in range(int(short_lengths.max(initial=0))):
+            positions = short_starts[short_lengths > offset] + offset
+            previous = np.where(positions > 0, times[positions - 1], 0.0)
+            times[positions] = previous + times[positions]
+        return times
+    
+    def value_array(self):
+        """Return the point values as a read-only float ndarray.
+        
+        Cached like time_array(), so the plot, the hit-testing cache and the
+        selection highlight share one conversion per edit.
+        """
+        key = self._state_key()
+        if key != self._value_array_key:
+            values = np.fromiter(map(PwlPoint.get_value_value, self._points), dtype=float, count=len(self._points))
+            values.flags.writeable = False
+            self._value_array = values
+            self._value_array_key = key
+        return self._value_array
+    
+    def time_value_array(self):
+        """Return the points' stored time values (deltas for relative points) as a read-only float ndarray.
+        
+        Cached like time_array(); the absolute times are derived from it.
+        """
+        key = self._state_key()
+        if key != self._time_value_array_key:
+            times = np.fromiter(map(PwlPoint.get_time_value, self._points), dtype=float, count=len(self._points))
+            times.flags.writeable = False
+            self._time_value_array = times
+            self._time_value_array_key = key
+        return self._time_value_array
+    
+    def relative_mask(self):
+        """Return the points' is_relative flags as a read-only bool ndarray (cached like time_array)"""
+        key = self._state_key()
+        if key != self._relative_mask_key:
+            mask = np.fromiter(map(attrgetter('is_relative'), self._points), dtype=bool, count=len(self._points))
+            mask.flags.writeable = False
+            self._relative_mask = mask
+            self._relative_mask_key = key
+        return self._relative_mask
+    
+    def time_strings(self):
+        """Return the points' time strings as a list (cached like time_array; do not modify)"""
+        key = self._state_key()
+        if key != self._time_strings_key:
+            self._time_strings = list(map(attrgetter('time_str'), self._points))
+            self._time_strings_key = key
+        return self._time_strings
+    
+    def is_time_sorted(self):
+        """True if absolute times never decrease from one point to the next"""
+        times = self.time_array()
+        return bool(np.all(times[1:] >= times[:-1]))
+    
+    def fingerprint(self):
+        """Return a hash of the current point state.
+        
+        The hash is cached and only recomputed after the data or any point
+        has been modified, so repeated calls between edits are O(1).
+        """
+        key = self._state_key()
+        if key != self._fingerprint_key:
+            self._fingerprint = hash(self.snapshot())
+            self._fingerprint_key = key
+        return self._fingerprint
+    
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Create a new PwlData instance from a tuple produced by snapshot()"""
+        return cls.from_rows(snapshot)
+    
+    @classmethod
+    def from_rows(cls, rows):
+        """Create a new PwlData instance from (time_str, value_str, is_relative) rows.
+        
+        Waveforms repeat a few levels and step sizes, so each distinct
+        string is parsed and interned only once.
+        """
+        time_entries = {}
+        value_entries = {}
+        points = []
+        for time_str, value_str, is_relative in rows:
+            time_entry = time_entries.get(time_str)
+            if time_entry is None:
+                stripped = intern(time_str.strip())
+                time_entry = time_entries[time_str] = (stripped, _parse_time_str(stripped))
+            time_str, time_value = time_entry
+            value_entry = value_entries.get(value_str)
+            if value_entry is None:
+                stripped = intern(value_str.strip())
+                value_entry = value_entries[value_str] = (stripped, _parse_value_str(stripped))
+            value_str, value_value = value_entry
+            points.append(PwlPoint._from_parsed(time_str, value_str, is_relative, time_value, value_value))
+        pwl_data = cls()
+        pwl_data.points = points
+        return pwl_data
     
     def clear(self):
         """Clear all data points"""
@@ -146,6 +506,12 @@ class PwlData:
     
     def add_point(self, time_str, value_str, is_relative=None):
         """Add a single point and maintain time ordering"""
+        new_point, insert_pos = self._place_point(time_str, value_str, is_relative, self.time_array())
+        self.points.insert(insert_pos, new_point)
+        self._update_discrete()
+    
+    def _place_point(self, time_str, value_str, is_relative, times):
+        """Build a new point and find its ordered position among the absolute times"""
         # Coerce numeric inputs to string form for downstream formatting logic
         if isinstance(time_str, (int, float)):
             time_str = f"{time_str:g}"
@@ -154,44 +520,75 @@ class PwlData:
 
         # Auto-detect format if not specified
         if is_relative is None:
-            is_relative = len(self.points) > 0 and self.default_format == 'relative'
+            is_relative = len(times) > 0 and self.default_format == 'relative'
         
-        # Convert time string to value for ordering logic
-        try:
-            time_val = ltspice_si_parse(time_str.lstrip('+'))
-        except:
-            time_val = 0.0
-            
+        # Parse once; the numbers serve both the ordering logic and the new point
+        time_str = intern(time_str.strip())
+        value_str = intern(value_str.strip())
+        time_val = _parse_time_str(time_str)
+        
+
         # Convert relative time to absolute for insertion logic
-        if is_relative and len(self.points) > 0:
-            last_abs_time = self.get_absolute_time(len(self.points) - 1)
+        if is_relative and len(times) > 0:
+            last_abs_time = float(times[-1])
             abs_time = last_abs_time + time_val
         else:
             abs_time = time_val
             is_relative = False  # First point is always absolute
         
         # Create new point with original strings
-        new_point = PwlPoint(time_str, value_str, is_relative)
-        
-        # Insert in correct position to maintain time ordering
-        insert_pos = 0
-        for i, existing_point in enumerate(self.points):
-            existing_abs_time = self.get_absolute_time(i)
-            if abs_time > existing_abs_time:
-                insert_pos = i + 1
-            else:
-                break
-
-        self.points.insert(insert_pos, new_point)
-        self._update_relative_times_after_insert(insert_pos)
+        new_point = PwlPoint._from_parsed(time_str, value_str, is_relative, time_val, _parse_value_str(value_str))
+        
+        # Insert in correct position to maintain time ordering: before the
+        # first point that is not earlier than the new one
+        not_earlier = np.flatnonzero(~(abs_time > times))
+        insert_pos = int(not_earlier[0]) if not_earlier.size else len(times)
+        return new_point, insert_pos
+    
+    def insert_point(self, index, point):
+        """Insert an existing PwlPoint before the given index (no re-ordering)"""
+        self.insert_points([(index, point)])
+    
+    def insert_points(self, inserts):
+        """Insert several PwlPoint objects in a single pass.
+        
+        inserts is an iterable of (index, point) pairs where index refers to the
+        current list; each point is placed before the point at that index and
+        an index >= len(points) appends. Points sharing an index keep their order.
+        """
+        pending = sorted(inserts, key=itemgetter(0))
+        if not pending:
+            return
+        old_points = self._points
+        count = len(old_points)
+        new_points = []
+        pos = 0
+        for index, point in pending:
+            index = min(max(index, 0), count)
+            if index > pos:
+                new_points.extend(old_points[pos:index])
+                pos = index
+            new_points.append(point)
+        new_points.extend(old_points[pos:])
+        self.points = new_points
         self._update_discrete()
     
     def remove_point(self, index):
         """Remove point at given index"""
-        if 0 <= index < len(self.points):
-            self.points.pop(index)
-            self._update_relative_times_after_remove(index)
-            self._update_discrete()
+        self.remove_points((index,))
+    
+    def remove_points(self, indices):
+        """Remove the points at the given indices in a single pass.
+        
+        Out-of-range indices are ignored. Relative points keep their delta, so
+        they shift together with the points before them.
+        """
+        count = len(self._points)
+        drop = frozenset(i for i in indices if 0 <= i < count)
+        if not drop:
+            return
+        self.points = [point for i, point in enumerate(self._points) if i not in drop]
+        self._update_discrete()
     
     def update_point(self, index, time, value, is_relative=None):
         """Update point at given index"""
@@ -200,9 +597,25 @@ class PwlData:
             if is_relative is None:
                 is_relative = old_point.is_relative
             
-            # Remove old point and add new one
-            self.remove_point(index)
-            self.add_point(time, value, is_relative)
+            following = index + 1
+            if following < len(self.points) and self.points[following].is_relative:
+                # Removing the point moves the relative run after it, so let
+                # add_point place the new one against the shifted times
+                self.remove_point(index)
+                self.add_point(time, value, is_relative)
+                return
+            
+            # No other point depends on this one: the remaining times are the
+            # current ones without it, and an unchanged position is a plain
+            # replacement rather than a remove and insert
+            times = np.delete(self.time_array(), index)
+            new_point, insert_pos = self._place_point(time, value, is_relative, times)
+            if insert_pos == index:
+                self.points[index] = new_point
+            else:
+                del self.points[index]
+                self.points.insert(insert_pos, new_point)
+            self._update_discrete()
     
     def get_point(self, index):
         """Get point at given index as (time, value) tuple (absolute time)"""
@@ -229,66 +642,81 @@ class PwlData:
         """Get absolute time for point at index"""
         if index < 0 or index >= len(self.points):
             return 0.0
-        
-        current_time = 0.0
-        for i in range(index + 1):
-            current_time = self.points[i].get_absolute_time(current_time)
-        return current_time
+        return float(self.time_array()[index])
     
     def get_point_count(self):
         """Get total number of points"""
         return len(self.points)
     
+    def bulk_update_time_str(self, indices, new_time_str):
+        """Set the same time string on several points, parsing it only once"""
+        time_str = new_time_str.strip()
+        time_value = _parse_time_str(time_str)
+        points = self._points
+        for index in indices:
+            points[index]._set_time(time_str, time_value)
+        self._update_discrete()
+    
+    def bulk_update_value_str(self, indices, new_value_str):
+        """Set the same value string on several points, parsing it only once"""
+        value_str = new_value_str.strip()
+        value_value = _parse_value_str(value_str)
+        points = self._points
+        for index in indices:
+            points[index]._set_value(value_str, value_value)
+        self._update_discrete()
+    
     def swap_points(self, index1, index2):
         """Swap two points by their indices"""
         if (0 <= index1 < len(self.points) and 
             0 <= index2 < len(self.points) and 
             index1 != index2):
             self.points[index1], self.points[index2] = self.points[index2], self.points[index1]
+            self._revision += 1
             return True
         return False
     
-    def _update_relative_times_after_insert(self, insert_pos):
-        """Update relative times of points after insertion"""
-        if insert_pos < len(self.points) - 1:
-            # If we inserted a point in the middle, update relative times of following points
-            for i in range(insert_pos + 1, len(self.points)):
-                if self.points[i].is_relative:
-                    # Recalculate relative time based on new predecessor
-                    prev_abs_time = self.get_absolute_time(i - 1)
-                    curr_abs_time = self.get_absolute_time(i)
-                    # This might need adjustment - for now, keep absolute time consistent
-                    pass
-    
-    def _update_relative_times_after_remove(self, removed_index):
-        """Update relative times of points after removal"""
-        if removed_index < len(self.points):
-            # Update relative times of points after the removed one
-            for i in range(removed_index, len(self.points)):
-                if self.points[i].is_relative and i > 0:
-                    # Recalculate relative time based on new predecessor
-                    prev_abs_time = self.get_absolute_time(i - 1) 
-                    # Keep the same absolute time, adjust the relative delta
-                    # This might need more sophisticated logic
-                    pass
+    def move_points(self, indices, offset):
+        """Move the points at indices one position up (offset=-1) or down (offset=1).
+        
+        Equivalent to swapping each point with its neighbour, but every run of
+        consecutive indices is rotated with a single slice assignment.
+        Returns False (and changes nothing) if a point would leave the list.
+        """
+        if offset not in (-1, 1):
+            raise ValueError("offset must be -1 or 1")
+        indices = sorted(set(indices))
+        if not indices:
+            return False
+        if indices[0] + min(offset, 0) < 0 or indices[-1] + max(offset, 0) >= len(self.points):
+            return False
+        
+        points = self.points
+        run_start = indices[0]
+        for position, index in enumerate(indices):
+            is_last = position == len(indices) - 1
+            if not is_last and indices[position + 1] == index + 1:
+                continue
+            # Rotate the run [run_start, index] with its neighbour
+            if offset < 0:
+                points[run_start - 1:index + 1] = points[run_start:index + 1] + [points[run_start - 1]]
+            else:
+                points[run_start:index + 2] = [points[index + 1]] + points[run_start:index + 1]
+            if not is_last:
+                run_start = indices[position + 1]
+        self._update_discrete()
+        return True
     
     def _sort_by_time(self):
         """Sort points by absolute time (for backward compatibility)"""
-        # Create list of (absolute_time, point) pairs
-        time_point_pairs = []
-        current_time = 0.0
-        for point in self.points:
-            current_time = point.get_absolute_time(current_time)
-            time_point_pairs.append((current_time, point))
-        
-        # Sort by absolute time
-        time_point_pairs.sort(key=lambda x: x[0])
-        
-        # Extract sorted points
-        self.points = [pair[1] for pair in time_point_pairs]
-        
-        # Update relative times to maintain consistency
-        self._recalculate_relative_times()
+        with self._bulk_edit():
+            # Stable sort of the points by their (cached) absolute times
+            order = np.argsort(self.time_array(), kind='stable')
+            points = self.points
+            self.points = [points[i] for i in order.tolist()]
+            
+            # Update relative times to maintain consistency
+            self._recalculate_relative_times()
     
     def _recalculate_relative_times(self):
         """Recalculate relative times to maintain consistency after sorting"""
@@ -298,14 +726,17 @@ class PwlData:
         # First point should be absolute
         self.points[0].is_relative = False
         
-        # Recalculate relative deltas for relative points
-        for i in range(1, len(self.points)):
-            if self.points[i].is_relative:
-                prev_abs_time = self.get_absolute_time(i - 1)
-                curr_abs_time = self.get_absolute_time(i)
+        # Recalculate relative deltas for relative points. Each rewrite feeds
+        # into the absolute times of the points after it, so the running
+        # absolute time is carried along instead of re-summed per point.
+        prev_abs_time = self.points[0].get_absolute_time()
+        for point in self.points[1:]:
+            if point.is_relative:
+                curr_abs_time = point.get_absolute_time(prev_abs_time)
                 delta = curr_abs_time - prev_abs_time
                 # Update the time string to reflect the new delta
-                self.points[i].update_time_str(f"{delta:.9g}")
+                point._set_time(*_time_text(delta))
+            prev_abs_time = point.get_absolute_time(prev_abs_time)
     
     def _ensure_discrete(self):
         """Compute discrete samples if the cache is marked dirty."""
@@ -313,8 +744,8 @@ class PwlData:
             return
 
         if len(self.points) > 0:
-            timestamps = self.timestamps  # Use property to get absolute times
-            values = self.values         # Use property to get values
+            timestamps = self.time_array()  # Absolute times
+            values = self.value_array()
             try:
                 result = discretize(timestamps, values, self.timestep)
             except (MemoryError, ValueError, OverflowError) as exc:
@@ -333,8 +764,26 @@ class PwlData:
 
         self._discrete_dirty = False
 
+    @contextmanager
+    def _bulk_edit(self):
+        """Group several point edits into one cache invalidation.
+        
+        Inside the block _update_discrete does nothing; the outermost block
+        invalidates once on exit. Blocks nest.
+        """
+        self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth == 0:
+                self._update_discrete()
+    
     def _update_discrete(self):
         """Mark discrete data dirty; it will be recomputed on demand."""
+        if self._bulk_depth:
+            return
+        self._revision += 1
         self._discrete_dirty = True
         self._timestamps_discrete = []
         self._values_discrete = []
@@ -351,6 +800,8 @@ class PwlData:
     
     def set_timestep(self, timestep):
         """Set timestep for discretization and update"""
+        if timestep == self.timestep:
+            return
         self.timestep = timestep
         self._update_discrete()
     
@@ -364,25 +815,32 @@ class PwlData:
         if not self.points:
             return
         
-        # First point becomes absolute
-        self.points[0].is_relative = False
-        
-        # Convert subsequent points to relative
-        for i in range(1, len(self.points)):
-            prev_abs_time = self.get_absolute_time(i - 1)
-            curr_abs_time = self.get_absolute_time(i)
-            delta = curr_abs_time - prev_abs_time
-            self.points[i].update_time_str(f"{delta:.9g}")
-            self.points[i].is_relative = True
+        with self._bulk_edit():
+            # First point becomes absolute
+            self.points[0].is_relative = False
+            
+            # Convert subsequent points to relative, carrying the running
+            # absolute time of the already converted points
+            prev_abs_time = self.points[0].get_absolute_time()
+            for point in self.points[1:]:
+                curr_abs_time = point.get_absolute_time(prev_abs_time)
+                delta = curr_abs_time - prev_abs_time
+                point._set_time(*_time_text(delta))
+                point.is_relative = True
+                prev_abs_time = point.get_absolute_time(prev_abs_time)
         
         self.default_format = 'relative'
     
     def convert_to_absolute_format(self):
         """Convert all points to absolute format"""
-        for i, point in enumerate(self.points):
-            abs_time = self.get_absolute_time(i)
-            point.update_time_str(f"{abs_time:.9g}")
-            point.is_relative = False
+        with self._bulk_edit():
+            abs_time = 0.0
+            for point in self.points:
+                # Absolute time given the already converted predecessors
+                abs_time = point.get_absolute_time(abs_time)
+                point._set_time(*_time_text(abs_time))
+                point.is_relative = False
+                abs_time = point.get_absolute_time()
         
         self.default_format = 'absolute'
     
@@ -391,11 +849,10 @@ class PwlData:
         if len(self.points) <= 1:
             return True
         
-        timestamps = self.timestamps
-        for i in range(1, len(timestamps)):
-            if timestamps[i] <= timestamps[i-1]:
-                return False
-        return True
+        # One comparison over the cached absolute times; written as "no step
+        # goes backwards or stalls" so NaN times pass exactly as before
+        times = self.time_array()
+        return not bool(np.any(times[1:] <= times[:-1]))
     
     def to_text(self, use_relative_time=True):
         """Export PWL data back to text format (backward compatibility)"""
@@ -412,39 +869,44 @@ class PwlData:
             return ""
         
         lines = []
+        fmt = _number_formatter(precision, 'auto')
+        
+        if export_format in ('force_relative', 'force_absolute'):
+            # Absolute times and values from the cache, formatted in one pass
+            timestamps = self.time_array()
+            values = self.values
         
         if export_format == 'force_relative':
             # Force all to relative format (first absolute)
-            for i, point in enumerate(self.points):
-                if i == 0:
-                    # First point absolute
-                    if preserve_original:
-                        lines.append(f"{point.time_str} {point.value_str}")
-                    else:
-                        lines.append(f"{self._format_number(self.get_absolute_time(i), precision, 'auto')} {self._format_number(point.get_value_value(), precision, 'auto')}")
-                else:
-                    # Subsequent points relative
-                    prev_time = self.get_absolute_time(i - 1)
-                    curr_time = self.get_absolute_time(i)
-                    delta = curr_time - prev_time
-                    lines.append(f"+{self._format_number(delta, precision, 'auto')} {self._format_number(point.get_value_value(), precision, 'auto')}")
+            first = self.points[0]
+            if preserve_original:
+                lines.append(f"{first.time_str} {first.value_str}")
+            else:
+                lines.append(f"{fmt(float(timestamps[0]))} {fmt(values[0])}")
+            # Subsequent points relative
+            deltas = np.diff(timestamps).tolist()
+            lines.extend(
+                f"+{fmt(delta)} {fmt(value)}"
+                for delta, value in zip(deltas, values[1:])
+            )
         
         elif export_format == 'force_absolute':
             # Force all to absolute format
-            for i, point in enumerate(self.points):
-                abs_time = self.get_absolute_time(i)
-                lines.append(f"{self._format_number(abs_time, precision, 'auto')} {self._format_number(point.get_value_value(), precision, 'auto')}")
+            lines.extend(
+                f"{fmt(abs_time)} {fmt(value)}"
+                for abs_time, value in zip(timestamps.tolist(), values)
+            )
         
         else:
             # preserve_mixed or auto: preserve original relative/absolute nature
-            for point in self.points:
-                if preserve_original:
-                    lines.append(point.to_text())
-                else:
-                    if point.is_relative:
-                        lines.append(f"+{self._format_number(point.get_time_value(), precision, 'auto')} {self._format_number(point.get_value_value(), precision, 'auto')}")
+            if preserve_original:
+                lines.extend(point.to_text() for point in self.points)
+            else:
+                for time, value, is_relative in zip(self.time_value_array().tolist(), self.values, self.relative_mask().tolist()):
+                    if is_relative:
+                        lines.append(f"+{fmt(time)} {fmt(value)}")
                     else:
-                        lines.append(f"{self._format_number(point.get_time_value(), precision, 'auto')} {self._format_number(point.get_value_value(), precision, 'auto')}")
+                        lines.append(f"{fmt(time)} {fmt(value)}")
         
         return "\n".join(lines)
     
@@ -458,11 +920,9 @@ class PwlData:
         :param preserve_original: Use original text formatting when available
         :return: PWL formatted text string
         """
-        if len(self.timestamps) == 0:
+        if len(self.points) == 0:
             return ""
         
-        lines = []
-        
         # If preserve_original and we have points with original strings, use them
         if preserve_original and hasattr(self, 'points') and self.points:
             # Use the to_text_with_format method which already handles preserve_original
@@ -472,6 +932,13 @@ class PwlData:
                 preserve_original=True
             )
         
+        return "\n".join(self._iter_text_precise(use_relative_time, precision, adaptive_precision, format_style))
+    
+    def _iter_text_precise(self, use_relative_time, precision, adaptive_precision, format_style):
+        """Yield the lines of to_text_precise's numeric export one at a time"""
+        if len(self.points) == 0:
+            return
+        
         # Determine precision if adaptive
         if adaptive_precision:
             precision = self._determine_adaptive_precision()
@@ -479,64 +946,35 @@ class PwlData:
         # Clamp precision to reasonable bounds
         precision = max(3, min(15, precision))
         
+        timestamps = self.time_array()
+        values = self.values
+        fmt = _number_formatter(precision, format_style)
         if use_relative_time:
             # First point is absolute
-            time_str = self._format_number(self.timestamps[0], precision, format_style)
-            value_str = self._format_number(self.values[0], precision, format_style)
-            lines.append(f"{time_str} {value_str}")
+            yield f"{fmt(float(timestamps[0]))} {fmt(values[0])}"
             
-            # Subsequent points are relative
-            for i in range(1, len(self.timestamps)):
-                time_diff = self.timestamps[i] - self.timestamps[i-1]
-                time_str = self._format_number(time_diff, precision, format_style)
-                value_str = self._format_number(self.values[i], precision, format_style)
-                lines.append(f"+{time_str} {value_str}")
+            # Subsequent points are relative, deltas taken in one pass
+            deltas = np.diff(timestamps).tolist()
+            for delta, value in zip(deltas, values[1:]):
+                yield f"+{fmt(delta)} {fmt(value)}"
         else:
             # All points absolute
-            for time, value in zip(self.timestamps, self.values):
-                time_str = self._format_number(time, precision, format_style)
-                value_str = self._format_number(value, precision, format_style)
-                lines.append(f"{time_str} {value_str}")
-        
-        return "\n".join(lines)
+            for time, value in zip(timestamps.tolist(), values):
+                yield f"{fmt(time)} {fmt(value)}"
     
     def _format_number(self, number, precision, format_style):
         """Format a number according to specified style and precision"""
-        if format_style == 'scientific':
-            return f"{number:.{precision-1}e}"
-        elif format_style == 'fixed':
-            return f"{number:.{precision}f}".rstrip('0').rstrip('.')
-        elif format_style == 'engineering':
-            # Engineering notation (powers of 3)
-            if number == 0:
-                return "0"
-            import math
-            exponent = math.floor(math.log10(abs(number)))
-            eng_exp = exponent - (exponent % 3)
-            mantissa = number / (10 ** eng_exp)
-            if eng_exp == 0:
-                return f"{mantissa:.{precision}g}"
-            return f"{mantissa:.{precision}g}e{eng_exp:+d}"
-        else:  # 'auto' - choose best representation
-            # Use scientific for very large or very small numbers
-            if abs(number) > 10**(precision) or (number != 0 and abs(number) < 10**(-precision+1)):
-                return f"{number:.{precision-1}e}"
-            else:
-                # Use fixed point, but remove trailing zeros
-                formatted = f"{number:.{precision}g}"
-                return formatted
+        return _number_formatter(precision, format_style)(number)
     
     def _determine_adaptive_precision(self):
         """Determine the precision needed to preserve all data accurately"""
-        if len(self.timestamps) == 0:
+        if len(self.points) == 0:
             return 6
         
-        import math
-        
         max_precision = 6  # Start with reasonable default
         
         # Check all values for required precision
-        all_numbers = list(self.timestamps) + list(self.values)
+        all_numbers = self.timestamps + self.values
         
         for num in all_numbers:
             if num == 0:
@@ -570,9 +1008,14 @@ class PwlData:
         :return: True if successful
         """
         try:
-            content = self.to_text_precise(use_relative_time, precision, adaptive_precision)
-            with open(filename, 'w') as f:
-                f.write(content)
+            # Stream the lines instead of joining the whole export first; the
+            # first line is formatted before the file is opened for writing
+            lines = self._iter_text_precise(use_relative_time, precision, adaptive_precision, 'auto')
+            first = next(lines, None)
+            with open(filename, 'w', buffering=1 << 20) as f:
+                if first is not None:
+                    f.write(first)
+                    f.writelines("\n" + line for line in lines)
             return True
         except Exception as e:
             logging.error(f'PWL save error: {e}')
@@ -596,22 +1039,13 @@ class PwlData:
             logging.error('PWL Parser: PWL file not found')
             return False
 
-        # check if text file (allow .pwl and .txt extensions, or if mime type is text)
-        mime_type = mimetypes.guess_type(pwl_text_file)[0]
-        file_ext = os.path.splitext(pwl_text_file)[1].lower()
-        
-        if not (mime_type == 'text/plain' or file_ext in ['.txt', '.pwl', '.dat']):
-            # Try to read first few bytes to see if it's text
+        with open(pwl_text_file) as file:
             try:
-                with open(pwl_text_file, 'r') as test_file:
-                    test_file.read(100)  # Try to read as text
+                content = file.read()
             except UnicodeDecodeError:
                 logging.error('PWL Parser: PWL file not in text format')
                 return False
-
-        with open(pwl_text_file) as file:
-            content = file.read()
-            return self.load_from_text(content)
+        return self.load_from_text(content)
     
     def load_from_text(self, pwl_text):
         """
@@ -628,7 +1062,13 @@ class PwlData:
             logging.error('PWL Parser: PWL text empty')
             return False
 
-        time_last = 0
+        # Each distinct time/value token is parsed once; the parsed numbers go
+        # straight into the points instead of being parsed again by PwlPoint,
+        # and points repeating a token share one interned string
+        time_values = {}
+        value_values = {}
+        points = self.points
+        from_parsed = PwlPoint._from_parsed
 
         for i, line in enumerate(lines):
             arguments = line.split()
@@ -640,24 +1080,23 @@ class PwlData:
 
             # only parse non-empty lines
             if len(arguments) != 0:
-                time_read = ltspice_si_parse(arguments[0])
+                time_arg, value_arg = arguments
+                time_entry = time_values.get(time_arg)
+                if time_entry is None:
+                    # Raises on an invalid time, leaving the points read so far
+                    time_read = ltspice_si_parse(time_arg)
+                    # detect if time argument is relative
+                    is_relative = time_arg[0] == '+'
+                    # Store original text representations (relative points keep the delta)
+                    original_time_str = time_arg.lstrip('+') if is_relative else time_arg
+                    time_entry = time_values[time_arg] = (intern(original_time_str), is_relative, time_read)
+                original_time_str, is_relative, time_read = time_entry
+                value_entry = value_values.get(value_arg)
+                if value_entry is None:
+                    value_entry = value_values[value_arg] = (intern(value_arg), _parse_value_str(value_arg))
+                value_arg, value_read = value_entry
 
-                # detect if time argument is relative
-                is_relative = arguments[0][0] == '+'
-                # Store original text representations
-                original_time_str = arguments[0].lstrip('+') if is_relative else arguments[0]
-                original_value_str = arguments[1]
-                
-                if is_relative:
-                    time_made = time_last + time_read
-                    # Store the delta value, not the absolute time
-                    point = PwlPoint(original_time_str, original_value_str, is_relative=True)
-                else:
-                    time_made = time_read
-                    point = PwlPoint(original_time_str, original_value_str, is_relative=False)
-
-                self.points.append(point)
-                time_last = time_made
+                points.append(from_parsed(original_time_str, value_arg, is_relative, time_read, value_read))
 
         # Check if we have any points before trying to get max
         if len(self.points) == 0:
@@ -666,11 +1105,11 @@ class PwlData:
 
         self._update_discrete()
         
-        # Use the timestamps property for logging (which calculates absolute times)
-        timestamps = self.timestamps
+        # Use the cached absolute time array for logging
+        timestamps = self.time_array()
         logging.info('PWL Parser: PWL data load successful')
         # Guard against empty lists during edge cases
-        total_run_time = max(timestamps) if len(timestamps) > 0 else 0.0
+        total_run_time = float(timestamps.max()) if timestamps.size > 0 else 0.0
         if not self._discrete_dirty and len(self._timestamps_discrete) > 0:
             total_smu_time = max(self._timestamps_discrete)
             discrete_count = len(self._timestamps_discrete)
@@ -696,14 +1135,27 @@ def discretize(timestamps, values, delta):
     if len(timestamps) != len(values):
         return None
 
-    values_out = []
-    timestamps_out = []
+    timestamps = np.asarray(timestamps, dtype=float)
+    values = np.asarray(values, dtype=float)
+
+    # Size the grid from the sample count rather than letting np.arange
+    # accumulate it; the rounded count can land on t_max itself, so drop that
+    # sample to keep the grid half-open. A negative delta (only non-empty for
+    # a negative t_max) counts down, as np.arange(0, t_max, delta) did.
+    t_max = float(timestamps.max())
+    count = max(math.ceil(t_max / delta), 0)
+    timestamps_out = np.arange(count, dtype=float) * delta
+    if count:
+        last = timestamps_out[-1]
+        if last >= t_max if delta > 0 else last <= t_max:
+            timestamps_out = timestamps_out[:-1]
 
-    for timestep in np.arange(0, max(timestamps), delta):
-        timestamps_out.append(timestep)
-        values_out.append(np.interp(timestep, timestamps, values))
+    # One interpolation over the whole grid instead of one call per sample.
+    # np.interp starts each lookup from the previous hit, so on this
+    # monotone grid it already sweeps the source points linearly
+    values_out = np.interp(timestamps_out, timestamps, values)
 
-    return timestamps_out, values_out
+    return timestamps_out.tolist(), values_out.tolist()
 
 def PWL_parser(pwl_text_file, timestep):
     """
@@ -6,17 +6,31 @@ License: GPL-3.0-or-later
 """
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
+import locale
 import os
-from tkinter import messagebox
+import shutil
+import tempfile
 
 from pwl_parser import PwlData
 
+# Fixed status bar messages
+_STATUS_NEW_FILE = "New file created"
+_STATUS_STILL_LOADING = "Still loading the previous file..."
+
+# os.umask can only be read by setting it, which changes it process-wide.
+# Read it once here, at import, before the editor starts worker threads.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 class DocumentService:
     def __init__(self, editor: Any, pwl_data_factory: Callable[[], Any] | None = None):
         self.editor = editor
         self._pwl_data_factory: Callable[[], Any] = pwl_data_factory or PwlData
+        self._load_executor = None  # Single worker thread for file loads (created lazily)
+        self._load_future = None    # Pending load; blocks New/Open until it lands
 
     # --- Helper callbacks ---
     @property
@@ -27,9 +41,45 @@ class DocumentService:
     def text_controller(self):
         return self.editor.text_controller
 
+    @staticmethod
+    def _write_text(path: str, text_content: str) -> None:
+        """Write text the way open(path, 'w') would, as one pre-encoded block.
+
+        Encoding and newline translation happen once up front. The bytes go
+        to a temporary file next to the target, which then replaces it in one
+        rename, so an interrupted save never leaves a truncated file behind.
+        """
+        if os.linesep != '\n':
+            text_content = text_content.replace('\n', os.linesep)
+        data = text_content.encode(locale.getpreferredencoding(False))
+
+        # Replace the file a symlink points to, not the link itself
+        target = os.path.realpath(path)
+        directory, name = os.path.split(target)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            # Keep the permissions of the file being replaced; new files get
+            # the usual umask-based mode instead of mkstemp's private one
+            try:
+                shutil.copymode(target, temp_path)
+            except FileNotFoundError:
+                os.chmod(temp_path, 0o666 & ~_UMASK)
+            os.replace(temp_path, target)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
     def _set_status(self, msg: str):
         try:
-            self.editor.status_var.set(msg)
+            status_var = self.editor.status_var
+            # Setting an equal value still makes Tk redisplay the status label
+            if status_var.get() != msg:
+                status_var.set(msg)
         except Exception:
             pass
 
@@ -56,6 +106,9 @@ class DocumentService:
 
     # --- Public operations ---
     def new_file(self):
+        if self._load_future is not None:
+            self._set_status(_STATUS_STILL_LOADING)
+            return
         if self.editor.check_unsaved_changes():
             self.editor.pwl_data.clear()
             self.editor.current_file = None
@@ -63,11 +116,16 @@ class DocumentService:
             self._update_views_no_undo()
             self.editor.unsaved_changes = False
             self._update_title()
-            self._set_status("New file created")
+            self._set_status(_STATUS_NEW_FILE)
 
             self._establish_baseline("New file")
 
     def open_file(self):
+        from tkinter import messagebox  # Deferred so headless imports of this module skip Tk
+
+        if self._load_future is not None:
+            self._set_status(_STATUS_STILL_LOADING)
+            return
         if not self.editor.check_unsaved_changes():
             return
 
@@ -75,34 +133,95 @@ class DocumentService:
         if not file_path:
             return
 
+        # dirname and basename in one pass
+        directory, file_name = os.path.split(file_path)
         try:
             # Mirror internal last_directory for backward compatibility
-            self.editor.last_directory = os.path.dirname(file_path)
+            self.editor.last_directory = directory
 
+            if self._load_executor is None:
+                self._load_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='pwl-load')
+
+            # Parse off the Tk thread; the result is polled back on the main loop.
+            # The editor stays usable meanwhile, so remember what it held.
+            content_state = self._content_state()
             new_pwl_data = self._pwl_data_factory()
-            if new_pwl_data.load_from_file(file_path, 0.001):  # Default 1ms timestep
+            future = self._load_executor.submit(new_pwl_data.load_from_file, file_path, 0.001)  # Default 1ms timestep
+            self._load_future = future
+            self._set_status(f"Loading: {file_name}...")
+            self.editor.root.after(20, self._poll_load, future, new_pwl_data, file_path, file_name,
+                                   content_state)
+        except Exception as e:
+            self._load_future = None
+            messagebox.showerror("Error", f"Failed to open file: {e}")
+
+    def _content_state(self):
+        """The editor's data and text generation, to detect edits made during a load"""
+        pwl_data = self.editor.pwl_data
+        return pwl_data, pwl_data.snapshot(), self.editor._text_generation
+
+    def _edited_since(self, content_state) -> bool:
+        pwl_data, snapshot, text_generation = content_state
+        editor = self.editor
+        return (editor.pwl_data is not pwl_data
+                or editor._text_generation != text_generation
+                or editor.pwl_data.snapshot() != snapshot)
+
+    def _poll_load(self, future, new_pwl_data, file_path: str, file_name: str, content_state):
+        """Install a finished background load as the current document"""
+        from tkinter import messagebox
+
+        if not future.done():
+            self.editor.root.after(20, self._poll_load, future, new_pwl_data, file_path, file_name,
+                                   content_state)
+            return
+        if future is not self._load_future:
+            return
+        self._load_future = None
+        if future.cancelled():
+            return
+
+        try:
+            if future.result():
+                # Edits made while loading would be replaced: ask again
+                if self._edited_since(content_state) and not self.editor.check_unsaved_changes():
+                    self._set_status(f"Open cancelled: {file_name}")
+                    return
                 self.editor.pwl_data = new_pwl_data
                 self.editor.current_file = file_path
 
                 self._update_views_no_undo()
                 self.editor.unsaved_changes = False
                 self._update_title()
-                self._set_status(f"Loaded: {os.path.basename(file_path)}")
+                self._set_status(f"Loaded: {file_name}")
 
                 # Clear undo history AFTER loading file and establish new baseline
-                self._establish_baseline(f"Opened: {os.path.basename(file_path)}")
+                self._establish_baseline(f"Opened: {file_name}")
             else:
+                self._set_status("")
                 messagebox.showerror("Error", "Failed to load PWL file")
         except Exception as e:
+            self._set_status("")
             messagebox.showerror("Error", f"Failed to open file: {e}")
 
+    def shutdown(self):
+        """Abandon any pending load; called when the editor closes"""
+        self._load_future = None
+        if self._load_executor is not None:
+            self._load_executor.shutdown(wait=False, cancel_futures=True)
+
     def save_file(self):
-        if self.editor.current_file:
+        from tkinter import messagebox
+
+        file_path = self.editor.current_file
+        if file_path:
+            file_name = os.path.basename(file_path)
             # Ask for confirmation when overwriting existing file
-            if os.path.exists(self.editor.current_file):
+            if os.path.exists(file_path):
                 result = messagebox.askyesno(
                     "Confirm Save",
-                    f"Overwrite existing file?\n\n{os.path.basename(self.editor.current_file)}",
+                    f"Overwrite existing file?\n\n{file_name}",
                     icon='question'
                 )
                 if not result:
@@ -111,12 +230,11 @@ class DocumentService:
             try:
                 text_content = self.editor._get_formatted_content_for_save(apply_export_format=False)
                 if text_content:
-                    with open(self.editor.current_file, 'w') as f:
-                        f.write(text_content)
+                    self._write_text(file_path, text_content)
 
                     self.editor.unsaved_changes = False
                     self._update_title()
-                    self._set_status(f"Saved: {os.path.basename(self.editor.current_file)}")
+                    self._set_status(f"Saved: {file_name}")
                 else:
                     messagebox.showwarning("Save Warning", "No content to save")
             except Exception as e:
@@ -125,28 +243,32 @@ class DocumentService:
             self.save_file_as()
 
     def save_file_as(self):
+        from tkinter import messagebox
+
         file_path = self.file_service.ask_save_as(initial_dir=self.editor.get_initial_dir(), defaultextension=".pwl")
         if not file_path:
             return
+        directory, file_name = os.path.split(file_path)
         try:
             # Mirror internal last_directory for backward compatibility
-            self.editor.last_directory = os.path.dirname(file_path)
+            self.editor.last_directory = directory
 
             text_content = self.editor._get_formatted_content_for_save(apply_export_format=False)
             if text_content:
-                with open(file_path, 'w') as f:
-                    f.write(text_content)
+                self._write_text(file_path, text_content)
 
                 self.editor.current_file = file_path
                 self.editor.unsaved_changes = False
                 self._update_title()
-                self._set_status(f"Saved: {os.path.basename(file_path)}")
+                self._set_status(f"Saved: {file_name}")
             else:
                 messagebox.showwarning("Save Warning", "No content to save")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save file: {e}")
 
     def export_file(self):
+        from tkinter import messagebox
+
         file_path = self.file_service.ask_save_as(
             initial_dir=self.editor.get_initial_dir(),
             defaultextension=".pwl",
@@ -155,19 +277,19 @@ class DocumentService:
             return
 
         previous_unsaved = getattr(self.editor, 'unsaved_changes', False)
+        directory, file_name = os.path.split(file_path)
         try:
             # Mirror internal last_directory for backward compatibility
-            self.editor.last_directory = os.path.dirname(file_path)
+            self.editor.last_directory = directory
 
             text_content = self.editor._get_formatted_content_for_save(apply_export_format=True)
             if not text_content:
                 messagebox.showwarning("Export Warning", "No content to export")
                 return
 
-            with open(file_path, 'w') as f:
-                f.write(text_content)
+            self._write_text(file_path, text_content)
 
-            self._set_status(f"Exported: {os.path.basename(file_path)}")
+            self._set_status(f"Exported: {file_name}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export file: {e}")
         finally:
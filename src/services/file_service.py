@@ -9,15 +9,22 @@ from __future__ import annotations
 
 import os
 import sys
-from tkinter import filedialog
 from typing import Optional, Tuple
 
 
 class FileService:
     def __init__(self):
         self.last_directory: Optional[str] = None
+        # Resolved on first use; the install location does not move at runtime
+        self._examples_dir: Optional[str] = None
 
     def get_examples_dir(self) -> str:
+        if self._examples_dir is None:
+            self._examples_dir = self._find_examples_dir()
+        return self._examples_dir
+
+    @staticmethod
+    def _find_examples_dir() -> str:
         if getattr(sys, 'frozen', False):
             script_dir = os.path.dirname(sys.executable)
         else:
@@ -31,6 +38,8 @@ class FileService:
         return self.last_directory if self.last_directory else self.get_examples_dir()
 
     def ask_open(self, initial_dir: Optional[str] = None, filetypes: Optional[Tuple[Tuple[str, str], ...]] = None) -> Optional[str]:
+        from tkinter import filedialog  # Deferred so headless imports of this module skip Tk
+
         path = filedialog.askopenfilename(
             title="Open PWL File",
             initialdir=initial_dir or self.get_initial_dir(),
@@ -43,6 +52,8 @@ class FileService:
 
     def ask_save_as(self, initial_dir: Optional[str] = None, defaultextension: str = ".pwl",
                      filetypes: Optional[Tuple[Tuple[str, str], ...]] = None) -> Optional[str]:
+        from tkinter import filedialog
+
         path = filedialog.asksaveasfilename(
             title="Save PWL File",
             initialdir=initial_dir or self.get_initial_dir(),
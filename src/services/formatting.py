@@ -9,7 +9,10 @@ from __future__ import annotations
 
 import math
 import re
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
 
 # Unified SI prefix map (include femto for GUI conversions)
 SI_PREFIXES = {
@@ -27,9 +30,33 @@ SI_PREFIXES = {
 # Scientific notation thresholds (inclusive ranges outside which we use engineering)
 SCI_THRESHOLDS: Tuple[float, float] = (1e-4, 1e4)
 EPSILON = 1e-10
+# Distinct values remembered by the scalar formatters; PWL data repeats the
+# same levels and grid times a lot
+FORMAT_CACHE_SIZE = 8192
+
+# Reference string patterns: SI mantissa with prefix ("5n", "+1.5us"),
+# mantissa/exponent ("2.5e-3"), and anything that is not an ASCII digit
+_SI_RE = re.compile(r'^(?:\+)?(\d+(?:\.\d+)?)\s*([fpnumkMG])(?:s)?$')
+_SCI_RE = re.compile(r'^(?:\+)?(\d+(?:\.\d+)?)\s*e\s*([+-]?\d+)$', re.IGNORECASE)
+_NON_DIGIT_RE = re.compile(r'[^0-9]')
+
+
+# Powers of ten for the exponents formatting meets in practice, equal to what
+# 10 ** e yields (an exactly converted int for e >= 0, a float power below)
+_POW10_MIN = -24
+_POW10 = tuple(float(10 ** e) if e >= 0 else 10 ** e for e in range(_POW10_MIN, 25))
+
+
+def _pow10(exponent: int) -> float:
+    index = exponent - _POW10_MIN
+    if 0 <= index < len(_POW10):
+        return _POW10[index]
+    return 10 ** exponent
 
 
 def strip_trailing_zeros(s: str) -> str:
+    # Two C-level rstrip calls measure faster than scanning for the cut
+    # index in Python, even though the first allocates an intermediate
     if '.' in s:
         s = s.rstrip('0').rstrip('.')
     return s
@@ -49,49 +76,78 @@ def _format_significant(value: float, digits: int = 12) -> str:
     return formatted
 
 
-def _format_scientific(value: float, digits: int = 12) -> str:
-    if value == 0:
-        return '0'
+def _scientific_formatter(digits: int):
+    """Build a scientific formatter with the precision-derived constants bound."""
+    round_digits = digits - 1
+    abs_tol = _pow10(-(digits + 1))
+    mantissa_spec = f".{digits - 1}g"
 
-    sign = -1 if value < 0 else 1
-    abs_val = abs(value)
+    def fmt(value: float) -> str:
+        if value == 0:
+            return '0'
+
+        sign = -1 if value < 0 else 1
+        abs_val = abs(value)
+
+        exp_int = int(math.floor(math.log10(abs_val)))
+        mantissa = abs_val / _pow10(exp_int)
 
-    exp_int = int(math.floor(math.log10(abs_val)))
-    mantissa = abs_val / (10 ** exp_int)
+        # Round mantissa to requested precision while limiting floating error drift.
+        mantissa = round(mantissa, round_digits)
 
-    # Round mantissa to requested precision while limiting floating error drift.
-    mantissa = round(mantissa, digits - 1)
+        # If rounding pushed mantissa over 10, normalise again.
+        if mantissa >= 10:
+            mantissa /= 10
+            exp_int += 1
 
-    # If rounding pushed mantissa over 10, normalise again.
-    if mantissa >= 10:
-        mantissa /= 10
-        exp_int += 1
+        # Snap mantissas that are extremely close to integers (e.g. 0.9999999999 → 1).
+        nearest_int = round(mantissa)
+        if math.isclose(mantissa, nearest_int, rel_tol=0.0, abs_tol=abs_tol):
+            mantissa = float(nearest_int)
 
-    # Snap mantissas that are extremely close to integers (e.g. 0.9999999999 → 1).
-    nearest_int = round(mantissa)
-    if math.isclose(mantissa, nearest_int, rel_tol=0.0, abs_tol=10 ** -(digits + 1)):
-        mantissa = float(nearest_int)
+        mantissa_str = format(mantissa, mantissa_spec)
+        mantissa_str = strip_trailing_zeros(mantissa_str)
 
-    mantissa_str = f"{mantissa:.{digits - 1}g}"
-    mantissa_str = strip_trailing_zeros(mantissa_str)
+        if mantissa_str in {'10', '+10'}:
+            mantissa_str = '1'
+            exp_int += 1
 
-    if mantissa_str in {'10', '+10'}:
-        mantissa_str = '1'
-        exp_int += 1
+        if mantissa_str in {'-10'}:
+            mantissa_str = '-1'
+            exp_int += 1
 
-    if mantissa_str in {'-10'}:
-        mantissa_str = '-1'
-        exp_int += 1
+        if mantissa_str in {'', '0', '-0'}:
+            mantissa_str = '0'
 
-    if mantissa_str in {'', '0', '-0'}:
-        mantissa_str = '0'
+        if sign < 0 and mantissa_str not in {'0'} and mantissa_str[0] != '-':
+            mantissa_str = '-' + mantissa_str
 
-    if sign < 0 and mantissa_str not in {'0'} and mantissa_str[0] != '-':
-        mantissa_str = '-' + mantissa_str
+        return f"{mantissa_str}e{exp_int:+d}"
+    return fmt
 
-    return f"{mantissa_str}e{exp_int:+d}"
+
+# Every caller uses the default precision
+_format_scientific_12 = _scientific_formatter(12)
+
+
+def _format_scientific(value: float, digits: int = 12) -> str:
+    if digits == 12:
+        return _format_scientific_12(value)
+    return _scientific_formatter(digits)(value)
 
 
+def _format_engineering_form(value: float, exponent: int) -> str:
+    """Engineering form of a non-zero *value* whose decimal exponent is *exponent*."""
+    stepped_exp = (exponent // 3) * 3
+    mantissa = value / _pow10(stepped_exp)
+    if abs(mantissa - round(mantissa)) < EPSILON:
+        mantissa_str = str(int(round(mantissa)))
+    else:
+        mantissa_str = f"{mantissa:g}"
+    return mantissa_str if stepped_exp == 0 else f"{mantissa_str}e{stepped_exp}"
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE, typed=True)
 def format_engineering(value: float, thresholds: Tuple[float, float] = SCI_THRESHOLDS, force: bool = False) -> str:
     """Engineering-style scientific notation with exponent steps of 3.
     - When force=True, always return engineering form (except exact zero → '0').
@@ -102,28 +158,68 @@ def format_engineering(value: float, thresholds: Tuple[float, float] = SCI_THRES
     lo, hi = thresholds
     abs_val = abs(value)
     if force or abs_val >= hi or abs_val < lo:
-        exponent = math.floor(math.log10(abs_val))
-        stepped_exp = (exponent // 3) * 3
-        mantissa = value / (10 ** stepped_exp)
-        if abs(mantissa - round(mantissa)) < EPSILON:
-            mantissa_str = str(int(round(mantissa)))
-        else:
-            mantissa_str = f"{mantissa:g}"
-        return mantissa_str if stepped_exp == 0 else f"{mantissa_str}e{stepped_exp}"
+        return _format_engineering_form(value, math.floor(math.log10(abs_val)))
     # Regular formatting within thresholds
     return strip_trailing_zeros(f"{value:.9g}")
 
 
+def _unique_floats(values: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct values of *values* plus the indices that rebuild the input from them."""
+    data = np.asarray(values, dtype=float).ravel()
+    return np.unique(data, return_inverse=True)
+
+
+def format_engineering_array(values: Sequence[float], thresholds: Tuple[float, float] = SCI_THRESHOLDS, force: bool = False) -> List[str]:
+    """Vectorized format_engineering; returns the same strings for every element.
+
+    Threshold tests and decade exponents are computed with NumPy; only the
+    final string assembly runs, once per distinct value.
+    """
+    data, inverse = _unique_floats(values)
+    lo, hi = thresholds
+    abs_vals = np.abs(data)
+    if force:
+        engineering = np.ones(data.shape, dtype=bool)
+    else:
+        engineering = (abs_vals >= hi) | (abs_vals < lo)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logs = np.log10(abs_vals)
+        # np.log10 may differ from math.log10 in the last ulp; recompute values
+        # sitting on a decade boundary so the exponent matches the scalar path.
+        boundary = engineering & (abs_vals != 0) & (np.abs(logs - np.round(logs)) < 1e-9)
+    exponents = np.floor(logs)
+    for index in np.flatnonzero(boundary).tolist():
+        exponents[index] = math.floor(math.log10(abs_vals[index]))
+
+    result = []
+    for value, exponent, use_engineering in zip(data.tolist(), exponents.tolist(), engineering.tolist()):
+        if value == 0:
+            result.append('0')
+        elif use_engineering:
+            result.append(_format_engineering_form(value, int(exponent)))
+        else:
+            result.append(strip_trailing_zeros(f"{value:.9g}"))
+    return [result[i] for i in inverse.tolist()]
+
+
+# SI prefixes in ascending order; index of the unprefixed entry
+_SI_PREFIX_ITEMS = tuple(SI_PREFIXES.items())
+_SI_BASE_INDEX = tuple(SI_PREFIXES).index('')
+
+
 def _best_si_for(value: float) -> Tuple[str, float]:
     """Pick an SI prefix yielding a human-friendly mantissa (prefer 1..999)."""
-    if value == 0:
+    if value == 0 or not math.isfinite(value):
         return '', 1.0
 
     def converted_mag(prefix_mult: float) -> float:
         return abs(value / prefix_mult)
 
+    # The decimal exponent names the prefix directly; log10 rounding can put
+    # values at a prefix boundary one step off, so score the neighbours too
+    guess = math.floor(math.log10(abs(value))) // 3 + _SI_BASE_INDEX
     best = None
-    for prefix, mult in SI_PREFIXES.items():
+    for prefix, mult in _SI_PREFIX_ITEMS[max(guess - 1, 0):max(guess + 2, 0)]:
         conv = converted_mag(mult)
         if 1 <= conv < 1000:
             score = abs(conv - 1)  # closer to 1 is nicer (e.g., 1n vs 999p)
@@ -132,6 +228,7 @@ def _best_si_for(value: float) -> Tuple[str, float]:
     if best is not None:
         return best[1], best[2]
 
+    # Outside the prefix range: accept a looser mantissa at either end
     best = None
     for prefix, mult in SI_PREFIXES.items():
         conv = converted_mag(mult)
@@ -146,29 +243,90 @@ def _best_si_for(value: float) -> Tuple[str, float]:
     return '', 1.0
 
 
+def _format_si_converted(converted: float, prefix: str) -> str:
+    nearest = round(converted)
+    if math.isclose(converted, nearest, rel_tol=0.0, abs_tol=1e-6):
+        return f"{int(nearest)}{prefix}"
+    return f"{_format_significant(converted, digits=12)}{prefix}"
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE, typed=True)
 def format_si(value: float, target_prefix: Optional[str] = None) -> str:
     if value == 0:
         return '0'
 
-    def _format_with_prefix(converted: float, prefix: str) -> str:
-        nearest = round(converted)
-        if math.isclose(converted, nearest, rel_tol=0.0, abs_tol=1e-6):
-            return f"{int(nearest)}{prefix}"
-        return f"{_format_significant(converted, digits=12)}{prefix}"
-
     if target_prefix is not None and target_prefix in SI_PREFIXES:
         converted = value / SI_PREFIXES[target_prefix]
-        return _format_with_prefix(converted, target_prefix)
+        return _format_si_converted(converted, target_prefix)
+
+    # Whole numbers 1..999 (levels like 1, 5, 100) need no prefix at all
+    if 1 <= abs(value) < 1000 and value == int(value):
+        return str(int(value))
 
     prefix, mult = _best_si_for(value)
     converted = value / mult
-    return _format_with_prefix(converted, prefix)
+    return _format_si_converted(converted, prefix)
+
+
+_SI_PREFIX_NAMES = tuple(SI_PREFIXES)
+_SI_PREFIX_MULTS = np.array(tuple(SI_PREFIXES.values()))
 
 
+def format_si_array(values: Sequence[float]) -> List[str]:
+    """Vectorized format_si; returns the same strings for every element.
+
+    The prefix choice of _best_si_for is evaluated for all values and all
+    prefixes at once; only the final string assembly runs, once per
+    distinct value.
+    """
+    data, inverse = _unique_floats(values)
+    magnitudes = np.abs(data[:, None] / _SI_PREFIX_MULTS)
+    preferred = (magnitudes >= 1) & (magnitudes < 1000)
+    acceptable = (magnitudes >= 0.1) & (magnitudes <= 9999)
+    candidates = np.where(preferred.any(axis=1)[:, None], preferred, acceptable)
+    scores = np.where(candidates, np.abs(magnitudes - 1), np.inf)
+    # argmin keeps the first of equal scores, like the scalar strict '<' scan
+    choice = np.where(candidates.any(axis=1), scores.argmin(axis=1), _SI_PREFIX_NAMES.index(''))
+
+    result = []
+    for value, index in zip(data.tolist(), choice.tolist()):
+        if value == 0:
+            result.append('0')
+            continue
+        prefix = _SI_PREFIX_NAMES[index]
+        result.append(_format_si_converted(value / SI_PREFIXES[prefix], prefix))
+    return [result[i] for i in inverse.tolist()]
+
+
+def _format_si_prefixed_array(values: Sequence[float], prefix: str) -> List[str]:
+    """Vectorized format_si(value, target_prefix=prefix) for a prefix in SI_PREFIXES.
+
+    Scaling and the integral-mantissa test run in NumPy; strings are built
+    once per distinct value.
+    """
+    data, inverse = _unique_floats(values)
+    converted = data / SI_PREFIXES[prefix]
+    nearest = np.round(converted)
+    # Same test as math.isclose(converted, nearest, rel_tol=0.0, abs_tol=1e-6)
+    with np.errstate(invalid='ignore'):
+        integral = (converted == nearest) | (np.abs(converted - nearest) <= 1e-6)
+
+    result = []
+    for value, scaled, rounded, is_integral in zip(data.tolist(), converted.tolist(), nearest.tolist(), integral.tolist()):
+        if value == 0:
+            result.append('0')
+        elif is_integral:
+            result.append(f"{int(rounded)}{prefix}")
+        else:
+            result.append(f"{_format_significant(scaled, digits=12)}{prefix}")
+    return [result[i] for i in inverse.tolist()]
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
 def is_awkward_format(s: str) -> bool:
     s = s.strip()
     # Very large SI mantissas like 500010n (prefer switching prefix)
-    si_match = re.search(r'^(?:\+)?(\d+(?:\.\d+)?)\s*([fpnumkMG])(?:s)?$', s)
+    si_match = _SI_RE.search(s)
     if si_match:
         try:
             magnitude = float(si_match.group(1))
@@ -177,8 +335,8 @@ def is_awkward_format(s: str) -> bool:
         except ValueError:
             pass
     # Very long non-scientific decimals: count only digits; ignore 'e' formats
-    if '.' in s and 'e' not in s.lower():
-        digit_count = len(re.sub(r'[^0-9]', '', s))
+    if '.' in s and 'e' not in s and 'E' not in s:
+        digit_count = len(_NON_DIGIT_RE.sub('', s))
         if digit_count > 8:
             return True
     return False
@@ -189,12 +347,15 @@ def suggest_better_si(value: float) -> str:
     return format_si(value)
 
 
+@lru_cache(maxsize=FORMAT_CACHE_SIZE, typed=True)
 def suggest_optimal(value: float) -> str:
     """Suggest a user-friendly format for any positive value, mimicking existing behavior."""
     if value < 0:
         return '-' + suggest_optimal(-value)
     if value == 0:
         return '0'
+    if 1 <= value < 1000 and value == int(value):
+        return str(int(value))
     if value < 1e-9:
         return strip_trailing_zeros(f"{value/1e-12:.9g}") + 'p'
     elif value < 1e-6:
@@ -209,6 +370,7 @@ def suggest_optimal(value: float) -> str:
         return strip_trailing_zeros(f"{value/1e3:.9g}") + 'k'
 
 
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
 def parse_reference_style(reference: str) -> Tuple[str, Optional[str]]:
     """Parse reference string to detect style: ('si', prefix) | ('sci', expstr) | ('decimal', None) | ('zero', None)."""
     ref = reference.strip()
@@ -216,7 +378,7 @@ def parse_reference_style(reference: str) -> Tuple[str, Optional[str]]:
         return 'decimal', None
     if ref == '0':
         return 'zero', None
-    si_match = re.search(r'^(?:\+)?(\d+(?:\.\d+)?)\s*([fpnumkMG])(?:s)?$', ref)
+    si_match = _SI_RE.search(ref)
     if si_match:
         magnitude = si_match.group(1)
         try:
@@ -225,7 +387,7 @@ def parse_reference_style(reference: str) -> Tuple[str, Optional[str]]:
         except ValueError:
             pass
         return 'si', si_match.group(2)
-    sci_match = re.search(r'^(?:\+)?(\d+(?:\.\d+)?)\s*e\s*([+-]?\d+)$', ref, re.IGNORECASE)
+    sci_match = _SCI_RE.search(ref)
     if sci_match:
         try:
             if float(ref) == 0.0:
@@ -241,22 +403,59 @@ def parse_reference_style(reference: str) -> Tuple[str, Optional[str]]:
     return 'decimal', None
 
 
-def format_like_reference(value: float, reference: str) -> str:
+def _format_like_reference(value: float, reference: str) -> str:
     style, aux = parse_reference_style(reference)
     if style == 'si' and aux:
         return format_si(value, target_prefix=aux)
     if style == 'sci':
-        return _format_scientific(value)
+        return _format_scientific_12(value)
     if style == 'zero':
         # No style to inherit; suggest something sensible
         return suggest_optimal(value)
-    # Default: decimal with readability; if awkward, fallback
+    # Default: decimal with readability; if awkward, fallback.
+    # Non-zero whole numbers below 1e6 print in full under :g and are never
+    # awkward, so they skip the formatting and the awkwardness scan
+    if -1e6 < value < 1e6 and value and value == int(value):
+        return str(int(value))
     s = f"{value:g}"
     if is_awkward_format(s):
         return suggest_better_si(value)
     return s
 
 
+_format_like_reference_cached = lru_cache(maxsize=FORMAT_CACHE_SIZE, typed=True)(_format_like_reference)
+
+
+def format_like_reference(value: float, reference: str) -> str:
+    # 0.0 and -0.0 are one cache key, but a decimal reference formats -0.0
+    # as '-0', so zeros bypass the cache
+    if value == 0:
+        return _format_like_reference(value, reference)
+    return _format_like_reference_cached(value, reference)
+
+
+def format_like_reference_array(values: Sequence[float], references: Sequence[str]) -> List[str]:
+    """format_like_reference for paired values and reference strings.
+
+    Values whose reference uses an SI prefix (the common case for PWL
+    times) are formatted in one vectorized pass per prefix; other styles
+    use the scalar path.
+    """
+    data = np.asarray(values, dtype=float)
+    result: List[Optional[str]] = [None] * len(data)
+    by_prefix: dict = {}
+    for index, reference in enumerate(references):
+        style, aux = parse_reference_style(reference)
+        if style == 'si' and aux in SI_PREFIXES:
+            by_prefix.setdefault(aux, []).append(index)
+        else:
+            result[index] = format_like_reference(float(data[index]), reference)
+    for prefix, indices in by_prefix.items():
+        for index, text in zip(indices, _format_si_prefixed_array(data[indices], prefix)):
+            result[index] = text
+    return result
+
+
 __all__ = [
     'SI_PREFIXES', 'SCI_THRESHOLDS', 'EPSILON',
     'strip_trailing_zeros', 'format_engineering', 'format_si', 'is_awkward_format',
@@ -268,16 +467,30 @@ class FormatService:
     """App-facing formatting service built on top of the utilities in this module."""
     def format_time(self, time_value: float, reference_point: object | None = None) -> str:
         """Format a time value, optionally mirroring a reference point's time_str style."""
-        if reference_point and hasattr(reference_point, 'time_str'):
-            return format_like_reference(time_value, getattr(reference_point, 'time_str'))
+        reference = getattr(reference_point, 'time_str', None) if reference_point else None
+        if reference is not None:
+            return format_like_reference(time_value, reference)
         return suggest_optimal(time_value)
 
     def format_value(self, value: float, reference_point: object | None = None) -> str:
         """Format a value (unit-agnostic), optionally mirroring a reference point's value_str style."""
-        if reference_point and hasattr(reference_point, 'value_str'):
-            return format_like_reference(value, getattr(reference_point, 'value_str'))
+        reference = getattr(reference_point, 'value_str', None) if reference_point else None
+        if reference is not None:
+            return format_like_reference(value, reference)
         return suggest_optimal(value)
 
+    def format_point(self, time_value: float, value: float,
+                     reference_point: object | None = None) -> Tuple[str, str]:
+        """format_time and format_value for one point, sharing the reference lookup."""
+        if reference_point:
+            time_ref = getattr(reference_point, 'time_str', None)
+            value_ref = getattr(reference_point, 'value_str', None)
+        else:
+            time_ref = value_ref = None
+        time_str = format_like_reference(time_value, time_ref) if time_ref is not None else suggest_optimal(time_value)
+        value_str = format_like_reference(value, value_ref) if value_ref is not None else suggest_optimal(value)
+        return time_str, value_str
+
     # Convenience wrappers used elsewhere in the app
     def format_si(self, value: float) -> str:
         return format_si(value)
@@ -285,3 +498,13 @@ class FormatService:
     def format_engineering(self, value: float) -> str:
         return format_engineering(value)
 
+    def format_si_array(self, values: Sequence[float]) -> List[str]:
+        return format_si_array(values)
+
+    def format_engineering_array(self, values: Sequence[float]) -> List[str]:
+        return format_engineering_array(values)
+
+    def format_time_array(self, time_values: Sequence[float], reference_time_strs: Sequence[str]) -> List[str]:
+        """format_time for each value, mirroring the paired reference time string."""
+        return format_like_reference_array(time_values, reference_time_strs)
+
@@ -6,12 +6,78 @@ License: GPL-3.0-or-later
 """
 from __future__ import annotations
 
+import math
 import re
+from collections import Counter
+from functools import lru_cache
 from typing import Optional, List
 
+import numpy as np
+
 from pwl_parser import PwlPoint
 from . import formatting as fmt
 
+# Reference string patterns: SI mantissa with a time prefix ("5n", "20us"),
+# the same with any SI prefix, and mantissa/exponent ("2.5e-3")
+_SI_RE = re.compile(r'(\d+(?:\.\d+)?)\s*([numkMG])(?:s)?$')
+_SI_ANY_PREFIX_RE = re.compile(r'(?:\d+(?:\.\d+)?)\s*([fpnumkMG])(?:s)?$')
+_SCI_RE = re.compile(r'(\d+(?:\.\d+)?)\s*e\s*([+-]?\d+)')
+# Last character of any string _SI_RE can match; plain numbers fail this
+# check without entering the regex engine
+_SI_TAIL_CHARS = frozenset('numkMGs')
+
+# Clean insertion candidates: nice multipliers (whole, then fractional) of the
+# powers of ten around the target
+_CLEAN_EXP_OFFSETS = (-1, 0, 1)
+_CLEAN_MULTIPLIERS = (1, 2, 5, 10, 20, 25, 50, 100, 0.1, 0.2, 0.5)
+
+
+@lru_cache(maxsize=1024)
+def _notation_step(time_str: str) -> Optional[float]:
+	"""Step size implied by an SI-prefixed or scientific time string.
+    
+	Returns None for plain numbers, whose step depends on the value instead.
+	"""
+	stripped = time_str.strip()
+	# Check for SI prefix notation
+	si_match = _SI_RE.search(stripped) if stripped[-1:] in _SI_TAIL_CHARS else None
+	if si_match:
+		magnitude_str, prefix = si_match.groups()
+		magnitude = float(magnitude_str)
+		prefix_value = fmt.SI_PREFIXES[prefix]
+            
+		# Use consistent stepping within the same prefix
+		if magnitude < 10:
+			# Small numbers: step by 1 unit (1n → 2n → 3n)
+			step_magnitude = 1
+		elif magnitude < 100:
+			# Medium numbers: step by 10 units (20n → 30n → 40n)  
+			step_magnitude = 10
+		else:
+			# Large numbers: step by 50 or 100 units
+			step_magnitude = 50 if magnitude < 500 else 100
+            
+		return step_magnitude * prefix_value
+        
+	# Check for scientific notation
+	sci_match = _SCI_RE.search(stripped) if 'e' in stripped else None
+	if sci_match:
+		mantissa_str, exp_str = sci_match.groups()
+		mantissa = float(mantissa_str)
+		exp = int(exp_str)
+            
+		# Use consistent stepping within same scientific magnitude
+		if mantissa < 2:
+			step_mantissa = 1  # 1e-3 → 2e-3 → 3e-3
+		elif mantissa < 10:
+			step_mantissa = 1  # 5e-3 → 6e-3 → 7e-3
+		else:
+			step_mantissa = 10  # 10e-3 → 20e-3 → 30e-3
+            
+		return step_mantissa * (10 ** exp)
+
+	return None
+
 
 class SmartInsertion:
 	"""
@@ -46,30 +112,28 @@ class SmartInsertion:
 		# Determine consistent step size based on notation and context
 		step_size = self._determine_consistent_step_size(current_time_str, current_time_val)
         
+		next_time_val = next_point.get_time_value() if next_point is not None else None
+        
 		# Consider gap to next point if it exists
-		if next_point:
-			next_time_val = next_point.get_time_value()
-			if next_time_val is not None:
-				gap = next_time_val - current_time_val
-                
-				# If our step would exceed the gap, use a fraction of the gap
-				if step_size >= gap * 0.9:  # Leave some margin
-					step_size = gap * 0.5
+		if next_time_val is not None:
+			gap = next_time_val - current_time_val
+            
+			# If our step would exceed the gap, use a fraction of the gap
+			if step_size >= gap * 0.9:  # Leave some margin
+				step_size = gap * 0.5
         
 		new_time_val = current_time_val + step_size
 
 		# Try insertion-local rounding if we have a next bound to stay strictly between
-		if next_point is not None:
-			nxt_val = next_point.get_time_value()
-			if nxt_val is not None:
-				rounded = self._maybe_round_insert(
-					new_time_val,
-					lower_bound=min(current_time_val, nxt_val),
-					upper_bound=max(current_time_val, nxt_val),
-					reference_str=current_time_str,
-				)
-				if rounded is not None:
-					return rounded
+		if next_time_val is not None:
+			rounded = self._maybe_round_insert(
+				new_time_val,
+				lo=min(current_time_val, next_time_val),
+				hi=max(current_time_val, next_time_val),
+				reference_str=current_time_str,
+			)
+			if rounded is not None:
+				return rounded
 
 		# Format with optimization for user-friendliness
 		result = self._format_time_like_reference(new_time_val, current_time_str)
@@ -108,52 +172,42 @@ class SmartInsertion:
 				new_time_val = max(0, current_time_val - step_size * 0.1)  # Small step back
 				return self._format_time_like_reference(new_time_val, current_time_str)
             
+			# Insert at the midpoint. Insertion-local rounding comes first for
+			# any gap size: a simple rounded value within bounds beats both
+			# formatting strategies below
+			new_time_val = prev_time_val + (gap * 0.5)
+			snapped = self._maybe_round_insert(
+				new_time_val,
+				lo=prev_time_val,  # gap > 0 here, so already ordered
+				hi=current_time_val,
+				reference_str=current_time_str,
+			)
+			if snapped is not None:
+				return snapped
+            
 			# Determine what a "normal" step would be for each point
 			prev_step = self._determine_consistent_step_size(prev_point.time_str, prev_time_val)
 			curr_step = self._determine_consistent_step_size(current_time_str, current_time_val)
 			typical_step = min(prev_step, curr_step)  # Use smaller typical step
             
 			if gap < typical_step * 0.5:
-				# Gap is smaller than half a typical step - use precise intermediate
-				new_time_val = prev_time_val + (gap * 0.5)
-
-				# Insertion-local rounding first: try to snap to simple rounded value within bounds
-				snapped = self._maybe_round_insert(
-					new_time_val,
-					lower_bound=prev_time_val,
-					upper_bound=current_time_val,
-					reference_str=current_time_str,
-				)
-				if snapped is not None:
-					return snapped
-
-				# Choose the format that makes the result most readable
+				# Gap is smaller than half a typical step - precise intermediate;
+				# choose the format that makes the result most readable
 				prev_formatted = self._format_time_like_reference(new_time_val, prev_point.time_str)
 				curr_formatted = self._format_time_like_reference(new_time_val, current_time_str)
 				optimal_formatted = fmt.suggest_optimal(new_time_val)
 
-				# Pick the most readable option
-				options = [
-					(prev_formatted, len(prev_formatted), not self._is_awkward_format(prev_formatted)),
-					(curr_formatted, len(curr_formatted), not self._is_awkward_format(curr_formatted)),
-					(optimal_formatted, len(optimal_formatted), True)  # Optimal is always good
-				]
-				# Sort by: not awkward first, then by length
-				return min(options, key=lambda x: (not x[2], x[1]))[0]
+				# Pick the most readable option: the optimal format is never
+				# awkward, so the shortest non-awkward one wins, with ties going
+				# to prev, then curr, then optimal
+				best = optimal_formatted
+				if len(curr_formatted) <= len(best) and not fmt.is_awkward_format(curr_formatted):
+					best = curr_formatted
+				if len(prev_formatted) <= len(best) and not fmt.is_awkward_format(prev_formatted):
+					best = prev_formatted
+				return best
 			else:
-				# Normal gap - use geometric mean with smart formatting
-				new_time_val = prev_time_val + (gap * 0.5)
-                
-				# Try insertion-local rounding first (prioritize clean suggestions)
-				snapped = self._maybe_round_insert(
-					new_time_val,
-					lower_bound=prev_time_val,
-					upper_bound=current_time_val,
-					reference_str=current_time_str,
-				)
-				if snapped is not None:
-					return snapped
-                
+				# Normal gap - smart formatting of the midpoint.
 				# Special handling for very wide gaps (e.g., microseconds to seconds)
 				# If the gap spans more than 3 orders of magnitude, suggest a sensible intermediate
 				gap_ratio = max(current_time_val, prev_time_val) / min(current_time_val, prev_time_val)
@@ -224,42 +278,10 @@ class SmartInsertion:
 		This fixes the exponential growth issue by using fixed steps within
 		the same magnitude range.
 		"""
-		# Check for SI prefix notation
-		si_match = re.search(r'(\d+(?:\.\d+)?)\s*([numkMG])(?:s)?$', time_str.strip())
-		if si_match:
-			magnitude_str, prefix = si_match.groups()
-			magnitude = float(magnitude_str)
-			prefix_value = self.si_prefixes.get(prefix, 1)
-            
-			# Use consistent stepping within the same prefix
-			if magnitude < 10:
-				# Small numbers: step by 1 unit (1n → 2n → 3n)
-				step_magnitude = 1
-			elif magnitude < 100:
-				# Medium numbers: step by 10 units (20n → 30n → 40n)  
-				step_magnitude = 10
-			else:
-				# Large numbers: step by 50 or 100 units
-				step_magnitude = 50 if magnitude < 500 else 100
-            
-			return step_magnitude * prefix_value
-        
-		# Check for scientific notation
-		sci_match = re.search(r'(\d+(?:\.\d+)?)\s*e\s*([+-]?\d+)', time_str.strip())
-		if sci_match:
-			mantissa_str, exp_str = sci_match.groups()
-			mantissa = float(mantissa_str)
-			exp = int(exp_str)
-            
-			# Use consistent stepping within same scientific magnitude
-			if mantissa < 2:
-				step_mantissa = 1  # 1e-3 → 2e-3 → 3e-3
-			elif mantissa < 10:
-				step_mantissa = 1  # 5e-3 → 6e-3 → 7e-3
-			else:
-				step_mantissa = 10  # 10e-3 → 20e-3 → 30e-3
-            
-			return step_mantissa * (10 ** exp)
+		# SI and scientific notation fix the step from the string alone
+		step = _notation_step(time_str)
+		if step is not None:
+			return step
         
 		# For plain numbers, use sensible stepping
 		if time_val == 0:
@@ -280,8 +302,9 @@ class SmartInsertion:
     
 	def _format_time_like_reference(self, time_val: float, reference_str: str) -> str:
 		"""Format time value in the same style as reference string"""
+		stripped = reference_str.strip()
 		# Check if reference uses SI prefix
-		si_match = re.search(r'(\d+(?:\.\d+)?)\s*([numkMG])(?:s)?$', reference_str.strip())
+		si_match = _SI_RE.search(stripped) if stripped[-1:] in _SI_TAIL_CHARS else None
 		if si_match:
 			_, prefix = si_match.groups()
 			if prefix in self.si_prefixes:
@@ -293,41 +316,23 @@ class SmartInsertion:
 					return f"{converted_val:g}{prefix}"
         
 		# Check if reference uses scientific notation
-		sci_match = re.search(r'(\d+(?:\.\d+)?)\s*e\s*([+-]?\d+)', reference_str.strip())
+		sci_match = _SCI_RE.search(stripped) if 'e' in stripped else None
 		if sci_match:
 			# Use stepped scientific notation for consistency
 			return fmt.format_engineering(time_val)
         
 		# Handle edge cases like "0"
-		if reference_str.strip() == "0" and time_val > 0:
+		if stripped == "0" and time_val > 0:
 			# For zero reference, pick the most appropriate format
 			return fmt.suggest_optimal(time_val)
         
-		# Smart optimization: if the result would be awkwardly large, suggest better format
-		if reference_str.strip() and time_val > 0:
-			# Check if using reference format would create awkward result
-			temp_result = self._try_format_like_reference(time_val, reference_str)
-			if temp_result and fmt.is_awkward_format(temp_result):
-				return fmt.suggest_better_si(time_val)
-        
-		# Default to smart formatting
-		return f"{time_val:g}"
-    
-	def _try_format_like_reference(self, time_val: float, reference_str: str) -> str:
-		"""Try formatting like reference without optimization, for testing awkwardness"""
-		import re
-		# Check if reference uses SI prefix
-		si_match = re.search(r'(\d+(?:\.\d+)?)\s*([numkMG])(?:s)?$', reference_str.strip())
-		if si_match:
-			_, prefix = si_match.groups()
-			if prefix in self.si_prefixes:
-				converted_val = time_val / self.si_prefixes[prefix]
-				if abs(converted_val - round(converted_val)) < 1e-10:
-					return f"{int(round(converted_val))}{prefix}"
-				else:
-					return f"{converted_val:g}{prefix}"
-        
-		return f"{time_val:g}"
+		# Default to smart formatting. The SI branch above returns for every
+		# prefix the pattern accepts, so this is also what formatting like the
+		# reference would give; if that is awkwardly large, suggest better
+		candidate = f"{time_val:g}"
+		if stripped and time_val > 0 and fmt.is_awkward_format(candidate):
+			return fmt.suggest_better_si(time_val)
+		return candidate
     
 	def _suggest_better_si_format(self, time_val: float) -> str:
 		"""Suggest the most user-friendly SI format for a time value (wrapper to shared util)."""
@@ -338,11 +343,6 @@ class SmartInsertion:
 		"""Suggest the most user-friendly format for any time value (wrapper to shared util)."""
 		return fmt.suggest_optimal(time_val)
     
-	def _is_awkward_format(self, formatted_str: str) -> bool:
-		"""Check if a formatted string is awkward/unreadable for users (wrapper)."""
-		import re
-		return fmt.is_awkward_format(formatted_str)
-    
 	def _format_scientific(self, value: float) -> str:
 		"""Backwards-compatible wrapper; delegates to shared formatting."""
 		return fmt.format_engineering(value)
@@ -350,8 +350,8 @@ class SmartInsertion:
 	def _maybe_round_insert(
 		self,
 		new_time_val: float,
-		lower_bound: float,
-		upper_bound: float,
+		lo: float,
+		hi: float,
 		reference_str: str,
 	) -> Optional[str]:
 		"""
@@ -363,55 +363,36 @@ class SmartInsertion:
 		- Try clean round numbers in appropriate SI units
 		- Try nice decimal values (50, 25, 10, 5, 1, 0.5, 0.1, etc.)
 		- Accept any candidate that stays strictly between bounds
+
+		The bounds must be ordered (lo <= hi); callers know the ordering.
 		"""
-		lo = min(lower_bound, upper_bound)
-		hi = max(lower_bound, upper_bound)
-        
-		# Try clean round numbers in various SI units
-		clean_candidates = []
+		# Pick the clean round number closest to the target that keeps at
+		# least 1% of the gap as buffer from both bounds (earlier candidates
+		# win ties)
+		best_val = None
+		best_dist = math.inf
         
-		# Generate clean values around the target
 		magnitude = new_time_val
 		if magnitude > 0:
-			# Get the order of magnitude
-			import math
-			log_mag = math.log10(magnitude)
-            
 			# Try nice round numbers in nearby magnitudes
-			for exp_offset in [-1, 0, 1]:
-				target_exp = math.floor(log_mag) + exp_offset
-				base_val = 10 ** target_exp
-                
-				# Try nice multipliers: 1, 2, 5, 10, 20, 25, 50, 100
-				for mult in [1, 2, 5, 10, 20, 25, 50, 100]:
-					candidate_val = mult * base_val
-					if lo < candidate_val < hi:
-						clean_candidates.append(candidate_val)
-                
-				# Also try fractional multipliers for finer control
-				for mult in [0.1, 0.2, 0.5]:
+			base_exp = math.floor(math.log10(magnitude))
+			min_buffer = (hi - lo) * 0.01
+			for exp_offset in _CLEAN_EXP_OFFSETS:
+				base_val = 10 ** (base_exp + exp_offset)
+				for mult in _CLEAN_MULTIPLIERS:
 					candidate_val = mult * base_val
 					if lo < candidate_val < hi:
-						clean_candidates.append(candidate_val)
+						dist = abs(candidate_val - new_time_val)
+						if dist < best_dist and min(abs(candidate_val - lo), abs(candidate_val - hi)) > min_buffer:
+							best_val = candidate_val
+							best_dist = dist
         
-		# Sort candidates by how close they are to the original value
-		if clean_candidates:
-			clean_candidates.sort(key=lambda x: abs(x - new_time_val))
-            
-			# Return the closest clean candidate in optimal format
-			# But make sure it's not too close to the bounds
-			for candidate_val in clean_candidates:
-				# Ensure some minimum distance from bounds to avoid equality
-				min_gap = min(abs(candidate_val - lo), abs(candidate_val - hi))
-				total_gap = hi - lo
-                
-				# Require at least 1% of the total gap as buffer from bounds
-				if min_gap > total_gap * 0.01:
-					return fmt.suggest_optimal(candidate_val)
+		if best_val is not None:
+			return fmt.suggest_optimal(best_val)
         
 		# Fallback: try the original SI prefix-based rounding
 		ref = reference_str.strip()
-		si_match = re.search(r'(?:\d+(?:\.\d+)?)\s*([fpnumkMG])(?:s)?$', ref)
+		si_match = _SI_ANY_PREFIX_RE.search(ref)
 		if si_match:
 			prefix = si_match.group(1)
 			mult = fmt.SI_PREFIXES.get(prefix)
@@ -443,36 +424,26 @@ class SmartInsertion:
 			return {"pattern": "insufficient_data", "suggestion": "use_defaults"}
         
 		# Analyze time differences
-		diffs = []
-		notations = []
-        
-		for i in range(1, len(points)):
-			prev_time = points[i-1].get_time_value()
-			curr_time = points[i].get_time_value()
-            
-			# Handle None values
-			if prev_time is None:
-				prev_time = 0.0
-			if curr_time is None:
-				curr_time = 0.0
-                
-			diffs.append(curr_time - prev_time)
-			notations.append(points[i].time_str)
+		times = np.fromiter(
+			(0.0 if t is None else t for t in (p.get_time_value() for p in points)),
+			dtype=float, count=len(points))
+		diffs = np.diff(times)
+		notations = [p.time_str for p in points[1:]]
         
 		# Detect if differences are consistent
 		variance = 0.0
 		if len(diffs) > 1:
-			avg_diff = sum(diffs) / len(diffs)
-			variance = sum((d - avg_diff) ** 2 for d in diffs) / len(diffs)
+			avg_diff = float(diffs.mean())
+			variance = float(diffs.var())
 			is_consistent = variance < (avg_diff * 0.1) ** 2  # 10% tolerance
 		else:
 			is_consistent = True
-			avg_diff = diffs[0] if diffs else 0
+			avg_diff = float(diffs[0])
         
 		return {
 			"pattern": "consistent" if is_consistent else "variable",
 			"average_step": avg_diff,
 			"step_variance": variance,
-			"predominant_notation": max(set(notations), key=notations.count) if notations else "unknown",
+			"predominant_notation": Counter(notations).most_common(1)[0][0] if notations else "unknown",
 			"suggestion": "maintain_pattern" if is_consistent else "use_adaptive_stepping"
 		}
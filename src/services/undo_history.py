@@ -6,45 +6,95 @@ License: GPL-3.0-or-later
 """
 from __future__ import annotations
 
+from collections import deque
+from itertools import compress, count, islice
+from operator import ne
+from typing import NamedTuple
+
 from pwl_parser import PwlData
 
+# One state in this many is stored as a full snapshot; the states in between
+# only keep the points that changed relative to the state before them
+KEYFRAME_INTERVAL = 16
+
+
+class _SnapshotDiff(NamedTuple):
+	"""Stack state stored as an edit: previous[start:stop] replaced by points"""
+	start: int
+	stop: int
+	points: tuple
+
+
+def _diff_snapshots(previous, current):
+	"""Return the single-range edit that turns snapshot previous into current"""
+	shortest = min(len(previous), len(current))
+	start = next(compress(count(), map(ne, previous, current)), shortest)
+	suffix = next(compress(count(), map(ne, reversed(previous), reversed(current))), shortest)
+	suffix = min(suffix, shortest - start)
+	return _SnapshotDiff(start, len(previous) - suffix, current[start:len(current) - suffix])
+
+
+def _apply_diff(previous, diff):
+	return previous[:diff.start] + diff.points + previous[diff.stop:]
+
 
 class UndoRedoManager:
 	def __init__(self, max_history=50):
-		self.undo_stack = []      # List of (text_snapshot, description)
-		self.redo_stack = []      # List of (text_snapshot, description)
+		self.undo_stack = deque()  # (snapshot or _SnapshotDiff, description) pairs, oldest first
+		self.redo_stack = deque()  # (snapshot or _SnapshotDiff, description) pairs
 		self.max_history = max_history
 		self.initial_state_saved = False  # Track if we've saved the initial state
+		self.last_fingerprint = None      # Fingerprint of the state on top of the undo stack
+		self._top_snapshot = None         # Full snapshot of the state on top of the undo stack
     
 	def save_state(self, pwl_data, description="Edit"):
-		"""Save current state as text snapshot"""
+		"""Save current state as a point snapshot.
+
+		Snapshots are tuples of per-point (time_str, value_str, is_relative)
+		tuples. The bottom of the stack and every KEYFRAME_INTERVAL-th state
+		keep the full snapshot; the others only store the changed range
+		relative to the state below them, so memory grows with the edits
+		rather than with the number of points.
+		"""
+		points_empty = not pwl_data.points
 		# Always save initial state (even if empty) to establish baseline
-		if not self.initial_state_saved and pwl_data.get_point_count() == 0:
-			text_snapshot = ""  # Empty state baseline
-			self.undo_stack.append((text_snapshot, "Initial empty state"))
+		if not self.initial_state_saved and points_empty:
+			# The redo states stay; the next one must not depend on the old top
+			if self.redo_stack and isinstance(self.redo_stack[-1][0], _SnapshotDiff):
+				state, redo_description = self.redo_stack[-1]
+				self.redo_stack[-1] = (_apply_diff(self._top_snapshot, state), redo_description)
+			self.undo_stack.append(((), "Initial empty state"))
+			self._top_snapshot = ()
 			self.initial_state_saved = True
+			self.last_fingerprint = pwl_data.fingerprint()
 			return
         
-		# For non-empty states, proceed normally
-		if pwl_data.get_point_count() == 0:
-			text_snapshot = ""
-		else:
-			text_snapshot = pwl_data.to_text_precise(
-				use_relative_time=True, 
-				precision=9, 
-				preserve_original=True
-			)
+		# Cleared again on top of an empty state: no fingerprint needed
+		if points_empty and self._top_snapshot == ():
+			return
         
-		# Avoid duplicate consecutive states
-		if (self.undo_stack and 
-			self.undo_stack[-1][0] == text_snapshot):
+		# Nothing changed since the last saved state. The fingerprint is the
+		# hash of the snapshot and last_fingerprint always matches the top
+		# state, so a different fingerprint already rules out a duplicate;
+		# only a matching one needs the full comparison (hash collisions).
+		fingerprint = pwl_data.fingerprint()
+		snapshot = pwl_data.snapshot()
+		if self.undo_stack and fingerprint == self.last_fingerprint and snapshot == self._top_snapshot:
 			return
         
-		self.undo_stack.append((text_snapshot, description))
+		self.last_fingerprint = fingerprint
         
-		# Limit history size (but keep at least one state)
+		self.undo_stack.append((self._stored_state(snapshot), description))
+		self._top_snapshot = snapshot
+        
+		# Limit history size (but keep at least one state); the new bottom
+		# state must hold a full snapshot. No maxlen on the deque: the dropped
+		# state is needed to rebuild the new bottom.
 		if len(self.undo_stack) > self.max_history:
-			self.undo_stack.pop(0)
+			oldest, _ = self.undo_stack.popleft()
+			state, bottom_description = self.undo_stack[0]
+			if isinstance(state, _SnapshotDiff):
+				self.undo_stack[0] = (_apply_diff(oldest, state), bottom_description)
         
 		# Clear redo stack when new operation is performed
 		self.redo_stack.clear()
@@ -60,19 +110,16 @@ class UndoRedoManager:
         
 		if self.undo_stack:
 			# Restore previous state
-			text_snapshot, description = self.undo_stack[-1]
-			pwl_data = PwlData()
+			snapshot = self._snapshot_at(len(self.undo_stack) - 1)
+			description = self.undo_stack[-1][1]
+			self._top_snapshot = snapshot
+			self.last_fingerprint = hash(snapshot)
             
 			# Handle empty state
-			if text_snapshot == "":
-				return pwl_data, "Empty state"
+			if not snapshot:
+				return PwlData(), "Empty state"
             
-			# Load from text
-			if pwl_data.load_from_text(text_snapshot):
-				return pwl_data, description
-			else:
-				# Fallback: if text parsing fails, return empty state
-				return PwlData(), f"Parse failed for: {description}"
+			return PwlData.from_snapshot(snapshot), description
         
 		# No previous state, return empty (shouldn't happen with proper initialization)
 		return PwlData(), "Initial state"
@@ -82,21 +129,44 @@ class UndoRedoManager:
 		if not self.can_redo():
 			return None, "Nothing to redo"
         
-		text_snapshot, description = self.redo_stack.pop()
-		self.undo_stack.append((text_snapshot, description))
-        
-		pwl_data = PwlData()
+		state, description = self.redo_stack.pop()
+		self.undo_stack.append((state, description))
+		# A redo state is stored relative to the state it was saved on top of
+		if isinstance(state, _SnapshotDiff):
+			snapshot = _apply_diff(self._top_snapshot, state)
+		else:
+			snapshot = state
+		self._top_snapshot = snapshot
+		self.last_fingerprint = hash(snapshot)
         
 		# Handle empty state
-		if text_snapshot == "":
-			return pwl_data, "Empty state"
+		if not snapshot:
+			return PwlData(), "Empty state"
         
-		# Load from text
-		if pwl_data.load_from_text(text_snapshot):
-			return pwl_data, description
-		else:
-			# Fallback: if text parsing fails, return empty state
-			return PwlData(), f"Parse failed for: {description}"
+		return PwlData.from_snapshot(snapshot), description
+    
+	def _stored_state(self, snapshot):
+		"""Return what to push for snapshot on top of the current undo stack"""
+		if self._top_snapshot is None:
+			return snapshot
+		diffs = 0
+		for state, _ in reversed(self.undo_stack):
+			if not isinstance(state, _SnapshotDiff):
+				break
+			diffs += 1
+		if diffs >= KEYFRAME_INTERVAL - 1:
+			return snapshot
+		return _diff_snapshots(self._top_snapshot, snapshot)
+    
+	def _snapshot_at(self, index):
+		"""Rebuild the full snapshot of undo_stack[index] from the nearest full one below"""
+		base = index
+		while isinstance(self.undo_stack[base][0], _SnapshotDiff):
+			base -= 1
+		snapshot = self.undo_stack[base][0]
+		for state, _ in islice(self.undo_stack, base + 1, index + 1):
+			snapshot = _apply_diff(snapshot, state)
+		return snapshot
     
 	def can_undo(self):
 		return len(self.undo_stack) > 1  # Keep at least current state
@@ -109,6 +179,8 @@ class UndoRedoManager:
 		self.undo_stack.clear()
 		self.redo_stack.clear()
 		self.initial_state_saved = False
+		self.last_fingerprint = None
+		self._top_snapshot = None
     
 	def get_undo_description(self):
 		"""Get description of what would be undone"""
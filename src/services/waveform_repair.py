@@ -7,9 +7,12 @@ License: GPL-3.0-or-later
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from types import SimpleNamespace
-from typing import Dict, List, Optional, Sequence
+from itertools import compress
+from typing import Callable, Dict, List, MutableSequence, Optional, Sequence, Tuple
+
+import numpy as np
 
 from pwl_parser import PwlData, PwlPoint
 from services.formatting import FormatService
@@ -47,61 +50,172 @@ class WaveformAnalyzer:
     def __init__(self, pwl_data: PwlData, *, time_epsilon: float = 1e-15) -> None:
         self._pwl_data = pwl_data
         self._time_epsilon = max(time_epsilon, 0.0)
+        self._scanned_times: Optional[np.ndarray] = None
+        self._scan_result: Tuple[List[DuplicateGroup], List[TimeReversal]] = ([], [])
 
     @property
     def pwl_data(self) -> PwlData:
         return self._pwl_data
 
     def find_duplicate_timestamps(self) -> List[DuplicateGroup]:
-        timestamps = self._pwl_data.timestamps
-        if len(timestamps) < 2:
-            return []
-
-        groups: List[DuplicateGroup] = []
-        current: List[int] = []
-
-        for idx in range(1, len(timestamps)):
-            if abs(timestamps[idx] - timestamps[idx - 1]) <= self._time_epsilon:
-                if not current:
-                    current = [idx - 1, idx]
-                else:
-                    current.append(idx)
-            else:
-                if current:
-                    groups.append(DuplicateGroup(tuple(current), timestamps[current[0]]))
-                    current = []
-        if current:
-            groups.append(DuplicateGroup(tuple(current), timestamps[current[0]]))
-        return groups
+        return list(self._scan()[0])
 
     def find_time_reversals(self) -> List[TimeReversal]:
-        timestamps = self._pwl_data.timestamps
-        if len(timestamps) < 2:
-            return []
-
-        reversals: List[TimeReversal] = []
-        for idx in range(len(timestamps) - 1):
-            if timestamps[idx] > timestamps[idx + 1] + self._time_epsilon:
-                reversals.append(
-                    TimeReversal(
-                        first_index=idx,
-                        second_index=idx + 1,
-                        time_before=timestamps[idx],
-                        time_after=timestamps[idx + 1],
-                    )
-                )
-        return reversals
+        return list(self._scan()[1])
 
     def find_all_issues(self) -> Dict[str, List]:
         issues: Dict[str, List] = {}
-        duplicates = self.find_duplicate_timestamps()
+        duplicates, reversals = self._scan()
         if duplicates:
-            issues["duplicate_timestamps"] = duplicates
-        reversals = self.find_time_reversals()
+            issues["duplicate_timestamps"] = list(duplicates)
         if reversals:
-            issues["time_reversals"] = reversals
+            issues["time_reversals"] = list(reversals)
         return issues
 
+    def _scan(self) -> Tuple[List[DuplicateGroup], List[TimeReversal]]:
+        """Detect duplicates and reversals in one pass over the timestamps.
+
+        time_array() returns the same array until the data changes, so the
+        result is reused for as long as that array is the current one.
+        """
+        timestamps = self._pwl_data.time_array()
+        if timestamps is self._scanned_times:
+            return self._scan_result
+
+        duplicates: List[DuplicateGroup] = []
+        reversals: List[TimeReversal] = []
+        if len(timestamps) >= 2:
+            before = timestamps[:-1]
+            after = timestamps[1:]
+
+            # close[i]: points i and i + 1 share a timestamp. Each run of True
+            # values is one group; the padded edges give its (start, stop) pairs.
+            close = np.abs(after - before) <= self._time_epsilon
+            padded = np.concatenate(([False], close, [False]))
+            edges = np.flatnonzero(padded[1:] != padded[:-1]).tolist()
+            duplicates = [
+                DuplicateGroup(tuple(range(start, stop + 1)), float(timestamps[start]))
+                for start, stop in zip(edges[::2], edges[1::2])
+            ]
+
+            reversed_at = np.flatnonzero(before > after + self._time_epsilon)
+            if reversed_at.size:
+                times = timestamps.tolist()
+                reversals = [
+                    TimeReversal(
+                        first_index=idx,
+                        second_index=idx + 1,
+                        time_before=times[idx],
+                        time_after=times[idx + 1],
+                    )
+                    for idx in reversed_at.tolist()
+                ]
+
+        self._scanned_times = timestamps
+        self._scan_result = (duplicates, reversals)
+        return self._scan_result
+
+
+# --- Duplicate window placement -------------------------------------------
+#
+# Each duplicate strategy places the window the group is spread over. The
+# functions take the group's time, the wanted and minimum window spans and
+# the bounds set by the neighbouring points (None at the waveform edges) and
+# return the window start and its final span. repair_duplicates picks one
+# per call, so the per-group work does not re-dispatch on the strategy.
+
+
+def _place_shift_left(
+    origin_time: float,
+    target_span: float,
+    min_span: float,
+    min_start: Optional[float],
+    max_end: Optional[float],
+) -> Tuple[float, float]:
+    window_end = origin_time
+    if max_end is not None:
+        window_end = min(window_end, max_end)
+    window_start = window_end - target_span
+    if min_start is not None and window_start < min_start:
+        window_start = min_start
+        window_end = window_start + target_span
+
+    if window_end <= window_start:
+        window_end = window_start + min_span
+    span = window_end - window_start
+    if span < min_span:
+        window_start -= min_span - span
+        span = min_span
+    return window_start, span
+
+
+def _place_center(
+    origin_time: float,
+    target_span: float,
+    min_span: float,
+    min_start: Optional[float],
+    max_end: Optional[float],
+) -> Tuple[float, float]:
+    if min_start is None:
+        min_start = origin_time
+    window_start = origin_time - target_span / 2
+    window_end = window_start + target_span
+    if window_start < min_start:
+        shift = min_start - window_start
+        window_start += shift
+        window_end += shift
+    if max_end is not None and window_end > max_end:
+        shift = window_end - max_end
+        window_start -= shift
+        window_end -= shift
+
+    if window_end <= window_start:
+        window_end = window_start + min_span
+    span = window_end - window_start
+    if span < min_span:
+        window_start -= (min_span - span) / 2
+        span = min_span
+    return window_start, span
+
+
+def _place_shift_right(
+    origin_time: float,
+    target_span: float,
+    min_span: float,
+    min_start: Optional[float],
+    max_end: Optional[float],
+) -> Tuple[float, float]:
+    if min_start is None:
+        min_start = origin_time
+    window_start = origin_time
+    if window_start < min_start:
+        window_start = min_start
+    window_end = window_start + target_span
+    if max_end is not None and window_end > max_end:
+        window_end = max_end
+        window_start = window_end - target_span
+
+    if window_end <= window_start:
+        window_end = window_start + min_span
+    span = window_end - window_start
+    if span < min_span:
+        span = min_span
+    return window_start, span
+
+
+# Duplicate groups at least this long are spread with one NumPy pass; the
+# per-call array overhead outweighs the Python loop for shorter ones
+_VECTOR_SPREAD_MIN = 32
+
+_WindowPlacement = Callable[
+    [float, float, float, Optional[float], Optional[float]], Tuple[float, float]
+]
+_WINDOW_PLACEMENTS: Dict[str, _WindowPlacement] = {
+    "shift_left": _place_shift_left,
+    "center": _place_center,
+    "shift_right": _place_shift_right,
+}
+
 
 class WaveformRepairer:
     """Repair strategies for issues detected in PwlData waveforms."""
@@ -148,16 +262,17 @@ class WaveformRepairer:
         if not groups:
             return self._source
 
-        timestamps = list(self._source.timestamps)
-        values = self._source.values
-
         if normalized_strategy == "remove":
-            indices_to_remove = {
-                idx for group in groups for idx in group.indices[1:]
-            }
-            filtered_points = [p for i, p in enumerate(self._source.points) if i not in indices_to_remove]
-            filtered_times = [t for i, t in enumerate(timestamps) if i not in indices_to_remove]
-            return self._rebuild_data(filtered_points, filtered_times)
+            # Keep the first point of each group
+            return self._rebuild_without(
+                [idx for group in groups for idx in group.indices[1:]]
+            )
+
+        # Unboxed doubles that still read back as plain floats, so the
+        # per-group arithmetic below runs at list speed
+        timestamps = array("d", self._source.time_array().tobytes())
+        values = array("d", self._source.value_array().tobytes())
+        place_window = _WINDOW_PLACEMENTS[normalized_strategy]
 
         for group in groups:
             self._spread_group(
@@ -166,7 +281,7 @@ class WaveformRepairer:
                 group,
                 max_slew_rate=max_slew_rate,
                 time_tolerance=time_tolerance,
-                strategy=normalized_strategy,
+                place_window=place_window,
             )
 
         return self._rebuild_data(self._source.points, timestamps)
@@ -182,31 +297,27 @@ class WaveformRepairer:
         if not reversals:
             return self._source
 
-        timestamps = list(self._source.timestamps)
-        points = list(self._source.points)
-
         if normalized_strategy == "remove":
-            indices_to_remove = {rev.second_index for rev in reversals}
-            filtered_points = [p for i, p in enumerate(points) if i not in indices_to_remove]
-            filtered_times = [t for i, t in enumerate(timestamps) if i not in indices_to_remove]
-            return self._rebuild_data(filtered_points, filtered_times)
+            return self._rebuild_without([rev.second_index for rev in reversals])
 
-        sorted_pairs = sorted(((t, i) for i, t in enumerate(timestamps)), key=lambda item: item[0])
-        reordered_points = [points[i] for _, i in sorted_pairs]
-        reordered_times = [t for t, _ in sorted_pairs]
-        return self._rebuild_data(reordered_points, reordered_times)
+        # Stable, so points sharing a time keep their order
+        timestamps = self._source.time_array()
+        order = np.argsort(timestamps, kind="stable")
+        points = self._source.points
+        reordered_points = [points[i] for i in order.tolist()]
+        return self._rebuild_data(reordered_points, timestamps[order])
 
     # --- Internal helpers -------------------------------------------------
 
     def _spread_group(
         self,
-        timestamps: List[float],
+        timestamps: MutableSequence[float],
         values: Sequence[float],
         group: DuplicateGroup,
         *,
         max_slew_rate: float,
         time_tolerance: float,
-        strategy: str,
+        place_window: _WindowPlacement,
     ) -> None:
         indices = group.indices
         if len(indices) < 2:
@@ -218,72 +329,31 @@ class WaveformRepairer:
         previous_time = timestamps[start_idx - 1] if start_idx > 0 else timestamps[start_idx]
         next_time = timestamps[end_idx + 1] if end_idx + 1 < len(timestamps) else None
 
-        group_values = [values[i] for i in indices]
+        # Groups are contiguous runs, so their values are one slice
+        group_values = values[start_idx:end_idx + 1]
         value_span = max(group_values) - min(group_values)
         slew_span = value_span / max_slew_rate if value_span else 0.0
         min_span = time_tolerance * (len(indices) - 1)
         target_span = max(slew_span, min_span)
 
-        base_min_start: Optional[float] = (
+        min_start: Optional[float] = (
             previous_time + time_tolerance if start_idx > 0 else None
         )
-        if strategy in {"center", "shift_right"}:
-            min_start: Optional[float] = (
-                base_min_start if base_min_start is not None else origin_time
-            )
-        else:
-            min_start = base_min_start
         max_end: Optional[float] = (
             next_time - time_tolerance if next_time is not None else None
         )
+        window_start, span = place_window(origin_time, target_span, min_span, min_start, max_end)
 
-        if strategy == "shift_left":
-            window_end = origin_time
-            if max_end is not None:
-                window_end = min(window_end, max_end)
-            window_start = window_end - target_span
-            if min_start is not None and window_start < min_start:
-                window_start = min_start
-                window_end = window_start + target_span
-        elif strategy == "center":
-            window_start = origin_time - target_span / 2
-            window_end = window_start + target_span
-            if min_start is not None and window_start < min_start:
-                shift = min_start - window_start
-                window_start += shift
-                window_end += shift
-            if max_end is not None and window_end > max_end:
-                shift = window_end - max_end
-                window_start -= shift
-                window_end -= shift
-        else:  # shift_right and legacy aliases
-            window_start = origin_time
-            if min_start is not None and window_start < min_start:
-                window_start = min_start
-            window_end = window_start + target_span
-            if max_end is not None and window_end > max_end:
-                window_end = max_end
-                window_start = window_end - target_span
-
-        if window_end <= window_start:
-            window_end = window_start + min_span
-
-        span = window_end - window_start
-        if span < min_span:
-            deficit = min_span - span
-            if strategy == "shift_left":
-                window_start -= deficit
-            elif strategy == "shift_right":
-                window_end += deficit
-            else:  # center
-                window_start -= deficit / 2
-                window_end += deficit / 2
-            span = min_span
-
-        spacing = span / (len(indices) - 1)
-
-        for offset, point_index in enumerate(indices):
-            timestamps[point_index] = window_start + spacing * offset
+        count = len(indices)
+        spacing = span / (count - 1)
+
+        if count >= _VECTOR_SPREAD_MIN:
+            # Same multiply-add per point as the loop, in one NumPy pass
+            spread = window_start + spacing * np.arange(count, dtype=float)
+            timestamps[start_idx:end_idx + 1] = array("d", spread.tobytes())
+        else:
+            for offset, point_index in enumerate(indices):
+                timestamps[point_index] = window_start + spacing * offset
 
     def _normalize_duplicate_strategy(self, strategy: str) -> str:
         normalized = (strategy or "").strip().lower()
@@ -293,6 +363,15 @@ class WaveformRepairer:
         normalized = (strategy or "").strip().lower()
         return self._REVERSAL_ALIASES.get(normalized, normalized)
 
+    def _rebuild_without(self, removed_indices: Sequence[int]) -> PwlData:
+        """Rebuild the source data without the points at removed_indices."""
+        keep = np.ones(self._source.get_point_count(), dtype=bool)
+        keep[removed_indices] = False
+        return self._rebuild_data(
+            list(compress(self._source.points, keep.tolist())),
+            self._source.time_array()[keep],
+        )
+
     def _rebuild_data(
         self,
         points: Sequence[PwlPoint],
@@ -301,35 +380,32 @@ class WaveformRepairer:
         if len(points) != len(absolute_times):
             raise ValueError("Point/time length mismatch during rebuild")
 
-        new_data = PwlData()
-        new_data.timestep = self._source.timestep
-        new_data.default_format = self._source.default_format
-
         if not points:
+            new_data = PwlData()
+            new_data.timestep = self._source.timestep
+            new_data.default_format = self._source.default_format
             return new_data
 
-        formatted_points: List[PwlPoint] = []
-        previous_time = 0.0
-
-        for idx, (point, abs_time) in enumerate(zip(points, absolute_times)):
-            ref = SimpleNamespace(time_str=point.time_str)
-            if idx == 0 or not point.is_relative:
-                time_value = abs_time
-                time_str = self._format_service.format_time(time_value, ref)
-                is_relative = False
-            else:
-                delta = max(abs_time - previous_time, 0.0)
-                time_str = self._format_service.format_time(delta, ref)
-                is_relative = True
-
-            new_point = PwlPoint(time_str, point.value_str, is_relative=is_relative)
-            formatted_points.append(new_point)
-            previous_time = abs_time
-
-        new_data.points = formatted_points
-        new_data._values_discrete = []
-        new_data._timestamps_discrete = []
-        new_data._discrete_dirty = True
+        # Relative points (never the first) store their delta to the previous
+        # time, clamped at zero; the others store their absolute time. All of
+        # them are formatted in one pass, each mirroring its old time string.
+        times = np.asarray(absolute_times, dtype=float)
+        relative = np.fromiter((point.is_relative for point in points), dtype=bool, count=len(points))
+        relative[0] = False
+        deltas = np.empty_like(times)
+        deltas[0] = 0.0
+        np.subtract(times[1:], times[:-1], out=deltas[1:])
+        deltas = np.where(deltas < 0.0, 0.0, deltas)
+        time_strs = self._format_service.format_time_array(
+            np.where(relative, deltas, times),
+            [point.time_str for point in points],
+        )
+
+        new_data = PwlData.from_rows(
+            zip(time_strs, (point.value_str for point in points), relative.tolist())
+        )
+        new_data.timestep = self._source.timestep
+        new_data.default_format = self._source.default_format
         return new_data
 
 
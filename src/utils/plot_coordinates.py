@@ -5,7 +5,9 @@ AI Tools: GPT-5 (OpenAI) - Code development and architecture
 License: GPL-3.0-or-later
 """
 
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
 
 def data_to_pixel(ax, data_x: float, data_y: float) -> Tuple[Optional[float], Optional[float]]:
     try:
@@ -27,6 +29,16 @@ def pixel_to_data(ax, pixel_x: float, pixel_y: float) -> Tuple[Optional[float],
         return None, None
 
 
+def pixels_to_data(ax, pixels: Sequence[Tuple[float, float]]) -> Optional[np.ndarray]:
+    """Convert several pixel positions at once, inverting transData only once."""
+    try:
+        if ax is None:
+            return None
+        return ax.transData.inverted().transform(pixels)
+    except Exception:
+        return None
+
+
 def clamp_pixel_to_axes(ax, px: float, py: float) -> Tuple[float, float]:
     try:
         if ax is None:
@@ -0,0 +1,58 @@
+"""
+Plot data kernels for the PWL Editor.
+Author: markus(at)schrodt.at
+AI Tools: GPT-5 (OpenAI) - Code development and architecture
+License: GPL-3.0-or-later
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+STEP_TIME_TOLERANCE = 1e-12
+# Finest detail (relative to the data span) that rendering must preserve
+RENDER_RESOLUTION = 1e-5
+_FLOAT32_EPS = float(np.finfo(np.float32).eps)
+_FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+
+def expand_steps(
+    times: Sequence[float],
+    values: Sequence[float],
+    tolerance: float = STEP_TIME_TOLERANCE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Snap co-located points onto the time of the first point of their group.
+
+    Points closer than ``tolerance`` to the start of the current group are
+    drawn at the group's start time, so vertical steps render as straight
+    edges. Only points whose distance to their predecessor is below twice the
+    tolerance can belong to a group; all others are group starts and are
+    handled without a Python loop.
+    """
+    plot_times = np.array(times, dtype=float)
+    plot_values = np.asarray(values, dtype=float)
+    if plot_times.size < 2:
+        return plot_times, plot_values
+
+    candidates = np.flatnonzero(np.abs(np.diff(plot_times)) < 2 * tolerance) + 1
+    for index in candidates.tolist():
+        group_time = plot_times[index - 1]
+        if abs(plot_times[index] - group_time) < tolerance:
+            plot_times[index] = group_time
+    return plot_times, plot_values
+
+
+def render_dtype(data: np.ndarray) -> np.dtype:
+    """Pick float32 for drawing when it still resolves RENDER_RESOLUTION of the span.
+
+    Large offsets with a tiny span (e.g. a microsecond window at t=1s) would
+    be quantized visibly in float32, so those stay float64.
+    """
+    if data.size == 0:
+        return np.dtype(np.float32)
+    low = float(data.min())
+    high = float(data.max())
+    magnitude = max(abs(low), abs(high))
+    if magnitude <= _FLOAT32_MAX and magnitude * _FLOAT32_EPS <= (high - low) * RENDER_RESOLUTION:
+        return np.dtype(np.float32)
+    return data.dtype